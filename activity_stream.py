@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Activity Stream Module
+In-process fan-out of record changes to the Server-Sent Events clients of /api/stream/activity.
+
+VehicleDatabaseManager reports each committed write's record changes (see add_change_listener) from
+whichever thread made it, or from its change feed listener for other workers' writes. The broadcaster collects them, waits briefly so a burst of writes becomes
+one batch, loads the summaries of the changed records once per batch, however many clients are
+connected, and queues an event for every subscriber whose store scope includes the record's store.
+
+Events:
+    vehicle  a record was created or updated; data has its environment_id, vehicle card and activity entry
+    delete   a record was deleted or moved to another store; data has its id and environment_id
+    resync   the subscriber missed events (slow client, failed summary load, change feed reconnect) and should reload
+"""
+
+import json
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = {'event': 'resync', 'data': {}}
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Server-Sent Events frame of an event"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+class ActivitySubscription:
+    """Event queue of one connected client, limited to the stores it can see (None: every store)"""
+
+    def __init__(self, stores: Optional[Iterable[str]], max_queue: int):
+        self.stores = set(stores) if stores is not None else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def wants(self, environment_id: Optional[str]) -> bool:
+        return self.stores is None or environment_id in self.stores
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; False when the client fell behind and was sent resync instead"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            # Too far behind for deltas to be useful: drop them and ask for a reload
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            return False
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class ActivityBroadcaster:
+    """
+    Single per-process source of activity events. `load_summaries(record_ids)` runs in a worker
+    thread and returns {record id: event data} for the records that still exist.
+    """
+
+    def __init__(
+        self,
+        load_summaries: Callable[[List[int]], Dict[int, Dict[str, Any]]],
+        coalesce_seconds: float = 0.25,
+        max_queue: int = 256
+    ):
+        self.load_summaries = load_summaries
+        self.coalesce_seconds = coalesce_seconds
+        self.max_queue = max_queue
+        self._subscribers: set = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events_sent = 0
+        self.resyncs = 0
+        self.restarts = 0
+
+    async def start(self):
+        """Start delivering on the running event loop (application startup)"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop delivering (application shutdown)"""
+        task, self._task, self._loop = self._task, None, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def notify(self, changes: List[Dict[str, Any]]):
+        """Record changes of a committed write; safe to call from any thread"""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return  # Nobody listening: nothing to load
+        with self._lock:
+            self._pending.extend(changes)
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass  # Event loop closed during shutdown
+
+    @contextmanager
+    def subscribe(self, stores: Optional[Iterable[str]]):
+        """Subscription for the duration of a client connection; use on the event loop"""
+        subscription = ActivitySubscription(stores, self.max_queue)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    async def _run(self):
+        """Deliver until stopped; an unexpected error is logged and delivery starts over"""
+        while True:
+            try:
+                await self._deliver()
+            except Exception:
+                logger.exception("Activity delivery failed, restarting it")
+                self.restarts += 1
+                try:
+                    # The batch being delivered is lost
+                    self._publish([RESYNC_EVENT])
+                except Exception:
+                    pass
+                await asyncio.sleep(self.coalesce_seconds)
+
+    async def _deliver(self):
+        while True:
+            await self._wakeup.wait()
+            # Let the rest of a burst of writes arrive, then take them all
+            await asyncio.sleep(self.coalesce_seconds)
+            self._wakeup.clear()
+            with self._lock:
+                changes, self._pending = self._pending, []
+            if not changes or not self._subscribers:
+                continue
+            try:
+                events = await to_thread.run_sync(self._build_events, changes)
+            except Exception as e:
+                logger.warning("Activity summaries could not be loaded, asking clients to resync: %s", e)
+                events = [RESYNC_EVENT]
+            self._publish(events)
+
+    def _build_events(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Events of a batch of changes: the last change of each record in each store, in order"""
+        if any(change['action'] == 'resync' for change in changes):
+            return [RESYNC_EVENT]  # Changes from other workers were lost: everyone reloads
+        latest: Dict[Tuple[int, Optional[str]], Dict[str, Any]] = {}
+        for change in changes:
+            key = (change['id'], change['environment_id'])
+            latest.pop(key, None)
+            latest[key] = change
+
+        upserted = sorted({change['id'] for change in latest.values() if change['action'] == 'upsert'})
+        summaries = self.load_summaries(upserted) if upserted else {}
+
+        events = []
+        for change in latest.values():
+            if change['action'] == 'delete':
+                events.append({
+                    'event': 'delete', 'environment_id': change['environment_id'],
+                    'data': {'id': change['id'], 'environment_id': change['environment_id']}
+                })
+            elif change['id'] in summaries:
+                summary = summaries[change['id']]
+                events.append({'event': 'vehicle', 'environment_id': summary['environment_id'], 'data': summary})
+        return events
+
+    def _publish(self, events: List[Dict[str, Any]]):
+        for subscription in list(self._subscribers):
+            for event in events:
+                if event is RESYNC_EVENT or subscription.wants(event['environment_id']):
+                    if subscription.offer(event):
+                        self.events_sent += 1
+                    else:
+                        self.resyncs += 1
+                        break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'subscribers': len(self._subscribers), 'events_sent': self.events_sent,
+            'resyncs': self.resyncs, 'restarts': self.restarts
+        }
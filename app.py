@@ -5,31 +5,66 @@ Professional dashboard for vehicle processing database
 """
 
 import os
+import re
+import io
+import csv
 import sys
 import hashlib
 import json
+import time
+import logging
+import threading
+import base64
+import binascii
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, Request, HTTPException, Query, Depends, Form, status
+from fastapi import FastAPI, Request, HTTPException, Query, Depends, Form, status, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import uvicorn
+from anyio import to_thread, CapacityLimiter
 from dotenv import load_dotenv
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy.orm import undefer_group
 
 load_dotenv()
 
-from database import get_database_manager, User, UserRole
+from database import get_database_manager, get_store_write_validator, User, UserRole, parse_currency_value, json_array_contains, record_detail_options, RECORD_CONTENT_GROUP, DEFAULT_INGEST_CHUNK_SIZE, DESCRIPTION_PREVIEW_LENGTH
+from vehicle_search import build_search_filter, build_search_ranking, get_matched_field
+from principal_cache import PrincipalCache, UserPrincipal
+from response_cache import build_response_cache_from_env
+from conditional_requests import ConditionalRequest, get_conditional_request, make_etag
+import columnar_export
+from activity_stream import ActivityBroadcaster, format_sse
+from record_partitions import ensure_partitions, DEFAULT_CHECK_SECONDS as PARTITION_CHECK_SECONDS
+from structured_logging import configure_logging, RequestIdMiddleware
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Authenticated user snapshots are reused for this long (0 disables the cache). Changes made
+# through the user management endpoints invalidate immediately; other changes, or changes made
+# in another worker process, are picked up when the entry expires.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+principal_cache = PrincipalCache(ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+
+# Dashboard read responses (statistics, recent activity, stores, first vehicles page) are reused for
+# RESPONSE_CACHE_TTL_SECONDS per store scope and parameters; writes through db_manager invalidate
+# the stores they touch (see response_cache.py).
+response_cache = build_response_cache_from_env()
+
 # Security
 security = HTTPBearer()
 # Workaround for bcrypt 4.x compatibility issue with passlib
@@ -45,6 +80,13 @@ except Exception:
     # Fallback to sha256_crypt if bcrypt fails
     pwd_context = CryptContext(schemes=["sha256_crypt", "md5_crypt"], deprecated="auto")
 
+# Logins (user lookup and the deliberately slow password check) run on their own threads, so they
+# neither wait behind database requests for the connection-sized worker pool nor hold its threads.
+# bcrypt releases the GIL; a few threads per core keep a burst of logins from queueing behind each
+# other while the handler threads compete for the same CPU.
+PASSWORD_CHECK_THREADS = int(os.getenv("PASSWORD_CHECK_THREADS", "8"))
+password_check_limiter = CapacityLimiter(PASSWORD_CHECK_THREADS)
+
 # Pydantic Models for API responses
 class VehicleInfo(BaseModel):
     id: int
@@ -82,16 +124,28 @@ class VehicleInfo(BaseModel):
 class PaginationInfo(BaseModel):
     page: int
     per_page: int
-    total: int
-    pages: int
+    total: Optional[int] = None  # None when the caller skips the count (include_total=false)
+    pages: Optional[int] = None
     has_prev: bool
     has_next: bool
+    next_cursor: Optional[str] = None  # Opaque keyset token for the following page
 
 class VehiclesResponse(BaseModel):
     success: bool
     vehicles: List[VehicleInfo]
     pagination: PaginationInfo
 
+class VehicleTombstone(BaseModel):
+    id: int
+    environment_id: Optional[str] = None
+
+class VehicleChangesResponse(BaseModel):
+    success: bool
+    cursor: str  # Pass as `since` to get the changes after this response
+    reset: bool  # The changes since `since` are unavailable: reload the list, then sync from cursor
+    vehicles: List[VehicleInfo]  # Created or updated since `since`
+    deleted: List[VehicleTombstone]  # Deleted, or moved out of the stores in scope, since `since`
+
 class VehicleDetail(BaseModel):
     id: int
     stock_number: str
@@ -162,6 +216,61 @@ class ActivityResponse(BaseModel):
     success: bool
     activity: List[ActivityItem]
 
+class SearchSuggestion(BaseModel):
+    id: int
+    stock_number: str
+    vin: Optional[str] = None
+    vehicle_name: Optional[str] = None
+    matched_field: str
+    processing_date: Optional[str] = None
+
+class SearchSuggestionsResponse(BaseModel):
+    success: bool
+    query: str
+    suggestions: List[SearchSuggestion]
+
+# Batch ingestion models
+MAX_INGEST_BATCH_SIZE = 5000
+
+class ProcessingSummaryIn(BaseModel):
+    """One processing summary; the fields mirror VehicleDatabaseManager.log_processing_summary"""
+    stock_number: str = Field(..., min_length=1, max_length=50)
+    vin: Optional[str] = Field(None, max_length=17)
+    environment_id: Optional[str] = Field(None, max_length=100, description="Store ID of the record")
+    odometer: Optional[str] = Field(None, max_length=20)
+    days_in_inventory: Optional[str] = Field(None, max_length=10)
+    starred_features: Optional[List[Dict[str, Any]]] = None
+    description_data: Optional[Dict[str, Any]] = None
+    no_fear_certificate: bool = False
+    no_fear_text: Optional[str] = None
+    ai_analysis: Optional[Dict[str, Any]] = None
+    screenshot_path: Optional[str] = Field(None, max_length=500)
+    processing_successful: bool = True
+    errors: Optional[List[str]] = None
+    processing_duration: Optional[str] = Field(None, max_length=20)
+    session_id: Optional[str] = Field(None, max_length=100)
+
+class BatchIngestRequest(BaseModel):
+    # Items are validated one by one so a bad summary is reported instead of rejecting the batch
+    summaries: List[Any] = Field(..., max_length=MAX_INGEST_BATCH_SIZE)
+    chunk_size: Optional[int] = Field(None, ge=1, le=MAX_INGEST_BATCH_SIZE, description="Summaries per transaction")
+    upsert: bool = Field(False, description="Merge each summary into the record of the same vehicle, store and session instead of adding a record")
+
+class IngestError(BaseModel):
+    index: int
+    stock_number: Optional[str] = None
+    error: str
+
+class BatchIngestResponse(BaseModel):
+    success: bool
+    received: int
+    inserted: int  # Summaries stored as new records
+    updated: int  # Summaries merged into an existing record (upsert only)
+    failed: int
+    ids: List[Optional[int]]  # Record id per submitted summary; None where it failed, see errors for why
+    created: List[Optional[bool]]  # Per summary: True for a new record, False if merged, None if it failed
+    errors: List[IngestError]
+
 class ErrorResponse(BaseModel):
     success: bool = False
     error: str
@@ -222,15 +331,45 @@ class UserManagementResponse(BaseModel):
     message: str
     user: Optional[UserResponse] = None
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    # Route handlers that touch the database are plain `def` functions, so FastAPI runs them
+    # (and the blocking session work inside) in its worker thread pool. Size that pool to the
+    # database connection pool so waiting requests queue here instead of on the pool. Password
+    # checks run on password_check_limiter instead.
+    to_thread.current_default_thread_limiter().total_tokens = db_manager.get_max_connections()
+    # Importing this module never touches the database; connectivity is checked here, once per worker
+    await wait_for_database()
+    await to_thread.run_sync(check_super_admin)
+    await to_thread.run_sync(ensure_record_partitions)
+    # Workers can run for longer than the months of partitions created ahead
+    partition_maintenance = asyncio.create_task(maintain_record_partitions())
+    await activity_broadcaster.start()
+    # Other workers' record changes (PostgreSQL LISTEN; nothing to receive on SQLite)
+    await to_thread.run_sync(db_manager.change_feed.start)
+    yield
+    await to_thread.run_sync(db_manager.change_feed.stop)
+    await activity_broadcaster.stop()
+    partition_maintenance.cancel()
+    try:
+        await partition_maintenance
+    except asyncio.CancelledError:
+        pass
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Dealership Dashboard API",
     description="Professional dashboard for vehicle processing database",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
+# Tag every log record written while serving a request with its X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -238,22 +377,64 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 # Initialize database manager (will use environment variables for database connection)
-print("Initializing database connection...")
+logger.info("Initializing database connection...")
 db_manager = get_database_manager()
+db_manager.add_write_listener(response_cache.invalidate_stores)
+
+# Record changes, of this worker and the others (see change_feed.py), are pushed to /api/stream/activity clients (see activity_stream.py)
+ACTIVITY_STREAM_KEEPALIVE_SECONDS = float(os.getenv("ACTIVITY_STREAM_KEEPALIVE_SECONDS", "15"))
+ACTIVITY_STREAM_RETRY_MS = 5000
+activity_broadcaster = ActivityBroadcaster(
+    lambda record_ids: load_activity_summaries(record_ids),  # Defined with the other helpers below
+    max_queue=int(os.getenv("ACTIVITY_STREAM_MAX_QUEUE", "256"))
+)
+db_manager.add_change_listener(activity_broadcaster.notify)
 if SECRET_KEY.startswith("your-secret-key-change-in-production"):
-    print("⚠️ WARNING: Using default SECRET_KEY. Set SECRET_KEY in your .env so JWT tokens remain valid across restarts.")
+    logger.warning("Using default SECRET_KEY. Set SECRET_KEY in your .env so JWT tokens remain valid across restarts.")
+
+# Startup connectivity check: attempts before the worker gives up, and the first retry delay (doubles each time)
+DB_STARTUP_ATTEMPTS = int(os.getenv("DB_STARTUP_ATTEMPTS", "5"))
+DB_STARTUP_BACKOFF_SECONDS = float(os.getenv("DB_STARTUP_BACKOFF_SECONDS", "0.5"))
+DB_STARTUP_MAX_BACKOFF_SECONDS = 8.0
+
+async def wait_for_database():
+    """Retry the database connectivity check with exponential backoff; re-raise after the last attempt"""
+    delay = DB_STARTUP_BACKOFF_SECONDS
+    for attempt in range(1, DB_STARTUP_ATTEMPTS + 1):
+        try:
+            await to_thread.run_sync(db_manager.check_connection)
+            logger.info("Database connection established")
+            return
+        except Exception as e:
+            if attempt >= DB_STARTUP_ATTEMPTS:
+                logger.error("Database unavailable after %d attempts: %s", attempt, e)
+                raise
+            logger.warning("Database unavailable (attempt %d/%d): %s. Retrying in %.1fs",
+                           attempt, DB_STARTUP_ATTEMPTS, e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, DB_STARTUP_MAX_BACKOFF_SECONDS)
+
+def check_super_admin():
+    """Warn when no super admin exists yet"""
+    try:
+        with db_manager.get_session() as session:
+            if session.query(User.id).filter(User.role == UserRole.SUPER_ADMIN).first() is None:
+                logger.warning("No super admin user found! Run 'python setup_admin.py' to create the first super admin user.")
+    except Exception as e:
+        logger.warning("Could not check for super admin: %s. Run 'alembic upgrade head' and 'python setup_admin.py' to initialize the system.", e)
 
-# Check for super admin on startup
-try:
-    with db_manager.get_session() as session:
-        super_admin_count = session.query(User).filter(User.role == UserRole.SUPER_ADMIN).count()
-        if super_admin_count == 0:
-            print("⚠️ WARNING: No super admin user found!")
-            print("🔧 Run 'python setup_admin.py' to create the first super admin user.")
-            print("   Or use the database migration functions to set up users.")
-except Exception as e:
-    print(f"⚠️ Could not check for super admin: {e}")
-    print("🔧 Run 'python setup_admin.py' to initialize the system.")
+def ensure_record_partitions():
+    """Create the coming months' record partitions (partitioned PostgreSQL databases only)"""
+    try:
+        ensure_partitions(db_manager)
+    except Exception as e:
+        logger.warning("Could not create record partitions: %s. Run 'python manage_partitions.py ensure'.", e)
+
+async def maintain_record_partitions():
+    """Re-check the record partitions every PARTITION_CHECK_SECONDS until shutdown"""
+    while True:
+        await asyncio.sleep(PARTITION_CHECK_SECONDS)
+        await to_thread.run_sync(ensure_record_partitions)
 
 # Authentication Helper Functions
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -272,6 +453,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)  # Principal cache key
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -279,13 +461,23 @@ def authenticate_user(username: str, password: str):
     """Authenticate user with username and password"""
     with db_manager.get_session() as session:
         user = session.query(User).filter(User.username == username).first()
-        if not user:
-            return False
-        if not user.check_password(password):
-            return False
-        return user
+    # The connection is back in the pool before the (slow) password check
+    if not user:
+        return False
+    if not user.check_password(password):
+        return False
+    return user
+
+def record_login(user: User):
+    """Stamp the user's last login and drop their cached tokens"""
+    with db_manager.get_session() as session:
+        session.query(User).filter(User.id == user.id).update({
+            "last_login": datetime.utcnow()
+        })
+        session.commit()
+    principal_cache.invalidate_user(username=user.username)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -297,21 +489,28 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         token_value = credentials.credentials
         if not token_value:
             raise credentials_exception
-        print(f"Auth Debug: got Authorization Bearer token of length {len(token_value)}")
+        logger.debug("Bearer token received (%d chars)", len(token_value))
         payload = jwt.decode(token_value, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        print(f"Auth Debug: token sub={username}")
+        logger.debug("Token subject: %s", username)
     except JWTError as e:
-        print(f"JWT Error: {e}")
+        logger.info("Rejected JWT: %s", e)
         raise credentials_exception
     
-    with db_manager.get_session() as session:
-        user = session.query(User).filter(User.username == username).first()
-        if user is None or not user.is_active:
-            raise credentials_exception
-        return user
+    # The signature is verified above on every request; only the user lookup is cached
+    cache_key = payload.get("jti") or username
+    principal = principal_cache.get(cache_key)
+    if principal is None or principal.username != username:
+        with db_manager.get_session() as session:
+            user = session.query(User).filter(User.username == username).first()
+            if user is None or not user.is_active:
+                raise credentials_exception
+            principal = UserPrincipal.from_user(user)
+        principal_cache.put(cache_key, principal)
+    
+    return principal.to_user()
 
 # Role-Based Access Control Functions
 def require_role(required_roles: List[UserRole]):
@@ -373,32 +572,410 @@ def get_accessible_store_ids(current_user: User, selected_store_id: Optional[str
             # Return all accessible stores
             return current_user.get_store_ids()
 
-def apply_store_filter(query, current_user: User, selected_store_id: Optional[str] = None):
+def apply_store_filter(query, current_user: User, selected_store_id: Optional[str] = None, store_column=None):
     """Apply store-based filtering to a query based on user role and permissions"""
     from database import VehicleProcessingRecord
 
-    print(f"DEBUG apply_store_filter: user_role={current_user.role}, selected_store_id={selected_store_id}")
+    # Rollup tables keep the store in their own environment_id column
+    if store_column is None:
+        store_column = VehicleProcessingRecord.environment_id
+
     accessible_stores = get_accessible_store_ids(current_user, selected_store_id)
-    print(f"DEBUG apply_store_filter: accessible_stores={accessible_stores}")
 
     if accessible_stores:
         # User has specific store access - filter by those stores
-        print(f"DEBUG apply_store_filter: Filtering by specific stores: {accessible_stores}")
-        return query.filter(VehicleProcessingRecord.environment_id.in_(accessible_stores))
+        logger.debug("Store filter: role=%s selected=%s -> stores %s", current_user.role, selected_store_id, accessible_stores)
+        return query.filter(store_column.in_(accessible_stores))
     elif current_user.role == UserRole.SUPER_ADMIN and not selected_store_id:
         # Super admin with no specific store selected - access all stores
-        print(f"DEBUG apply_store_filter: Super admin with no store filter - returning all vehicles")
+        logger.debug("Store filter: super admin with no store selected -> all stores")
         return query  # No filtering needed
     else:
         # Fallback to old behavior for backward compatibility
-        print(f"DEBUG apply_store_filter: Fallback case - user.store_id={current_user.store_id}")
+        logger.debug("Store filter: role=%s fallback -> legacy store_id %s", current_user.role, current_user.store_id)
         if current_user.store_id:
-            return query.filter(VehicleProcessingRecord.environment_id == current_user.store_id)
+            return query.filter(store_column == current_user.store_id)
         else:
             # No store filtering for this user - return all vehicles
-            print(f"DEBUG apply_store_filter: No store restrictions - returning all vehicles")
             return query
 
+def get_store_scope(current_user: User, selected_store_id: Optional[str] = None) -> Optional[tuple]:
+    """Stores apply_store_filter limits a request to, or None when it covers every store (response cache scope)"""
+    accessible_stores = get_accessible_store_ids(current_user, selected_store_id)
+    if accessible_stores:
+        return tuple(accessible_stores)
+    if current_user.role != UserRole.SUPER_ADMIN and current_user.store_id:
+        return (current_user.store_id,)
+    return None
+
+# Responses with values relative to the current time (time ago, 7-day counts) get a new ETag this often
+TIME_RELATIVE_ETAG_SECONDS = 60
+
+def check_not_modified(
+    conditional: ConditionalRequest,
+    endpoint: str,
+    current_user: User,
+    store_id: Optional[str],
+    params: Dict[str, Any],
+    time_relative: bool = False
+) -> bool:
+    """
+    Set ETag (and Last-Modified) from the write versions of the stores a request covers, and
+    report whether the client's copy is still current. Costs one primary key lookup.
+    """
+    scope = get_store_scope(current_user, store_id)
+    with db_manager.get_session() as session:
+        version_sum, store_count, last_write = get_store_write_validator(session, scope)
+    time_bucket = int(time.time() // TIME_RELATIVE_ETAG_SECONDS) if time_relative else None
+    etag = make_etag(
+        app.version, endpoint, current_user.username, current_user.role.value, scope, params,
+        version_sum, store_count, time_bucket
+    )
+    return conditional.validate(etag, None if time_relative else last_write)
+
+# Helper Functions for Pagination
+# Vehicle list totals are reused per filter set for up to VEHICLE_COUNT_CACHE_TTL_SECONDS; writes
+# drop the counts covering the stores they touch (invalidate_cached_counts, a write listener)
+VEHICLE_COUNT_CACHE_TTL_SECONDS = 30
+VEHICLE_COUNT_CACHE_MAX_ENTRIES = 512
+_vehicle_count_cache: Dict[tuple, tuple] = {}
+_vehicle_count_lock = threading.Lock()
+_vehicle_count_generation = 0
+
+def encode_vehicle_cursor(processing_date: datetime, record_id: int) -> str:
+    """Encode a (processing_date, id) keyset position as an opaque URL-safe token"""
+    raw = json.dumps([processing_date.isoformat(), record_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_vehicle_cursor(token: str) -> tuple:
+    """Decode a keyset token produced by encode_vehicle_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        processing_date, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(processing_date), int(record_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def encode_changes_cursor(versions: Dict[str, int]) -> str:
+    """Encode per-store write versions as an opaque URL-safe token"""
+    raw = json.dumps(versions, sort_keys=True, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_changes_cursor(token: str) -> Dict[str, int]:
+    """Decode a changes token produced by encode_changes_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        versions = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {str(store): int(version) for store, version in versions.items()}
+    except (ValueError, TypeError, AttributeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid changes cursor")
+
+def get_cached_count(cache_key: tuple, query) -> int:
+    """
+    Count the rows of a filtered query, reusing a recent count for the same filters. cache_key
+    starts with the tuple of stores counted (empty for all stores).
+    """
+    now = time.monotonic()
+    with _vehicle_count_lock:
+        cached = _vehicle_count_cache.get(cache_key)
+        generation = _vehicle_count_generation
+    if cached and now - cached[1] < VEHICLE_COUNT_CACHE_TTL_SECONDS:
+        return cached[0]
+
+    total = query.order_by(None).count()
+    with _vehicle_count_lock:
+        # A write invalidated counts while this one ran; it may predate that write
+        if generation == _vehicle_count_generation:
+            if len(_vehicle_count_cache) >= VEHICLE_COUNT_CACHE_MAX_ENTRIES:
+                _vehicle_count_cache.clear()
+            _vehicle_count_cache[cache_key] = (total, now)
+    return total
+
+def invalidate_cached_counts(environment_ids: Optional[set]):
+    """Drop the cached counts covering any of the given stores (and all-stores counts); None drops all"""
+    global _vehicle_count_generation
+    with _vehicle_count_lock:
+        _vehicle_count_generation += 1
+        stale = [
+            key for key in _vehicle_count_cache
+            if environment_ids is None or not key[0] or not environment_ids.isdisjoint(key[0])
+        ]
+        for key in stale:
+            del _vehicle_count_cache[key]
+
+db_manager.add_write_listener(invalidate_cached_counts)
+
+# Helper Functions for Vehicle Lists
+def get_vehicle_list_columns() -> list:
+    """
+    Columns for list views so the deferred columns and compressed texts are never loaded:
+    the stored description preview, the full description length and whether errors were recorded.
+    """
+    from database import VehicleProcessingRecord
+
+    errors = VehicleProcessingRecord.errors_encountered
+    return [
+        VehicleProcessingRecord.description_preview.label('description_preview'),
+        VehicleProcessingRecord.description_length.label('description_length'),
+        errors.isnot(None).label('has_errors')
+    ]
+
+def parse_date_range(start_date: Optional[str], end_date: Optional[str]) -> tuple:
+    """
+    (start, end) datetimes of YYYY-MM-DD date filters, None where not given. The end is
+    exclusive and one day later so the whole end day is included.
+    """
+    start_dt = end_dt = None
+    if start_date and start_date != "null":
+        try:
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
+    if end_date and end_date != "null":
+        try:
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
+    return start_dt, end_dt
+
+def apply_vehicle_filters(query, dialect_name: str, search: str, start_dt: Optional[datetime], end_dt: Optional[datetime], error: Optional[str]):
+    """Apply the search, date range and error filters of the vehicle list to a records query"""
+    from database import VehicleProcessingRecord
+
+    # Trigram-indexed on PostgreSQL
+    if search:
+        query = query.filter(build_search_filter(search, dialect_name))
+
+    # Runs in the database (GIN-indexed JSONB containment on PostgreSQL)
+    if error:
+        query = query.filter(json_array_contains(VehicleProcessingRecord.errors_encountered, error, dialect_name))
+
+    if start_dt:
+        query = query.filter(VehicleProcessingRecord.processing_date >= start_dt)
+        logger.debug("Applied start date filter: %s", start_dt)
+    if end_dt:
+        query = query.filter(VehicleProcessingRecord.processing_date < end_dt)
+        logger.debug("Applied end date filter: %s", end_dt)
+    return query
+
+def build_vehicle_info(vehicle, description_preview: Optional[str], description_length: Optional[int], has_errors: bool) -> VehicleInfo:
+    """Vehicle card of a record selected with get_vehicle_list_columns()"""
+    # Use actual vehicle name if available, otherwise create a friendly name
+    display_name = vehicle.vehicle_name or f"Vehicle #{vehicle.stock_number}"
+    if vehicle.vin and not vehicle.vehicle_name:
+        display_name += f" (VIN: ...{vehicle.vin[-6:]})"
+
+    # Format processing date
+    processing_date = vehicle.processing_date.strftime('%B %d, %Y at %I:%M %p') if vehicle.processing_date else 'Unknown'
+
+    # Calculate status based on processing_status and success
+    processing_status = getattr(vehicle, 'processing_status', None)
+    # If processing_status is None, infer from processing_successful
+    if processing_status is None:
+        processing_status = 'completed' if vehicle.processing_successful else 'failed'
+    # Check for no build data first - this takes priority
+    if getattr(vehicle, 'no_build_data_found', False):
+        status = '<i class="fas fa-clipboard-list"></i> No Build Data Found'
+        status_class = "warning"
+    elif processing_status == 'processing':
+        status = '<i class="fas fa-spinner fa-spin"></i> Processing...'
+        status_class = "warning"
+    elif processing_status == 'pending':
+        status = '<i class="fas fa-clock"></i> Pending'
+        status_class = "muted"
+    elif vehicle.processing_successful:
+        status = '<i class="fas fa-check-circle"></i> Completed Successfully'
+        status_class = "success"
+    else:
+        status = '<i class="fas fa-times-circle"></i> Processing Failed'
+        status_class = "danger"
+
+    # Format features count
+    features_text = f"{vehicle.marked_features_count or 0} features marked"
+
+    # Format description status
+    desc_status = '<i class="fas fa-edit"></i> Description Updated' if vehicle.description_updated else '<i class="fas fa-file-alt"></i> No Description'
+    desc_class = "success" if vehicle.description_updated else "muted"
+
+    # Format special features
+    special_features = []
+    if vehicle.no_fear_certificate:
+        special_features.append('<i class="fas fa-award"></i> NO FEAR Certified')
+
+    # Book Values processing status
+    book_values_status = '<i class="fas fa-chart-bar"></i> Book Values Processed' if vehicle.book_values_processed else '<i class="fas fa-chart-bar"></i> Book Values Pending'
+
+    # Media Tab processing status
+    media_status = '<i class="fas fa-images"></i> Media Processed' if vehicle.media_tab_processed else '<i class="fas fa-images"></i> Media Pending'
+
+    # Overall processing completeness
+    processing_steps = [
+        vehicle.processing_successful,
+        vehicle.description_updated,
+        vehicle.book_values_processed,
+        vehicle.media_tab_processed
+    ]
+    completed_steps = sum(processing_steps)
+    total_steps = len(processing_steps)
+
+    if completed_steps == total_steps:
+        processing_completeness = f'<i class="fas fa-check-circle"></i> Complete ({completed_steps}/{total_steps})'
+        processing_completeness_class = "success"
+    elif completed_steps > total_steps // 2:
+        processing_completeness = f'<i class="fas fa-spinner"></i> Mostly Complete ({completed_steps}/{total_steps})'
+        processing_completeness_class = "warning"
+    else:
+        processing_completeness = f'<i class="fas fa-exclamation-circle"></i> Partial ({completed_steps}/{total_steps})'
+        processing_completeness_class = "danger"
+
+    return VehicleInfo(
+        id=vehicle.id,
+        name=display_name,
+        stock_number=vehicle.stock_number,
+        vehicle_name=vehicle.vehicle_name,
+        vin=vehicle.vin,
+        odometer=vehicle.odometer,
+        days_in_inventory=vehicle.days_in_inventory,
+        processing_date=processing_date,
+        processing_date_raw=vehicle.processing_date.isoformat() if vehicle.processing_date else None,
+        status=status,
+        status_class=status_class,
+        processing_status=processing_status,
+        processing_successful=vehicle.processing_successful,
+        description_status=desc_status,
+        description_class=desc_class,
+        description_updated=vehicle.description_updated,
+        features_count=vehicle.marked_features_count or 0,
+        features_text=features_text,
+        no_fear_certificate=vehicle.no_fear_certificate,
+        special_features=special_features,
+        processing_duration=vehicle.processing_duration,
+        has_errors=bool(has_errors),
+        final_description=description_preview + '...' if description_preview and description_length > DESCRIPTION_PREVIEW_LENGTH else description_preview,
+        no_build_data_found=getattr(vehicle, 'no_build_data_found', False),
+        book_values_processed=vehicle.book_values_processed,
+        media_tab_processed=vehicle.media_tab_processed,
+        book_values_status=book_values_status,
+        media_status=media_status,
+        processing_completeness=processing_completeness,
+        processing_completeness_class=processing_completeness_class
+    )
+
+def build_activity_item(vehicle) -> ActivityItem:
+    """Recent activity entry of a record"""
+    # Time ago calculation
+    if vehicle.processing_date:
+        time_diff = datetime.utcnow() - vehicle.processing_date
+        if time_diff.days > 0:
+            time_ago = f"{time_diff.days} day{'s' if time_diff.days > 1 else ''} ago"
+        elif time_diff.seconds > 3600:
+            hours = time_diff.seconds // 3600
+            time_ago = f"{hours} hour{'s' if hours > 1 else ''} ago"
+        elif time_diff.seconds > 60:
+            minutes = time_diff.seconds // 60
+            time_ago = f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+        else:
+            time_ago = "Just now"
+    else:
+        time_ago = "Unknown time"
+
+    # Activity description
+    action_parts = []
+    if vehicle.processing_successful:
+        action_parts.append("✅ processed")
+    else:
+        action_parts.append("❌ failed to process")
+
+    if vehicle.description_updated:
+        action_parts.append("📝 updated description")
+
+    if vehicle.marked_features_count and vehicle.marked_features_count > 0:
+        action_parts.append(f"⭐ marked {vehicle.marked_features_count} features")
+
+    if vehicle.no_fear_certificate:
+        action_parts.append("🏆 NO FEAR certified")
+
+    action_description = f"Vehicle #{vehicle.stock_number} " + ", ".join(action_parts)
+
+    return ActivityItem(
+        id=vehicle.id,
+        stock_number=vehicle.stock_number,
+        action=action_description,
+        time_ago=time_ago,
+        processing_successful=vehicle.processing_successful,
+        processing_date=vehicle.processing_date.isoformat() if vehicle.processing_date else None
+    )
+
+def load_activity_summaries(record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Activity stream event data of the given records that still exist, by record id"""
+    from database import VehicleProcessingRecord
+
+    with db_manager.get_session() as session:
+        rows = session.query(VehicleProcessingRecord).add_columns(
+            *get_vehicle_list_columns()
+        ).filter(VehicleProcessingRecord.id.in_(record_ids)).all()
+        return {
+            vehicle.id: {
+                'environment_id': vehicle.environment_id,
+                'vehicle': build_vehicle_info(vehicle, description_preview, description_length, has_errors).model_dump(mode='json'),
+                'activity': build_activity_item(vehicle).model_dump(mode='json')
+            }
+            for vehicle, description_preview, description_length, has_errors in rows
+        }
+
+# Helper Functions for Exports
+VEHICLE_EXPORT_BATCH_SIZE = int(os.getenv("VEHICLE_EXPORT_BATCH_SIZE", "1000"))
+
+# Columns of /api/vehicles/export, in output order. The descriptions and AI analysis stay in
+# record_contents; exports carry the description length instead.
+VEHICLE_EXPORT_COLUMNS = (
+    'id', 'environment_id', 'stock_number', 'vin', 'vehicle_name', 'processing_date',
+    'processing_session_id', 'odometer', 'days_in_inventory', 'processing_status',
+    'processing_successful', 'processing_duration', 'description_updated', 'description_length',
+    'marked_features_count', 'no_fear_certificate', 'no_build_data_found', 'book_values_processed',
+    'media_tab_processed', 'errors_encountered', 'book_values_before_processing',
+    'book_values_after_processing'
+)
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+def format_export_value(value: Any, export_format: str) -> Any:
+    """Value of an export cell: ISO dates, and JSON text for JSON columns in CSV"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if export_format == 'csv' and isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+def iter_vehicle_export(query, export_format: str, batch_size: int = VEHICLE_EXPORT_BATCH_SIZE):
+    """
+    Encoded export chunks of a query over VEHICLE_EXPORT_COLUMNS, one chunk per batch of rows.
+    Rows are fetched batch by batch (a server-side cursor on PostgreSQL), so memory does not
+    grow with the number of rows exported.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == 'csv' else None
+    if writer:
+        writer.writerow(VEHICLE_EXPORT_COLUMNS)
+
+    for count, row in enumerate(query.yield_per(batch_size), 1):
+        values = [format_export_value(value, export_format) for value in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(VEHICLE_EXPORT_COLUMNS, values)), default=str))
+            buffer.write("\n")
+        if count % batch_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
 # Helper Functions for Statistics
 def calculate_book_value_difference(before_data: Dict, after_data: Dict) -> float:
     """Calculate the difference between before and after book values using KBB as primary"""
@@ -418,17 +995,6 @@ def calculate_book_value_difference(before_data: Dict, after_data: Dict) -> floa
     except (ValueError, TypeError, KeyError):
         return 0.0
 
-def parse_currency_value(value_str: str) -> float:
-    """Parse currency string like '$25,000' to float"""
-    if not value_str or value_str.strip() == "":
-        return 0.0
-    try:
-        # Remove $ signs, commas, and convert to float
-        cleaned = value_str.replace('$', '').replace(',', '').strip()
-        return float(cleaned) if cleaned else 0.0
-    except (ValueError, TypeError):
-        return 0.0
-
 def calculate_book_value_insights(before_data: Dict, after_data: Dict) -> Dict:
     """Calculate detailed book value insights with category-by-category analysis"""
     insights = {
@@ -498,10 +1064,88 @@ def calculate_book_value_insights(before_data: Dict, after_data: Dict) -> Dict:
             insights['summary'] = "No value change detected"
             
     except Exception as e:
-        print(f"Error calculating book value insights: {e}")
+        logger.error("Error calculating book value insights: %s", e)
         
     return insights
 
+def calculate_scalar_statistics(rollup_query, record_query) -> Dict[str, Any]:
+    """
+    Compute all scalar KPIs from the filtered daily store rollups in a single aggregate SELECT.
+    The first day of the 7-day window is only partly covered, so it is counted from the raw records.
+    """
+    from database import VehicleProcessingRecord, DailyStoreRollup
+    from sqlalchemy import func
+
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    boundary_day = seven_days_ago.date()
+    boundary_day_end = datetime.combine(boundary_day, datetime.min.time()) + timedelta(days=1)
+
+    row = rollup_query.with_entities(
+        func.coalesce(func.sum(DailyStoreRollup.processed_count), 0).label('total_vehicles'),
+        func.coalesce(func.sum(DailyStoreRollup.successful_count), 0).label('successful_processing'),
+        func.coalesce(func.sum(DailyStoreRollup.descriptions_updated_count), 0).label('descriptions_updated'),
+        func.coalesce(func.sum(DailyStoreRollup.no_fear_count), 0).label('no_fear_certificates'),
+        func.coalesce(func.sum(DailyStoreRollup.processed_count).filter(DailyStoreRollup.rollup_date > boundary_day), 0).label('recent_activity_7_days'),
+        func.coalesce(func.sum(DailyStoreRollup.features_marked_sum), 0).label('total_features_marked')
+    ).order_by(None).one()
+
+    boundary_day_count = record_query.filter(
+        VehicleProcessingRecord.processing_date >= seven_days_ago,
+        VehicleProcessingRecord.processing_date < boundary_day_end
+    ).order_by(None).count()
+
+    return {
+        'total_vehicles': int(row.total_vehicles),
+        'successful_processing': int(row.successful_processing),
+        'descriptions_updated': int(row.descriptions_updated),
+        'no_fear_certificates': int(row.no_fear_certificates),
+        'recent_activity_7_days': int(row.recent_activity_7_days) + boundary_day_count,
+        'total_features_marked': int(row.total_features_marked)
+    }
+
+def calculate_book_value_totals(book_value_query, month_start: datetime, year_start: datetime) -> Dict[str, tuple]:
+    """
+    Aggregate MTD and YTD book value differences per source from the daily book value rollups.
+    Returns {'mtd': (total, insights), 'ytd': (total, insights)}.
+    """
+    from database import DailyStoreBookValueRollup
+    from sqlalchemy import func
+
+    period_start = min(month_start, year_start).date()
+    in_month = DailyStoreBookValueRollup.rollup_date >= month_start.date()
+
+    rows = book_value_query.filter(
+        DailyStoreBookValueRollup.rollup_date >= period_start
+    ).with_entities(
+        DailyStoreBookValueRollup.source,
+        func.sum(DailyStoreBookValueRollup.record_count).filter(in_month).label('mtd_count'),
+        func.sum(DailyStoreBookValueRollup.difference_sum).filter(in_month).label('mtd_difference'),
+        func.sum(DailyStoreBookValueRollup.primary_difference_sum).filter(in_month).label('mtd_primary'),
+        func.sum(DailyStoreBookValueRollup.difference_sum).label('ytd_difference'),
+        func.sum(DailyStoreBookValueRollup.primary_difference_sum).label('ytd_primary')
+    ).group_by(DailyStoreBookValueRollup.source).order_by(None).all()
+
+    def build_period(label: str, entries) -> tuple:
+        insights = {'categories': {}, 'total_difference': 0.0, 'best_improvement': {'category': '', 'amount': 0.0}, 'primary_source': 'KBB', 'summary': f'No {label} data available'}
+        total = 0.0
+        for source, difference, primary in entries:
+            insights['categories'][source] = {'before': 0, 'after': 0, 'difference': float(difference or 0), 'improvement': False}
+            total += float(primary or 0)
+
+        insights['total_difference'] = total
+        if total > 0:
+            insights['summary'] = f"${total:,.0f} total increase ({label})"
+        elif total < 0:
+            insights['summary'] = f"${abs(total):,.0f} total decrease ({label})"
+        else:
+            insights['summary'] = f"No {label} value changes detected"
+        return total, insights
+
+    return {
+        'mtd': build_period('MTD', [(row.source, row.mtd_difference, row.mtd_primary) for row in rows if row.mtd_count]),
+        'ytd': build_period('YTD', [(row.source, row.ytd_difference, row.ytd_primary) for row in rows])
+    }
+
 def calculate_time_saved(vehicle_count: int) -> tuple[int, str]:
     """Calculate time saved based on vehicle count (11 minutes per vehicle)"""
     total_minutes = vehicle_count * 11
@@ -525,23 +1169,17 @@ def get_year_start() -> datetime:
     now = datetime.utcnow()
     return datetime(now.year, 1, 1)
 
-# Quick check to see if we can access data
-try:
-    with db_manager.get_session() as session:
-        from database import VehicleProcessingRecord
-        count = session.query(VehicleProcessingRecord).count()
-        print(f"📊 Found {count} vehicle records in database")
-except Exception as e:
-    print(f"⚠️ Error accessing database: {e}")
-
 # Authentication Routes
 # Note: Public signup removed - users must be created by admins
 
 @app.post("/api/login", response_model=Token)
-async def login(user_data: UserLogin):
+async def login(user_data: UserLogin, background_tasks: BackgroundTasks):
     """User login endpoint"""
     try:
-        user = authenticate_user(user_data.username, user_data.password)
+        # On the password check threads, not behind the database requests in the worker pool
+        user = await to_thread.run_sync(
+            authenticate_user, user_data.username, user_data.password, limiter=password_check_limiter
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -549,12 +1187,8 @@ async def login(user_data: UserLogin):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Update last login
-        with db_manager.get_session() as session:
-            session.query(User).filter(User.id == user.id).update({
-                "last_login": datetime.utcnow()
-            })
-            session.commit()
+        # Update last login once the response is sent
+        background_tasks.add_task(record_login, user)
         
         # Create proper JWT access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -606,7 +1240,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 # User Management Routes
 
 @app.post("/api/admin/users", response_model=UserManagementResponse)
-async def create_user_by_admin(
+def create_user_by_admin(
     user_data: AdminUserCreate,
     current_user: User = Depends(get_current_admin_or_higher)
 ):
@@ -657,6 +1291,7 @@ async def create_user_by_admin(
             session.add(new_user)
             session.commit()
             session.refresh(new_user)
+            principal_cache.invalidate_user(username=new_user.username)
             
             return UserManagementResponse(
                 success=True,
@@ -683,7 +1318,7 @@ async def create_user_by_admin(
         )
 
 @app.post("/api/superadmin/admins", response_model=UserManagementResponse)
-async def create_admin_by_superadmin(
+def create_admin_by_superadmin(
     user_data: UserCreate,
     current_user: User = Depends(get_current_super_admin)
 ):
@@ -730,6 +1365,7 @@ async def create_admin_by_superadmin(
             session.add(new_user)
             session.commit()
             session.refresh(new_user)
+            principal_cache.invalidate_user(username=new_user.username)
             
             return UserManagementResponse(
                 success=True,
@@ -756,7 +1392,7 @@ async def create_admin_by_superadmin(
         )
 
 @app.get("/api/admin/users", response_model=List[UserListItem])
-async def list_managed_users(current_user: User = Depends(get_current_admin_or_higher)):
+def list_managed_users(current_user: User = Depends(get_current_admin_or_higher)):
     """List users that the current admin can manage"""
     try:
         with db_manager.get_session() as session:
@@ -786,7 +1422,7 @@ async def list_managed_users(current_user: User = Depends(get_current_admin_or_h
         )
 
 @app.delete("/api/admin/users/{user_id}", response_model=UserManagementResponse)
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: User = Depends(get_current_admin_or_higher)
 ):
@@ -811,6 +1447,7 @@ async def delete_user(
             username = target_user.username
             session.delete(target_user)
             session.commit()
+            principal_cache.invalidate_user(username=username, user_id=user_id)
             
             return UserManagementResponse(
                 success=True,
@@ -825,7 +1462,7 @@ async def delete_user(
         )
 
 @app.put("/api/admin/users/{user_id}/toggle-active", response_model=UserManagementResponse)
-async def toggle_user_active(
+def toggle_user_active(
     user_id: int,
     current_user: User = Depends(get_current_admin_or_higher)
 ):
@@ -849,6 +1486,7 @@ async def toggle_user_active(
             
             target_user.is_active = not target_user.is_active
             session.commit()
+            principal_cache.invalidate_user(username=target_user.username, user_id=user_id)
             
             status_text = "activated" if target_user.is_active else "deactivated"
             return UserManagementResponse(
@@ -864,20 +1502,30 @@ async def toggle_user_active(
         )
 
 @app.get("/api/stores")
-async def get_available_stores(current_user: User = Depends(get_current_user)):
+def get_available_stores(
+    current_user: User = Depends(get_current_user),
+    conditional: ConditionalRequest = Depends(get_conditional_request)
+):
     """Get all available store IDs based on user role"""
     try:
+        if check_not_modified(conditional, 'stores', current_user, None, {}):
+            return conditional.not_modified()
+        
         with db_manager.get_session() as session:
             from database import VehicleProcessingRecord
             from sqlalchemy import distinct
             
             if current_user.role == UserRole.SUPER_ADMIN:
-                # Super admin can see all distinct environment_ids
-                store_ids = session.query(distinct(VehicleProcessingRecord.environment_id))\
-                    .filter(VehicleProcessingRecord.environment_id.isnot(None))\
-                    .order_by(VehicleProcessingRecord.environment_id)\
-                    .all()
-                available_stores = [store_id[0] for store_id in store_ids if store_id[0]]
+                # Super admin can see all distinct environment_ids (cached until a store's records change)
+                cache_key, available_stores = response_cache.lookup('stores', None, {})
+                if available_stores is None:
+                    store_ids = session.query(distinct(VehicleProcessingRecord.environment_id))\
+                        .filter(VehicleProcessingRecord.environment_id.isnot(None))\
+                        .order_by(VehicleProcessingRecord.environment_id)\
+                        .all()
+                    available_stores = [store_id[0] for store_id in store_ids if store_id[0]]
+                    if cache_key:
+                        response_cache.put(cache_key, available_stores)
             elif current_user.role == UserRole.ADMIN:
                 # Admin sees only their assigned stores
                 available_stores = current_user.get_store_ids()
@@ -898,32 +1546,32 @@ async def get_available_stores(current_user: User = Depends(get_current_user)):
         )
 
 @app.get("/api/debug/date-distribution")
-async def get_date_distribution(
+def get_date_distribution(
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
     current_user: User = Depends(get_current_user)
 ):
     """Debug endpoint to check date distribution of vehicles"""
     try:
         with db_manager.get_session() as session:
-            from database import VehicleProcessingRecord
+            from database import DailyStoreRollup
             from sqlalchemy import func
             
-            # Get date distribution
+            # Get date distribution from the daily store rollups
             query = session.query(
-                func.date(VehicleProcessingRecord.processing_date).label('date'),
-                func.count(VehicleProcessingRecord.id).label('count')
+                DailyStoreRollup.rollup_date.label('date'),
+                func.sum(DailyStoreRollup.processed_count).label('count')
             )
-            query = apply_store_filter(query, current_user, store_id)
+            query = apply_store_filter(query, current_user, store_id, DailyStoreRollup.environment_id)
             dates = query.group_by(
-                func.date(VehicleProcessingRecord.processing_date)
+                DailyStoreRollup.rollup_date
             ).order_by(
-                func.date(VehicleProcessingRecord.processing_date).desc()
+                DailyStoreRollup.rollup_date.desc()
             ).all()
             
             distribution = [
                 {
                     "date": date.strftime('%Y-%m-%d'),
-                    "count": count,
+                    "count": int(count),
                     "day_name": date.strftime('%A')
                 }
                 for date, count in dates
@@ -931,10 +1579,10 @@ async def get_date_distribution(
             
             # Get min and max dates
             min_max_query = session.query(
-                func.min(VehicleProcessingRecord.processing_date),
-                func.max(VehicleProcessingRecord.processing_date)
+                func.min(DailyStoreRollup.first_processing_date),
+                func.max(DailyStoreRollup.last_processing_date)
             )
-            min_max_query = apply_store_filter(min_max_query, current_user, store_id)
+            min_max_query = apply_store_filter(min_max_query, current_user, store_id, DailyStoreRollup.environment_id)
             min_max = min_max_query.first()
             
             return JSONResponse({
@@ -949,7 +1597,7 @@ async def get_date_distribution(
                 "current_year_count": len([d for d in distribution if d["date"].startswith(str(datetime.now().year))])
             })
     except Exception as e:
-        print(f"Error getting date distribution: {str(e)}")
+        logger.error("Error getting date distribution: %s", e)
         return JSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
@@ -973,17 +1621,21 @@ async def dashboard(request: Request):
     })
 
 @app.get("/api/vehicles", response_model=VehiclesResponse)
-async def get_vehicles(
+def get_vehicles(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    search: str = Query("", description="Search by stock number"),
+    after: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor; replaces page"),
+    include_total: bool = Query(True, description="Include the total count (cached briefly)"),
+    search: str = Query("", description="Search by stock number, VIN or vehicle name"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    error: Optional[str] = Query(None, max_length=500, description="Only vehicles whose recorded errors include this message"),
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    conditional: ConditionalRequest = Depends(get_conditional_request)
 ):
     """Get all vehicles with pagination and search"""
-    print(f"Vehicles API called with start_date={start_date}, end_date={end_date}, search={search}")
+    logger.debug("Vehicles API called with start_date=%s, end_date=%s, search=%r", start_date, end_date, search)
     
     # Handle null/empty string dates
     if start_date == "null" or start_date == "":
@@ -993,176 +1645,279 @@ async def get_vehicles(
         
     try:
         search = search.strip()
+        params = {
+            'per_page': per_page, 'include_total': include_total, 'search': search,
+            'start_date': start_date, 'end_date': end_date, 'error': error
+        }
+        if check_not_modified(conditional, 'vehicles', current_user, store_id, dict(params, page=page, after=after)):
+            return conditional.not_modified()
+        
+        # The first page is what every dashboard open and refresh requests; serve it from the cache
+        cache_key = None
+        if page == 1 and not after:
+            cache_key, cached = response_cache.lookup('vehicles', get_store_scope(current_user, store_id), params)
+            if cached is not None:
+                return cached
+        
+        start_dt, end_dt = parse_date_range(start_date, end_date)
         
         # Get vehicles from database
         with db_manager.get_session() as session:
             from database import VehicleProcessingRecord
+            from sqlalchemy import tuple_
             
             query = session.query(VehicleProcessingRecord)
             
             # Apply role-based store filtering
-            print(f"DEBUG: User role={current_user.role}, store_ids={current_user.get_store_ids()}, selected_store_id={store_id}")
             query = apply_store_filter(query, current_user, store_id)
-            print(f"DEBUG: Query after store filter applied")
             
-            # Apply search filter if provided
-            if search:
+            # Apply search, error and date range filters if provided
+            query = apply_vehicle_filters(query, session.get_bind().dialect.name, search, start_dt, end_dt, error)
+            
+            # Get total count (optional; cached per filter set for a short time)
+            total = None
+            if include_total:
+                count_key = (
+                    tuple(sorted(get_accessible_store_ids(current_user, store_id))),
+                    current_user.role.value, current_user.store_id, search, start_date, end_date, error
+                )
+                total = get_cached_count(count_key, query)
+                logger.debug("Total vehicles after filtering: %d", total)
+
+            # Newest first, with id as tie-breaker so keyset pages are stable
+            query = query.order_by(
+                VehicleProcessingRecord.processing_date.desc(),
+                VehicleProcessingRecord.id.desc()
+            )
+            if after:
+                cursor_date, cursor_id = decode_vehicle_cursor(after)
+                # The plain date bound lets PostgreSQL skip monthly partitions newer than the cursor
                 query = query.filter(
-                    VehicleProcessingRecord.stock_number.ilike(f'%{search}%')
+                    VehicleProcessingRecord.processing_date <= cursor_date,
+                    tuple_(VehicleProcessingRecord.processing_date, VehicleProcessingRecord.id) < (cursor_date, cursor_id)
                 )
-            
-            # Apply date range filter if provided
-            if start_date:
-                try:
-                    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                    query = query.filter(VehicleProcessingRecord.processing_date >= start_dt)
-                    print(f"Applied start date filter: {start_dt}")
-                except ValueError:
-                    raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
-            
-            if end_date:
-                try:
-                    end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)  # Include entire end day
-                    query = query.filter(VehicleProcessingRecord.processing_date < end_dt)
-                    print(f"Applied end date filter: {end_dt}")
-                except ValueError:
-                    raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
-            
-            # Get total count
-            total = query.count()
-            print(f"DEBUG: Total vehicles after filtering: {total}")
+            else:
+                query = query.offset((page - 1) * per_page)
 
-            # Apply pagination and ordering
-            vehicles = query.order_by(
-                VehicleProcessingRecord.processing_date.desc()
-            ).offset((page - 1) * per_page).limit(per_page).all()
-            print(f"DEBUG: Returned {len(vehicles)} vehicles for page {page}")
+            # Fetch one extra row to know whether another page follows. The large Text columns are
+            # deferred; the description preview and error flag are computed in SQL instead.
+            rows = query.add_columns(*get_vehicle_list_columns()).limit(per_page + 1).all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            next_cursor = encode_vehicle_cursor(rows[-1][0].processing_date, rows[-1][0].id) if has_next and rows else None
+            logger.debug("Returned %d vehicles for page %s", len(rows), "after cursor" if after else page)
             
             # Convert to response format
-            vehicle_list = []
-            for vehicle in vehicles:
-                # Use actual vehicle name if available, otherwise create a friendly name
-                display_name = vehicle.vehicle_name or f"Vehicle #{vehicle.stock_number}"
-                if vehicle.vin and not vehicle.vehicle_name:
-                    display_name += f" (VIN: ...{vehicle.vin[-6:]})"
-                
-                # Format processing date
-                processing_date = vehicle.processing_date.strftime('%B %d, %Y at %I:%M %p') if vehicle.processing_date else 'Unknown'
-                
-                # Calculate status based on processing_status and success
-                processing_status = getattr(vehicle, 'processing_status', None)
-                # If processing_status is None, infer from processing_successful
-                if processing_status is None:
-                    processing_status = 'completed' if vehicle.processing_successful else 'failed'
-                # Check for no build data first - this takes priority
-                if getattr(vehicle, 'no_build_data_found', False):
-                    status = '<i class="fas fa-clipboard-list"></i> No Build Data Found'
-                    status_class = "warning"
-                elif processing_status == 'processing':
-                    status = '<i class="fas fa-spinner fa-spin"></i> Processing...'
-                    status_class = "warning"
-                elif processing_status == 'pending':
-                    status = '<i class="fas fa-clock"></i> Pending'
-                    status_class = "muted"
-                elif vehicle.processing_successful:
-                    status = '<i class="fas fa-check-circle"></i> Completed Successfully'
-                    status_class = "success"
-                else:
-                    status = '<i class="fas fa-times-circle"></i> Processing Failed'
-                    status_class = "danger"
-                
-                # Format features count
-                features_text = f"{vehicle.marked_features_count or 0} features marked"
-                
-                # Format description status
-                desc_status = '<i class="fas fa-edit"></i> Description Updated' if vehicle.description_updated else '<i class="fas fa-file-alt"></i> No Description'
-                desc_class = "success" if vehicle.description_updated else "muted"
-                
-                # Format special features
-                special_features = []
-                if vehicle.no_fear_certificate:
-                    special_features.append('<i class="fas fa-award"></i> NO FEAR Certified')
-                
-                # Book Values processing status
-                book_values_status = '<i class="fas fa-chart-bar"></i> Book Values Processed' if vehicle.book_values_processed else '<i class="fas fa-chart-bar"></i> Book Values Pending'
-                
-                # Media Tab processing status
-                media_status = '<i class="fas fa-images"></i> Media Processed' if vehicle.media_tab_processed else '<i class="fas fa-images"></i> Media Pending'
-                
-                # Overall processing completeness
-                processing_steps = [
-                    vehicle.processing_successful,
-                    vehicle.description_updated,
-                    vehicle.book_values_processed,
-                    vehicle.media_tab_processed
-                ]
-                completed_steps = sum(processing_steps)
-                total_steps = len(processing_steps)
-                
-                if completed_steps == total_steps:
-                    processing_completeness = f'<i class="fas fa-check-circle"></i> Complete ({completed_steps}/{total_steps})'
-                    processing_completeness_class = "success"
-                elif completed_steps > total_steps // 2:
-                    processing_completeness = f'<i class="fas fa-spinner"></i> Mostly Complete ({completed_steps}/{total_steps})'
-                    processing_completeness_class = "warning"
-                else:
-                    processing_completeness = f'<i class="fas fa-exclamation-circle"></i> Partial ({completed_steps}/{total_steps})'
-                    processing_completeness_class = "danger"
-                
-                vehicle_info = VehicleInfo(
-                    id=vehicle.id,
-                    name=display_name,
-                    stock_number=vehicle.stock_number,
-                    vehicle_name=vehicle.vehicle_name,
-                    vin=vehicle.vin,
-                    odometer=vehicle.odometer,
-                    days_in_inventory=vehicle.days_in_inventory,
-                    processing_date=processing_date,
-                    processing_date_raw=vehicle.processing_date.isoformat() if vehicle.processing_date else None,
-                    status=status,
-                    status_class=status_class,
-                    processing_status=processing_status,
-                    processing_successful=vehicle.processing_successful,
-                    description_status=desc_status,
-                    description_class=desc_class,
-                    description_updated=vehicle.description_updated,
-                    features_count=vehicle.marked_features_count or 0,
-                    features_text=features_text,
-                    no_fear_certificate=vehicle.no_fear_certificate,
-                    special_features=special_features,
-                    processing_duration=vehicle.processing_duration,
-                    has_errors=bool(vehicle.errors_encountered),
-                    final_description=vehicle.final_description[:200] + '...' if vehicle.final_description and len(vehicle.final_description) > 200 else vehicle.final_description,
-                    no_build_data_found=getattr(vehicle, 'no_build_data_found', False),
-                    book_values_processed=vehicle.book_values_processed,
-                    media_tab_processed=vehicle.media_tab_processed,
-                    book_values_status=book_values_status,
-                    media_status=media_status,
-                    processing_completeness=processing_completeness,
-                    processing_completeness_class=processing_completeness_class
-                )
-                vehicle_list.append(vehicle_info)
+            vehicle_list = [
+                build_vehicle_info(vehicle, description_preview, description_length, has_errors)
+                for vehicle, description_preview, description_length, has_errors in rows
+            ]
             
             pagination = PaginationInfo(
                 page=page,
                 per_page=per_page,
                 total=total,
-                pages=(total + per_page - 1) // per_page,
-                has_prev=page > 1,
-                has_next=page * per_page < total
+                pages=(total + per_page - 1) // per_page if total is not None else None,
+                has_prev=bool(after) or page > 1,
+                has_next=has_next,
+                next_cursor=next_cursor
             )
             
-            return VehiclesResponse(
+            response = VehiclesResponse(
                 success=True,
                 vehicles=vehicle_list,
                 pagination=pagination
             )
+            if cache_key:
+                response_cache.put(cache_key, response.model_dump(mode='json'))
+            return response
             
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Changes /api/vehicles/changes returns at most; a client further behind is told to reload
+VEHICLE_CHANGES_LIMIT = int(os.getenv("VEHICLE_CHANGES_LIMIT", "500"))
+
+@app.get("/api/vehicles/changes", response_model=VehicleChangesResponse)
+def get_vehicle_changes(
+    since: Optional[str] = Query(None, description="Cursor of the previous response; omit to get a starting cursor"),
+    store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Vehicles created, updated or deleted in the user's stores since a cursor, so a client can keep
+    its copy of the list current without downloading it again. Records carry the write version of
+    their store (row_version); the cursor holds the version each store was at.
+    """
+    try:
+        seen = decode_changes_cursor(since) if since else None
+        scope = get_store_scope(current_user, store_id)
+
+        with db_manager.get_session() as session:
+            from database import VehicleProcessingRecord, VehicleRecordTombstone, get_store_change_versions, NO_ENVIRONMENT_ROLLUP_KEY
+
+            # Versions first: writes up to them have committed, later ones are left for the next sync
+            stores = get_store_change_versions(session, scope)
+            cursor = encode_changes_cursor({store: version for store, (version, _) in stores.items()})
+            reset = VehicleChangesResponse(success=True, cursor=cursor, reset=True, vehicles=[], deleted=[])
+            if seen is None or any(seen.get(store, 0) < pruned for store, (_, pruned) in stores.items()):
+                return reset
+
+            rows, tombstones = [], []
+            for store, (version, _) in sorted(stores.items()):
+                after = seen.get(store, 0)
+                if version <= after:
+                    continue
+                remaining = VEHICLE_CHANGES_LIMIT + 1 - len(rows) - len(tombstones)
+                store_filter = (
+                    VehicleProcessingRecord.environment_id.is_(None) if store == NO_ENVIRONMENT_ROLLUP_KEY
+                    else VehicleProcessingRecord.environment_id == store
+                )
+                rows += session.query(VehicleProcessingRecord).add_columns(*get_vehicle_list_columns()).filter(
+                    store_filter,
+                    VehicleProcessingRecord.row_version > after,
+                    VehicleProcessingRecord.row_version <= version
+                ).order_by(VehicleProcessingRecord.row_version).limit(remaining).all()
+                tombstones += session.query(VehicleRecordTombstone.record_id, VehicleRecordTombstone.environment_id).filter(
+                    VehicleRecordTombstone.environment_id == store,
+                    VehicleRecordTombstone.row_version > after,
+                    VehicleRecordTombstone.row_version <= version
+                ).order_by(VehicleRecordTombstone.row_version).limit(remaining).all()
+                if len(rows) + len(tombstones) > VEHICLE_CHANGES_LIMIT:
+                    return reset
+
+            # A record moved between two stores in scope is an update, not a delete
+            written = {vehicle.id for vehicle, _, _, _ in rows}
+            deleted = {
+                record_id: VehicleTombstone(id=record_id, environment_id=environment_id or None)
+                for record_id, environment_id in tombstones if record_id not in written
+            }
+            logger.debug("Returned %d changed and %d deleted vehicles since cursor", len(rows), len(deleted))
+            return VehicleChangesResponse(
+                success=True,
+                cursor=cursor,
+                reset=False,
+                vehicles=[
+                    build_vehicle_info(vehicle, description_preview, description_length, has_errors)
+                    for vehicle, description_preview, description_length, has_errors in rows
+                ],
+                deleted=list(deleted.values())
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/vehicles/export")
+def export_vehicles(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet|arrow)$", description="csv, ndjson, parquet or arrow (IPC stream)"),
+    search: str = Query("", description="Search by stock number, VIN or vehicle name"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    error: Optional[str] = Query(None, max_length=500, description="Only vehicles whose recorded errors include this message"),
+    store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every vehicle record matching the list filters as CSV, NDJSON, Parquet or Arrow, oldest first"""
+    columnar = export_format in columnar_export.COLUMNAR_MEDIA_TYPES
+    try:
+        search = search.strip()
+        start_dt, end_dt = parse_date_range(start_date, end_date)
+        if columnar:
+            columnar_export.require_pyarrow()
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def generate():
+        # The session lives as long as the response body is being sent
+        with db_manager.get_session() as session:
+            from database import VehicleProcessingRecord
+            
+            if columnar:
+                query = session.query(*columnar_export.source_columns())
+            else:
+                query = session.query(*[getattr(VehicleProcessingRecord, name) for name in VEHICLE_EXPORT_COLUMNS])
+            query = apply_store_filter(query, current_user, store_id)
+            query = apply_vehicle_filters(query, session.get_bind().dialect.name, search, start_dt, end_dt, error)
+            query = query.order_by(VehicleProcessingRecord.processing_date, VehicleProcessingRecord.id)
+            try:
+                if columnar:
+                    yield from columnar_export.iter_columnar_export(query.yield_per(VEHICLE_EXPORT_BATCH_SIZE), export_format, VEHICLE_EXPORT_BATCH_SIZE)
+                else:
+                    yield from iter_vehicle_export(query, export_format)
+            except Exception as e:
+                # Headers are already sent; the client sees a truncated body
+                logger.error("Vehicle export failed for %s: %s", current_user.username, e)
+                raise
+
+    scope = re.sub(r'[^A-Za-z0-9_.-]', '_', store_id) if store_id else 'all'
+    filename = f"vehicles-{scope}-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+    return StreamingResponse(
+        generate(),
+        media_type=columnar_export.COLUMNAR_MEDIA_TYPES[export_format] if columnar else EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/vehicles/search", response_model=SearchSuggestionsResponse)
+def search_vehicle_suggestions(
+    q: str = Query(..., min_length=1, max_length=100, description="Stock number, VIN or vehicle name fragment"),
+    limit: int = Query(8, ge=1, le=25),
+    store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
+    current_user: User = Depends(get_current_user)
+):
+    """Typeahead suggestions: top matches with exact and prefix matches ranked first"""
+    try:
+        term = q.strip()
+        if not term:
+            return SearchSuggestionsResponse(success=True, query=term, suggestions=[])
+        
+        with db_manager.get_session() as session:
+            from database import VehicleProcessingRecord
+            
+            # Only the columns the suggestions need, not the full record
+            query = session.query(
+                VehicleProcessingRecord.id,
+                VehicleProcessingRecord.stock_number,
+                VehicleProcessingRecord.vin,
+                VehicleProcessingRecord.vehicle_name,
+                VehicleProcessingRecord.processing_date
+            )
+            query = apply_store_filter(query, current_user, store_id)
+            dialect_name = session.get_bind().dialect.name
+            rows = query.filter(
+                build_search_filter(term, dialect_name)
+            ).order_by(
+                *build_search_ranking(term, dialect_name)
+            ).limit(limit).all()
+            
+            suggestions = [
+                SearchSuggestion(
+                    id=row.id,
+                    stock_number=row.stock_number,
+                    vin=row.vin,
+                    vehicle_name=row.vehicle_name,
+                    matched_field=get_matched_field(row, term),
+                    processing_date=row.processing_date.isoformat() if row.processing_date else None
+                )
+                for row in rows
+            ]
+            
+            return SearchSuggestionsResponse(success=True, query=term, suggestions=suggestions)
+            
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/vehicle/{vehicle_id}", response_model=VehicleDetailResponse)
-async def get_vehicle_details(
+def get_vehicle_details(
     vehicle_id: int, 
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
     current_user: User = Depends(get_current_user)
@@ -1172,80 +1927,42 @@ async def get_vehicle_details(
         with db_manager.get_session() as session:
             from database import VehicleProcessingRecord
             
-            query = session.query(VehicleProcessingRecord).filter(VehicleProcessingRecord.id == vehicle_id)
+            query = session.query(VehicleProcessingRecord).options(
+                *record_detail_options()
+            ).filter(VehicleProcessingRecord.id == vehicle_id)
             query = apply_store_filter(query, current_user, store_id)
             vehicle = query.first()
             
             if not vehicle:
                 raise HTTPException(status_code=404, detail="Vehicle not found")
             
-            # Parse JSON fields safely
-            import json
-            starred_features = []
+            # JSON payloads load decoded (JSONPayload); summarize them for the detail view
+            starred_features = vehicle.starred_features if isinstance(vehicle.starred_features, list) else []
             starred_features_summary = None
-            if vehicle.starred_features:
-                try:
-                    starred_features = json.loads(vehicle.starred_features)
-                    if starred_features:
-                        feature_names = []
-                        for feature in starred_features:
-                            if isinstance(feature, dict) and 'text' in feature:
-                                feature_names.append(feature['text'][:50])  # Truncate long feature names
-                            elif isinstance(feature, str):
-                                feature_names.append(feature[:50])
-                        starred_features_summary = ", ".join(feature_names[:5])  # Show first 5 features
-                        if len(feature_names) > 5:
-                            starred_features_summary += f" (+{len(feature_names)-5} more)"
-                except:
-                    pass
-            
-            feature_decisions = {}
+            if starred_features:
+                feature_names = []
+                for feature in starred_features:
+                    if isinstance(feature, dict) and 'text' in feature:
+                        feature_names.append(feature['text'][:50])  # Truncate long feature names
+                    elif isinstance(feature, str):
+                        feature_names.append(feature[:50])
+                starred_features_summary = ", ".join(feature_names[:5])  # Show first 5 features
+                if len(feature_names) > 5:
+                    starred_features_summary += f" (+{len(feature_names)-5} more)"
+            
+            feature_decisions = vehicle.feature_decisions if isinstance(vehicle.feature_decisions, dict) else {}
             feature_decisions_summary = None
-            if vehicle.feature_decisions:
-                try:
-                    feature_decisions = json.loads(vehicle.feature_decisions)
-                    if feature_decisions and isinstance(feature_decisions, dict):
-                        # Create a summary of AI decisions
-                        decision_count = len(feature_decisions)
-                        feature_decisions_summary = f"AI analyzed {decision_count} features with recommendations"
-                except:
-                    pass
-            
-            errors_encountered = []
-            if vehicle.errors_encountered:
-                try:
-                    errors_encountered = json.loads(vehicle.errors_encountered)
-                except:
-                    pass
-            
-            media_totals_found = {}
-            if vehicle.media_totals_found:
-                try:
-                    media_totals_found = json.loads(vehicle.media_totals_found)
-                except:
-                    pass
-            
-            # Parse book values
-            book_values_before = {}
-            if vehicle.book_values_before_processing:
-                try:
-                    book_values_before = json.loads(vehicle.book_values_before_processing)
-                except:
-                    pass
-            
-            book_values_after = {}
-            if vehicle.book_values_after_processing:
-                try:
-                    book_values_after = json.loads(vehicle.book_values_after_processing)
-                except:
-                    pass
-            
-            ai_analysis_result = {}
-            if vehicle.ai_analysis_result:
-                try:
-                    ai_analysis_result = json.loads(vehicle.ai_analysis_result)
-                except:
-                    pass
+            if feature_decisions:
+                # Create a summary of AI decisions
+                decision_count = len(feature_decisions)
+                feature_decisions_summary = f"AI analyzed {decision_count} features with recommendations"
+            
+            # Legacy text that was not JSON loads as a plain string; show it as empty
+            errors_encountered = vehicle.errors_encountered if isinstance(vehicle.errors_encountered, list) else []
+            media_totals_found = vehicle.media_totals_found if isinstance(vehicle.media_totals_found, dict) else {}
+            book_values_before = vehicle.book_values_before_processing if isinstance(vehicle.book_values_before_processing, dict) else {}
+            book_values_after = vehicle.book_values_after_processing if isinstance(vehicle.book_values_after_processing, dict) else {}
+            ai_analysis_result = vehicle.ai_analysis_result if isinstance(vehicle.ai_analysis_result, dict) else {}
             
             vehicle_detail = VehicleDetail(
                 id=vehicle.id,
@@ -1291,7 +2008,7 @@ async def get_vehicle_details(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/vehicle/{vehicle_id}")
-async def delete_vehicle(vehicle_id: int, current_user: User = Depends(get_current_user)):
+def delete_vehicle(vehicle_id: int, current_user: User = Depends(get_current_user)):
     """Delete a vehicle record"""
     try:
         with db_manager.get_session() as session:
@@ -1311,32 +2028,97 @@ async def delete_vehicle(vehicle_id: int, current_user: User = Depends(get_curre
                 "stock_number": vehicle.stock_number,
                 "vehicle_name": vehicle.vehicle_name
             }
-            
-            # Delete the vehicle record
-            session.delete(vehicle)
-            session.commit()
-            
-            return {
-                "success": True,
-                "message": f"Vehicle {vehicle_info['stock_number']} deleted successfully",
-                "deleted_vehicle": vehicle_info
-            }
+        
+        # Delete through the database manager so the daily store rollups stay in step
+        if not db_manager.delete_vehicle(vehicle_id):
+            raise HTTPException(status_code=404, detail="Vehicle not found")
+        
+        return {
+            "success": True,
+            "message": f"Vehicle {vehicle_info['stock_number']} deleted successfully",
+            "deleted_vehicle": vehicle_info
+        }
             
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete vehicle: {str(e)}")
 
+@app.post("/api/ingest/batch", response_model=BatchIngestResponse)
+def ingest_batch(
+    batch: BatchIngestRequest,
+    current_user: User = Depends(get_current_admin_or_higher)
+):
+    """Bulk-insert (or, with upsert, merge) processing summaries from the processing workers, reporting errors per summary"""
+    try:
+        # Admins may only write to their own stores; super admins to any store
+        allowed_stores = None if current_user.role == UserRole.SUPER_ADMIN else set(current_user.get_store_ids())
+        
+        errors: List[IngestError] = []
+        summaries = []
+        positions = []  # Index in the request of each summary passed to the database
+        for index, item in enumerate(batch.summaries):
+            try:
+                summary = ProcessingSummaryIn.model_validate(item)
+            except ValidationError as e:
+                message = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" if err['loc'] else err['msg']
+                    for err in e.errors()
+                )
+                stock_number = item.get('stock_number') if isinstance(item, dict) else None
+                errors.append(IngestError(index=index, stock_number=str(stock_number) if stock_number else None, error=message))
+                continue
+            if allowed_stores is not None and summary.environment_id not in allowed_stores:
+                errors.append(IngestError(index=index, stock_number=summary.stock_number,
+                                          error="environment_id must be one of your stores"))
+                continue
+            summaries.append(summary.model_dump())
+            positions.append(index)
+        
+        result = db_manager.log_processing_summaries(
+            summaries, chunk_size=batch.chunk_size or DEFAULT_INGEST_CHUNK_SIZE, upsert=batch.upsert
+        )
+        
+        ids: List[Optional[int]] = [None] * len(batch.summaries)
+        created: List[Optional[bool]] = [None] * len(batch.summaries)
+        for position, record_id, record_created in zip(positions, result['ids'], result['created']):
+            ids[position] = record_id
+            created[position] = record_created
+        for error in result['errors']:
+            errors.append(IngestError(
+                index=positions[error['index']],
+                stock_number=summaries[error['index']]['stock_number'],
+                error=error['error']
+            ))
+        errors.sort(key=lambda error: error.index)
+        
+        return BatchIngestResponse(
+            success=not errors,
+            received=len(batch.summaries),
+            inserted=result['inserted'],
+            updated=result['updated'],
+            failed=len(errors),
+            ids=ids,
+            created=created,
+            errors=errors
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Batch ingest failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Batch ingest failed: {str(e)}")
+
 @app.get("/api/statistics", response_model=StatisticsResponse)
-async def get_statistics(
+def get_statistics(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    conditional: ConditionalRequest = Depends(get_conditional_request)
 ):
     """Get dashboard statistics"""
-    print(f"Statistics API called with start_date={start_date}, end_date={end_date}, store_id={store_id}")
+    logger.debug("Statistics API called with start_date=%s, end_date=%s, store_id=%s", start_date, end_date, store_id)
     
     # Handle null/empty string dates
     if start_date == "null" or start_date == "":
@@ -1345,19 +2127,33 @@ async def get_statistics(
         end_date = None
         
     try:
+        params = {'start_date': start_date, 'end_date': end_date}
+        if check_not_modified(conditional, 'statistics', current_user, store_id, params, time_relative=True):
+            return conditional.not_modified()
+        
+        cache_key, cached = response_cache.lookup('statistics', get_store_scope(current_user, store_id), params)
+        if cached is not None:
+            return cached
+        
         with db_manager.get_session() as session:
-            from database import VehicleProcessingRecord
+            from database import VehicleProcessingRecord, DailyStoreRollup, DailyStoreBookValueRollup
             
-            # Base query with store filtering
+            # KPIs are answered from the daily store rollups; raw records are only read for partial days
             base_query = session.query(VehicleProcessingRecord)
             base_query = apply_store_filter(base_query, current_user, store_id)
+            rollup_query = session.query(DailyStoreRollup)
+            rollup_query = apply_store_filter(rollup_query, current_user, store_id, DailyStoreRollup.environment_id)
+            book_value_query = session.query(DailyStoreBookValueRollup)
+            book_value_query = apply_store_filter(book_value_query, current_user, store_id, DailyStoreBookValueRollup.environment_id)
             
             # Apply date range filter if provided
             if start_date:
                 try:
                     start_dt = datetime.strptime(start_date, "%Y-%m-%d")
                     base_query = base_query.filter(VehicleProcessingRecord.processing_date >= start_dt)
-                    print(f"Statistics: Applied start date filter: {start_dt}")
+                    rollup_query = rollup_query.filter(DailyStoreRollup.rollup_date >= start_dt.date())
+                    book_value_query = book_value_query.filter(DailyStoreBookValueRollup.rollup_date >= start_dt.date())
+                    logger.debug("Statistics: applied start date filter: %s", start_dt)
                 except ValueError:
                     raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
             
@@ -1365,115 +2161,34 @@ async def get_statistics(
                 try:
                     end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)  # Include entire end day
                     base_query = base_query.filter(VehicleProcessingRecord.processing_date < end_dt)
-                    print(f"Statistics: Applied end date filter: {end_dt}")
+                    rollup_query = rollup_query.filter(DailyStoreRollup.rollup_date < end_dt.date())
+                    book_value_query = book_value_query.filter(DailyStoreBookValueRollup.rollup_date < end_dt.date())
+                    logger.debug("Statistics: applied end date filter: %s", end_dt)
                 except ValueError:
                     raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
             
-            # Basic counts
-            total_vehicles = base_query.count()
-            successful_processing = base_query.filter_by(processing_successful=True).count()
-            with_descriptions = base_query.filter_by(description_updated=True).count()
-            with_no_fear = base_query.filter_by(no_fear_certificate=True).count()
-            
+            # Basic counts, 7-day activity and features marked in one aggregate query
+            kpis = calculate_scalar_statistics(rollup_query, base_query)
+            total_vehicles = kpis['total_vehicles']
+            successful_processing = kpis['successful_processing']
+            with_descriptions = kpis['descriptions_updated']
+            with_no_fear = kpis['no_fear_certificates']
+            recent_vehicles = kpis['recent_activity_7_days']
+            total_features_marked = kpis['total_features_marked']
+
             # Calculate success rate
             success_rate = (successful_processing / total_vehicles * 100) if total_vehicles > 0 else 0
-            
-            # Recent activity (last 7 days)
-            seven_days_ago = datetime.utcnow() - timedelta(days=7)
-            recent_vehicles = base_query.filter(
-                VehicleProcessingRecord.processing_date >= seven_days_ago
-            ).count()
-            
-            # Total features marked
-            total_features = base_query.filter(
-                VehicleProcessingRecord.marked_features_count.isnot(None)
-            ).with_entities(VehicleProcessingRecord.marked_features_count).all()
-            
-            total_features_marked = sum(count[0] or 0 for count in total_features)
+
             avg_features_per_vehicle = (total_features_marked / total_vehicles) if total_vehicles > 0 else 0
             
             # Calculate book value totals (Month-to-Date and Year-to-Date)
             month_start = get_month_start()
             year_start = get_year_start()
             
-            # Get vehicles with book values for MTD
-            mtd_vehicles = base_query.filter(
-                VehicleProcessingRecord.processing_date >= month_start,
-                VehicleProcessingRecord.book_values_processed == True,
-                VehicleProcessingRecord.book_values_before_processing.isnot(None),
-                VehicleProcessingRecord.book_values_after_processing.isnot(None)
-            ).all()
-            
-            # Get vehicles with book values for YTD
-            ytd_vehicles = base_query.filter(
-                VehicleProcessingRecord.processing_date >= year_start,
-                VehicleProcessingRecord.book_values_processed == True,
-                VehicleProcessingRecord.book_values_before_processing.isnot(None),
-                VehicleProcessingRecord.book_values_after_processing.isnot(None)
-            ).all()
-            
-            # Calculate total book value differences and insights
-            total_book_value_mtd = 0.0
-            mtd_insights = {'categories': {}, 'total_difference': 0.0, 'best_improvement': {'category': '', 'amount': 0.0}, 'primary_source': 'KBB', 'summary': 'No MTD data available'}
-            
-            for vehicle in mtd_vehicles:
-                try:
-                    before_data = json.loads(vehicle.book_values_before_processing) if vehicle.book_values_before_processing else {}
-                    after_data = json.loads(vehicle.book_values_after_processing) if vehicle.book_values_after_processing else {}
-                    
-                    # Calculate vehicle insights
-                    vehicle_insights = calculate_book_value_insights(before_data, after_data)
-                    difference = calculate_book_value_difference(before_data, after_data)
-                    total_book_value_mtd += difference
-                    
-                    # Aggregate insights
-                    for category, data in vehicle_insights['categories'].items():
-                        if category not in mtd_insights['categories']:
-                            mtd_insights['categories'][category] = {'before': 0, 'after': 0, 'difference': 0, 'improvement': False}
-                        mtd_insights['categories'][category]['difference'] += data['difference']
-                        
-                except (json.JSONDecodeError, TypeError):
-                    continue
-            
-            # Update MTD summary
-            mtd_insights['total_difference'] = total_book_value_mtd
-            if total_book_value_mtd > 0:
-                mtd_insights['summary'] = f"${total_book_value_mtd:,.0f} total increase (MTD)"
-            elif total_book_value_mtd < 0:
-                mtd_insights['summary'] = f"${abs(total_book_value_mtd):,.0f} total decrease (MTD)"
-            else:
-                mtd_insights['summary'] = "No MTD value changes detected"
-            
-            total_book_value_ytd = 0.0
-            ytd_insights = {'categories': {}, 'total_difference': 0.0, 'best_improvement': {'category': '', 'amount': 0.0}, 'primary_source': 'KBB', 'summary': 'No YTD data available'}
-            
-            for vehicle in ytd_vehicles:
-                try:
-                    before_data = json.loads(vehicle.book_values_before_processing) if vehicle.book_values_before_processing else {}
-                    after_data = json.loads(vehicle.book_values_after_processing) if vehicle.book_values_after_processing else {}
-                    
-                    # Calculate vehicle insights
-                    vehicle_insights = calculate_book_value_insights(before_data, after_data)
-                    difference = calculate_book_value_difference(before_data, after_data)
-                    total_book_value_ytd += difference
-                    
-                    # Aggregate insights
-                    for category, data in vehicle_insights['categories'].items():
-                        if category not in ytd_insights['categories']:
-                            ytd_insights['categories'][category] = {'before': 0, 'after': 0, 'difference': 0, 'improvement': False}
-                        ytd_insights['categories'][category]['difference'] += data['difference']
-                        
-                except (json.JSONDecodeError, TypeError):
-                    continue
-            
-            # Update YTD summary
-            ytd_insights['total_difference'] = total_book_value_ytd
-            if total_book_value_ytd > 0:
-                ytd_insights['summary'] = f"${total_book_value_ytd:,.0f} total increase (YTD)"
-            elif total_book_value_ytd < 0:
-                ytd_insights['summary'] = f"${abs(total_book_value_ytd):,.0f} total decrease (YTD)"
-            else:
-                ytd_insights['summary'] = "No YTD value changes detected"
+            # Book value differences per source, aggregated from the daily book value rollups
+            book_value_totals = calculate_book_value_totals(book_value_query, month_start, year_start)
+            total_book_value_mtd, mtd_insights = book_value_totals['mtd']
+            total_book_value_ytd, ytd_insights = book_value_totals['ytd']
             
             # Calculate time saved (based on total successful vehicles)
             time_saved_minutes, time_saved_formatted = calculate_time_saved(successful_processing)
@@ -1496,16 +2211,19 @@ async def get_statistics(
                 time_saved_formatted=time_saved_formatted
             )
             
-            return StatisticsResponse(
+            response = StatisticsResponse(
                 success=True,
                 statistics=statistics
             )
+            if cache_key:
+                response_cache.put(cache_key, response.model_dump(mode='json'))
+            return response
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/debug/book-values")
-async def debug_book_values(
+def debug_book_values(
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
     current_user: User = Depends(get_current_user)
 ):
@@ -1515,7 +2233,7 @@ async def debug_book_values(
             from database import VehicleProcessingRecord
             
             # Get a few records with book values
-            query = session.query(VehicleProcessingRecord)
+            query = session.query(VehicleProcessingRecord).options(undefer_group(RECORD_CONTENT_GROUP))
             query = apply_store_filter(query, current_user, store_id)
             vehicles_with_book_values = query.filter(
                 VehicleProcessingRecord.book_values_processed == True,
@@ -1525,8 +2243,8 @@ async def debug_book_values(
             debug_data = []
             for vehicle in vehicles_with_book_values:
                 try:
-                    before_data = json.loads(vehicle.book_values_before_processing) if vehicle.book_values_before_processing else {}
-                    after_data = json.loads(vehicle.book_values_after_processing) if vehicle.book_values_after_processing else {}
+                    before_data = vehicle.book_values_before_processing or {}
+                    after_data = vehicle.book_values_after_processing or {}
                     difference = calculate_book_value_difference(before_data, after_data)
                     
                     debug_data.append({
@@ -1552,14 +2270,65 @@ async def debug_book_values(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/internal/pool-stats")
+def get_pool_stats(current_user: User = Depends(get_current_super_admin)):
+    """Internal endpoint exposing database connection pool occupancy and wait times"""
+    return {
+        "success": True,
+        "pool": db_manager.get_pool_status(),
+        "max_db_threads": db_manager.get_max_connections(),
+        "principal_cache": principal_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "activity_stream": activity_broadcaster.stats(),
+        "change_feed": db_manager.change_feed.stats()
+    }
+
+@app.get("/api/stream/activity")
+async def stream_activity(
+    request: Request,
+    store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events feed of vehicles created, updated or deleted in the caller's stores, so the
+    dashboard can apply changes without reloading. Comment lines keep idle connections open.
+    """
+    scope = get_store_scope(current_user, store_id)
+
+    async def events():
+        with activity_broadcaster.subscribe(scope) as subscription:
+            yield f"retry: {ACTIVITY_STREAM_RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=ACTIVITY_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # No proxy buffering, or events would arrive in bursts
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.get("/api/recent-activity", response_model=ActivityResponse)
-async def get_recent_activity(
+def get_recent_activity(
     limit: int = Query(10, ge=1, le=50),
     store_id: Optional[str] = Query(None, description="Store ID for super admin filtering"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    conditional: ConditionalRequest = Depends(get_conditional_request)
 ):
     """Get recent processing activity"""
     try:
+        if check_not_modified(conditional, 'recent-activity', current_user, store_id, {'limit': limit}, time_relative=True):
+            return conditional.not_modified()
+        
+        cache_key, cached = response_cache.lookup('recent-activity', get_store_scope(current_user, store_id), {'limit': limit})
+        if cached is not None:
+            return cached
+        
         with db_manager.get_session() as session:
             from database import VehicleProcessingRecord
             
@@ -1570,56 +2339,15 @@ async def get_recent_activity(
                 VehicleProcessingRecord.processing_date.desc()
             ).limit(limit).all()
             
-            activity = []
-            for vehicle in recent_vehicles:
-                # Time ago calculation
-                if vehicle.processing_date:
-                    time_diff = datetime.utcnow() - vehicle.processing_date
-                    if time_diff.days > 0:
-                        time_ago = f"{time_diff.days} day{'s' if time_diff.days > 1 else ''} ago"
-                    elif time_diff.seconds > 3600:
-                        hours = time_diff.seconds // 3600
-                        time_ago = f"{hours} hour{'s' if hours > 1 else ''} ago"
-                    elif time_diff.seconds > 60:
-                        minutes = time_diff.seconds // 60
-                        time_ago = f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-                    else:
-                        time_ago = "Just now"
-                else:
-                    time_ago = "Unknown time"
-                
-                # Activity description
-                action_parts = []
-                if vehicle.processing_successful:
-                    action_parts.append("✅ processed")
-                else:
-                    action_parts.append("❌ failed to process")
-                
-                if vehicle.description_updated:
-                    action_parts.append("📝 updated description")
-                
-                if vehicle.marked_features_count and vehicle.marked_features_count > 0:
-                    action_parts.append(f"⭐ marked {vehicle.marked_features_count} features")
-                
-                if vehicle.no_fear_certificate:
-                    action_parts.append("🏆 NO FEAR certified")
-                
-                action_description = f"Vehicle #{vehicle.stock_number} " + ", ".join(action_parts)
-                
-                activity_item = ActivityItem(
-                    id=vehicle.id,
-                    stock_number=vehicle.stock_number,
-                    action=action_description,
-                    time_ago=time_ago,
-                    processing_successful=vehicle.processing_successful,
-                    processing_date=vehicle.processing_date.isoformat() if vehicle.processing_date else None
-                )
-                activity.append(activity_item)
+            activity = [build_activity_item(vehicle) for vehicle in recent_vehicles]
             
-            return ActivityResponse(
+            response = ActivityResponse(
                 success=True,
                 activity=activity
             )
+            if cache_key:
+                response_cache.put(cache_key, response.model_dump(mode='json'))
+            return response
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
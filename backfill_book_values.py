@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Book Values Backfill Script
+Populates the vehicle_book_values table from the JSON book value columns of existing records.
+"""
+
+import sys
+import argparse
+from database import get_database_manager, backfill_vehicle_book_values
+
+def main():
+    """Main backfill function"""
+    parser = argparse.ArgumentParser(description="Backfill parsed book values for existing vehicle records")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records processed per transaction")
+    args = parser.parse_args()
+
+    print("=== Book Values Backfill ===")
+
+    try:
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        processed = backfill_vehicle_book_values(db_manager, batch_size=args.batch_size)
+        print(f"\n✅ Backfilled book values for {processed} records")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Backfill cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during backfill: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the dashboard benchmarks.
+Seeds a synthetic vehicle processing dataset and summarizes latency samples.
+Run benchmarks from the repository root, e.g. `python benchmarks/bench_concurrency.py`.
+"""
+
+import os
+import sys
+import json
+import math
+import random
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from typing import List, Dict
+
+# Benchmarks import the application modules from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+BOOK_VALUE_SOURCES = ['KBB', 'rBook', 'J.D. Power', 'MMR', 'Black Book']
+
+
+def get_benchmark_db_url(db_url: str = None) -> str:
+    """Use the given database URL, or a fresh SQLite file in a temp directory"""
+    if db_url:
+        return db_url
+    path = os.path.join(tempfile.mkdtemp(prefix="dashboard-bench-"), "bench.db")
+    return f"sqlite:///{path}"
+
+
+def init_database(db_url: str = None):
+    """Initialize the global database manager and create the schema of the benchmark database"""
+    from database import get_database_manager
+    db_manager = get_database_manager(get_benchmark_db_url(db_url))
+    db_manager.create_tables()
+    return db_manager
+
+
+def add_simulated_latency(db_manager, latency_ms: float):
+    """
+    Sleep before every statement to model the network round trip to a remote database server.
+    SQLite runs in-process, so without this it hides the cost of blocking the event loop on I/O.
+    """
+    import time
+    from sqlalchemy import event
+
+    if latency_ms <= 0:
+        return
+
+    @event.listens_for(db_manager.engine, "before_cursor_execute")
+    def _simulate_round_trip(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(latency_ms / 1000.0)
+
+
+def seed_records(db_manager, count: int, stores: int = 5, days: int = 365, batch_size: int = 1000, seed: int = 42) -> int:
+    """Insert `count` synthetic processing records spread over `stores` stores and `days` days"""
+    from database import VehicleProcessingRecord, store_record_contents, backfill_vehicle_book_values, rebuild_daily_store_rollups
+
+    rnd = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Well maintained, one owner vehicle with a clean history report. " * 20
+    inserted = 0
+
+    while inserted < count:
+        batch = []
+        for i in range(inserted, min(inserted + batch_size, count)):
+            before = {source: f"${rnd.randint(8000, 40000):,}" for source in BOOK_VALUE_SOURCES}
+            after = {source: f"${int(value.strip('$').replace(',', '')) + rnd.randint(-500, 2500):,}" for source, value in before.items()}
+            features = [{"id": f"feature_{n}", "text": f"Feature {n}"} for n in range(rnd.randint(0, 8))]
+            successful = rnd.random() > 0.1
+            batch.append(dict(
+                stock_number=f"STK{i:07d}",
+                vin=f"1HGCM82633A{i:06d}",
+                vehicle_name=f"{2015 + i % 10} Make{i % 7} Model{i % 13}",
+                environment_id=f"store-{i % stores:03d}",
+                processing_date=now - timedelta(days=rnd.random() * days),
+                processing_session_id=f"session-{i // 100}",
+                odometer=f"{rnd.randint(1000, 150000):,}",
+                days_in_inventory=str(rnd.randint(1, 120)),
+                original_description=description,
+                ai_generated_description=description,
+                final_description=description,
+                description_updated=rnd.random() > 0.5,
+                starred_features=json.dumps(features),
+                marked_features_count=len(features),
+                feature_decisions=json.dumps({f["id"]: {"decision": "mark", "reason": "Visible in photos"} for f in features}),
+                no_fear_certificate=rnd.random() > 0.8,
+                ai_analysis_result=json.dumps({"summary": description[:500], "confidence": rnd.random()}),
+                processing_status='completed' if successful else 'failed',
+                processing_successful=successful,
+                errors_encountered=None if successful else json.dumps(["Timeout waiting for page"]),
+                processing_duration=f"{rnd.uniform(20, 90):.1f}",
+                book_values_processed=True,
+                book_values_before_processing=json.dumps(before),
+                book_values_after_processing=json.dumps(after),
+                media_tab_processed=rnd.random() > 0.3
+            ))
+        with db_manager.get_session() as session:
+            session.add_all(VehicleProcessingRecord(**values) for values in store_record_contents(session, batch))
+            session.commit()
+        inserted += len(batch)
+
+    backfill_vehicle_book_values(db_manager, batch_size=batch_size)
+    rebuild_daily_store_rollups(db_manager)
+    return inserted
+
+
+def ensure_super_admin(db_manager, username: str = "benchadmin", password: str = "benchmark") -> str:
+    """Create the benchmark super admin if needed and return its username"""
+    from database import create_super_admin
+    create_super_admin(db_manager, username, password)
+    return username
+
+
+def get_auth_headers(app_module, username: str) -> Dict[str, str]:
+    """Issue a bearer token for the given user without going through /api/login"""
+    token = app_module.create_access_token(data={"sub": username})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def format_latencies(label: str, samples_ms: List[float]) -> str:
+    """Format p50/p95/p99 latency summary for a list of millisecond samples"""
+    return (f"{label:<28} n={len(samples_ms):<5} mean={statistics.mean(samples_ms):8.1f}ms "
+            f"p50={percentile(samples_ms, 50):8.1f}ms p95={percentile(samples_ms, 95):8.1f}ms "
+            f"p99={percentile(samples_ms, 99):8.1f}ms")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Concurrency Benchmark
+Measures dashboard load latency (p50/p95/p99) with many parallel clients against a real
+uvicorn server. A dashboard load is the set of requests dashboard.js issues when it opens:
+statistics, page 1 of vehicles, recent activity and stores. A fraction of loads also log in,
+which exercises bcrypt verification.
+
+Each run is measured twice on the same server and data: "threadpool" is the current app, and
+"event loop" runs every blocking call inline on the event loop, as the handlers did when they
+were `async def` functions calling the database and bcrypt directly.
+
+Usage:
+    python benchmarks/bench_concurrency.py --records 5000 --clients 50 --loads 4 --latency-ms 2
+    python benchmarks/bench_concurrency.py --mode threadpool
+"""
+
+import time
+import json
+import socket
+import argparse
+import threading
+import contextlib
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from anyio import to_thread
+
+import bench_common
+
+DASHBOARD_REQUESTS = [
+    "/api/statistics",
+    "/api/vehicles?page=1&per_page=20",
+    "/api/recent-activity?limit=10",
+    "/api/stores",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int):
+    """Run uvicorn in a background thread and wait until it accepts requests"""
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return server, thread
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Benchmark server did not start")
+
+
+def _get(base_url: str, path: str, headers: dict):
+    request = urllib.request.Request(base_url + path, headers=headers)
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+
+
+def _login(base_url: str, username: str, password: str):
+    body = json.dumps({"username": username, "password": password}).encode()
+    request = urllib.request.Request(base_url + "/api/login", data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+
+
+def dashboard_load(base_url: str, headers: dict, login: bool, username: str, password: str) -> tuple:
+    """Perform one dashboard load; returns its latency and that of its login (or None) in milliseconds"""
+    started = time.perf_counter()
+    login_ms = None
+    if login:
+        _login(base_url, username, password)
+        login_ms = (time.perf_counter() - started) * 1000
+    for path in DASHBOARD_REQUESTS:
+        _get(base_url, path, headers)
+    return (time.perf_counter() - started) * 1000, login_ms
+
+
+@contextlib.contextmanager
+def blocking_event_loop():
+    """Run everything FastAPI and the app hand to worker threads inline on the event loop instead"""
+    async def run_inline(func, *args, abandon_on_cancel=False, cancellable=None, limiter=None):
+        return func(*args)
+
+    run_sync = to_thread.run_sync
+    to_thread.run_sync = run_inline
+    try:
+        yield
+    finally:
+        to_thread.run_sync = run_sync
+
+
+def run_mode(base_url: str, headers: dict, jobs: list, clients: int, username: str, password: str) -> dict:
+    """Run the dashboard loads with `clients` parallel clients"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(lambda login: dashboard_load(base_url, headers, login, username, password), jobs))
+    elapsed = time.perf_counter() - started
+    return {
+        'loads': [load_ms for load_ms, _ in results],
+        'logins': [login_ms for _, login_ms in results if login_ms is not None],
+        'throughput': len(jobs) / elapsed,
+    }
+
+
+MODES = {
+    'threadpool': contextlib.nullcontext,
+    'event loop': blocking_event_loop,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard concurrency benchmark")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=5000, help="Synthetic records to seed")
+    parser.add_argument("--clients", type=int, default=50, help="Parallel dashboard clients")
+    parser.add_argument("--loads", type=int, default=4, help="Dashboard loads per client")
+    parser.add_argument("--login-every", type=int, default=5, help="Every Nth load also logs in (0 to disable)")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated database round trip per statement")
+    parser.add_argument("--response-cache-ttl", type=float, default=0, help="Response cache TTL in seconds (0 measures uncached loads)")
+    parser.add_argument("--mode", choices=["both", "threadpool", "event-loop"], default="both", help="Handler execution to measure")
+    args = parser.parse_args()
+
+    password = "benchmark"
+    db_manager = bench_common.init_database(args.db_url)
+    print(f"Seeding {args.records} records...")
+    bench_common.seed_records(db_manager, args.records)
+    username = bench_common.ensure_super_admin(db_manager, password=password)
+    bench_common.add_simulated_latency(db_manager, args.latency_ms)
+
+    import app as app_module
+    app_module.response_cache.ttl_seconds = args.response_cache_ttl
+    headers = bench_common.get_auth_headers(app_module, username)
+
+    port = _free_port()
+    server, thread = start_server(app_module.app, port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    jobs = []
+    for client in range(args.clients):
+        for n in range(args.loads):
+            login = args.login_every > 0 and (client * args.loads + n) % args.login_every == 0
+            jobs.append(login)
+
+    results = {}
+    for label, execution in MODES.items():
+        if args.mode not in ("both", label.replace(" ", "-")):
+            continue
+        with execution():
+            # Warm up connections and caches
+            dashboard_load(base_url, headers, False, username, password)
+            results[label] = run_mode(base_url, headers, jobs, args.clients, username, password)
+
+    print()
+    print(f"{args.clients} parallel clients x {args.loads} dashboard loads ({len(jobs)} loads, {args.records} records, {args.latency_ms}ms simulated DB latency, response cache TTL {args.response_cache_ttl:g}s)")
+    for label, result in results.items():
+        print(f"[{label}]")
+        print(bench_common.format_latencies("dashboard load", result['loads']))
+        if result['logins']:
+            print(bench_common.format_latencies("login", result['logins']))
+        print(f"{'throughput':<28} {result['throughput']:.1f} loads/s")
+    if len(results) == 2:
+        before, after = results['event loop'], results['threadpool']
+        print(f"threadpool vs event loop: dashboard p99 {bench_common.percentile(before['loads'], 99):.0f}ms -> "
+              f"{bench_common.percentile(after['loads'], 99):.0f}ms, {after['throughput'] / before['throughput']:.2f}x throughput")
+
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark
+Compares exporting every record of the dataset by paging /api/vehicles (a COUNT and an OFFSET
+scan per page, as the dashboard pages) against one streamed /api/vehicles/export. Reports the
+wall time and peak Python allocation of each; the export's peak should not grow with --records.
+
+Usage:
+    python benchmarks/bench_export.py --records 20000
+    python benchmarks/bench_export.py --records 20000 --format ndjson
+"""
+
+import io
+import time
+import argparse
+import tracemalloc
+import contextlib
+
+import bench_common
+
+
+def measure(run) -> dict:
+    """Wall time, peak allocation and bytes produced by one run"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': elapsed, 'peak': peak, 'bytes': size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paged list vs streamed export benchmark")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=20000, help="Synthetic records to seed")
+    parser.add_argument("--per-page", type=int, default=100, help="Vehicles per page when paging the list")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="Export format")
+    args = parser.parse_args()
+
+    db_manager = bench_common.init_database(args.db_url)
+    print(f"Seeding {args.records} records...")
+    bench_common.seed_records(db_manager, args.records)
+
+    import app as app_module
+    app_module.response_cache.ttl_seconds = 0  # Measure the uncached endpoints
+    app_module.VEHICLE_COUNT_CACHE_TTL_SECONDS = 0  # The old way counted on every page
+    from database import User, UserRole
+    super_admin = User(username='bench_super_admin', role=UserRole.SUPER_ADMIN)
+
+    def page_through_list():
+        size, page, has_next = 0, 1, True
+        while has_next:
+            with contextlib.redirect_stdout(io.StringIO()):
+                response = app_module.get_vehicles(
+                    page=page, per_page=args.per_page, after=None, include_total=True, search="",
+                    start_date=None, end_date=None, error=None, store_id=None, current_user=super_admin,
+                    conditional=app_module.ConditionalRequest()
+                )
+            size += len(response.model_dump_json())
+            has_next = response.pagination.has_next
+            page += 1
+        return size
+
+    def stream_export():
+        import anyio
+
+        response = app_module.export_vehicles(
+            export_format=args.format, search="", start_date=None, end_date=None, error=None,
+            store_id=None, current_user=super_admin
+        )
+
+        # Consume the body the way Starlette sends it, without keeping the chunks
+        async def consume():
+            size = 0
+            async for chunk in response.body_iterator:
+                size += len(chunk)
+            return size
+        return anyio.run(consume)
+
+    results = {
+        f'paged list ({args.per_page}/page)': measure(page_through_list),
+        f'streamed {args.format} export': measure(stream_export),
+    }
+
+    print()
+    print(f"All {args.records:,} records")
+    print(f"{'strategy':<28} {'time':>9} {'peak alloc':>14} {'bytes':>14}")
+    for name, result in results.items():
+        print(f"{name:<28} {result['seconds']:>8.2f}s {result['peak']:>14,} {result['bytes']:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Ingestion Benchmark
+Measures records/sec written by VehicleDatabaseManager.log_processing_summaries at batch sizes
+1, 100 and 1000, next to the one-call-per-vehicle log_processing_summary path the processing
+workers use today. Pass --latency-ms to model the round trip to a remote PostgreSQL server.
+
+Usage:
+    python benchmarks/bench_ingest.py --records 2000 --latency-ms 1
+"""
+
+import time
+import argparse
+
+import bench_common
+
+BATCH_SIZES = [1, 100, 1000]
+
+
+def build_summaries(count: int, stores: int = 5) -> list:
+    """Processing summaries shaped like a nightly run across `stores` stores"""
+    description = "Well maintained, one owner vehicle with a clean history report. " * 20
+    return [
+        {
+            'stock_number': f"ING{i:07d}",
+            'vin': f"1HGCM82633A{i:06d}",
+            'environment_id': f"store-{i % stores:03d}",
+            'odometer': f"{10000 + i:,}",
+            'days_in_inventory': str(i % 90),
+            'starred_features': [{'id': f"feature_{n}", 'text': f"Feature {n}"} for n in range(i % 6)],
+            'description_data': {'original': description, 'ai_generated': description, 'final': description, 'updated': True},
+            'no_fear_certificate': i % 5 == 0,
+            'ai_analysis': {'summary': description[:200], 'confidence': 0.9},
+            'processing_successful': i % 10 != 0,
+            'errors': ["Timeout waiting for page"] if i % 10 == 0 else None,
+            'processing_duration': "42.0",
+            'session_id': "bench-session",
+        }
+        for i in range(count)
+    ]
+
+
+def clear_records(db_manager):
+    """Remove the benchmark's records and rollups so every mode starts from the same state"""
+    from database import VehicleProcessingRecord, DailyStoreRollup, DailyStoreBookValueRollup
+
+    with db_manager.get_session() as session:
+        for model in (DailyStoreBookValueRollup, DailyStoreRollup, VehicleProcessingRecord):
+            session.query(model).delete(synchronize_session=False)
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch ingestion throughput benchmark")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=2000, help="Summaries written per mode")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated database round trip per statement")
+    args = parser.parse_args()
+
+    db_manager = bench_common.init_database(args.db_url)
+    bench_common.add_simulated_latency(db_manager, args.latency_ms)
+    summaries = build_summaries(args.records)
+
+    results = []
+
+    clear_records(db_manager)
+    started = time.perf_counter()
+    for summary in summaries:
+        db_manager.log_processing_summary(**summary)
+    results.append(("log_processing_summary", time.perf_counter() - started, args.records))
+
+    for batch_size in BATCH_SIZES:
+        clear_records(db_manager)
+        written = 0
+        started = time.perf_counter()
+        for start in range(0, len(summaries), batch_size):
+            result = db_manager.log_processing_summaries(summaries[start:start + batch_size], chunk_size=batch_size)
+            written += result['inserted']
+        results.append((f"batch size {batch_size}", time.perf_counter() - started, written))
+
+    print()
+    print(f"{args.records} summaries per mode, simulated latency {args.latency_ms}ms")
+    print(f"{'mode':<24} {'records/sec':>12} {'total':>10} {'written':>10}")
+    for label, elapsed, written in results:
+        print(f"{label:<24} {written / elapsed:>12,.0f} {elapsed:>9.2f}s {written:>10,}")
+
+
+if __name__ == "__main__":
+    main()
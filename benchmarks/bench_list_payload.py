@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+List Payload Benchmark
+Compares loading a page of vehicles as full records (every Text column and the decompressed
+descriptions, preview sliced in Python) against the list projection used by /api/vehicles (large
+columns deferred, stored description preview). Reports bytes returned by the database, Python memory allocated while loading the
+page and load time, then the memory and response size of the endpoint itself.
+
+Usage:
+    python benchmarks/bench_list_payload.py --records 2000 --page-size 100
+"""
+
+import io
+import time
+import argparse
+import statistics
+import tracemalloc
+import contextlib
+
+import bench_common
+
+
+def result_bytes(session, query) -> int:
+    """Bytes of column data the database returns for a query"""
+    total = 0
+    for row in session.connection().execute(query.statement):
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, bytes):
+                total += len(value)
+            else:
+                total += len(value.encode()) if isinstance(value, str) else len(str(value))
+    return total
+
+
+def measure(db_manager, build_query, render, runs: int) -> dict:
+    """Median load time and peak allocation of loading and rendering one page"""
+    timings, peaks = [], []
+    for _ in range(runs):
+        with db_manager.get_session() as session:
+            tracemalloc.start()
+            started = time.perf_counter()
+            render(build_query(session).all())
+            timings.append((time.perf_counter() - started) * 1000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    with db_manager.get_session() as session:
+        payload = result_bytes(session, build_query(session))
+    return {'bytes': payload, 'peak': statistics.median(peaks), 'ms': statistics.median(timings)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vehicle list payload benchmark")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=2000, help="Synthetic records to seed")
+    parser.add_argument("--page-size", type=int, default=100, help="Vehicles per page")
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs per strategy")
+    args = parser.parse_args()
+
+    db_manager = bench_common.init_database(args.db_url)
+    print(f"Seeding {args.records} records...")
+    bench_common.seed_records(db_manager, args.records)
+
+    import app as app_module
+    app_module.response_cache.ttl_seconds = 0  # Measure the uncached endpoint
+    from database import VehicleProcessingRecord, record_detail_options, User, UserRole
+
+    order = (VehicleProcessingRecord.processing_date.desc(), VehicleProcessingRecord.id.desc())
+    preview_length = app_module.DESCRIPTION_PREVIEW_LENGTH
+
+    def full_records(session):
+        return session.query(VehicleProcessingRecord).options(
+            *record_detail_options()
+        ).order_by(*order).limit(args.page_size)
+
+    def render_full(vehicles):
+        for vehicle in vehicles:
+            description = vehicle.final_description
+            preview = description[:preview_length] + '...' if description and len(description) > preview_length else description
+            bool(vehicle.errors_encountered), preview
+
+    def list_projection(session):
+        return session.query(VehicleProcessingRecord).add_columns(
+            *app_module.get_vehicle_list_columns()
+        ).order_by(*order).limit(args.page_size)
+
+    def render_projection(rows):
+        for vehicle, preview, length, has_errors in rows:
+            bool(has_errors), preview + '...' if preview and length > preview_length else preview
+
+    results = {
+        'full records': measure(db_manager, full_records, render_full, args.runs),
+        'list projection': measure(db_manager, list_projection, render_projection, args.runs),
+    }
+
+    print()
+    print(f"{args.page_size}-row page, {args.records} records")
+    print(f"{'strategy':<20} {'db bytes':>12} {'peak alloc':>12} {'load time':>10}")
+    for name, result in results.items():
+        print(f"{name:<20} {result['bytes']:>12,} {result['peak']:>12,.0f} {result['ms']:>8.2f}ms")
+    full, projection = results['full records'], results['list projection']
+    print(f"{'reduction':<20} {full['bytes'] / projection['bytes']:>11.1f}x {full['peak'] / projection['peak']:>11.1f}x")
+
+    # End to end: the endpoint as the dashboard calls it
+    super_admin = User(username='bench_super_admin', role=UserRole.SUPER_ADMIN)
+    peaks, sizes = [], []
+    for _ in range(args.runs):
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = app_module.get_vehicles(
+                page=1, per_page=args.page_size, after=None, include_total=False, search="",
+                start_date=None, end_date=None, error=None, store_id=None, current_user=super_admin,
+                conditional=app_module.ConditionalRequest()
+            )
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        sizes.append(len(response.model_dump_json()))
+    print()
+    print(f"GET /api/vehicles?per_page={args.page_size}: peak alloc {statistics.median(peaks):,.0f} bytes, "
+          f"response body {statistics.median(sizes):,.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Logging Overhead Benchmark
+Measures /api/vehicles throughput (token check plus handler, called in-process) under different
+log configurations, with records written to a real file and flushed per record, like stdout
+with PYTHONUNBUFFERED=1. "debug, unsampled" matches the cost of the print() debugging the
+handlers used to do on every request.
+
+Usage:
+    python benchmarks/bench_logging.py --records 2000 --requests 2000
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+
+import bench_common
+
+MODES = [
+    # (label, root level, DEBUG records per logger per second; 0 = unlimited)
+    ("debug, unsampled", "DEBUG", 0),
+    ("debug, sampled 20/s", "DEBUG", 20),
+    ("info (production)", "INFO", 20),
+    ("warning", "WARNING", 20),
+]
+
+
+def run_mode(app_module, credentials, level: str, sample_rate: float, requests: int, log_path: str) -> dict:
+    """Requests per second and log output for one logging configuration"""
+    from structured_logging import configure_logging, request_id_var
+
+    with open(log_path, "w") as stream:
+        configure_logging(level=level, log_format="json", stream=stream, debug_sample_per_second=sample_rate)
+        # Warm up the principal cache and the query compilation cache
+        for _ in range(20):
+            app_module.get_vehicles(
+                page=1, per_page=20, after=None, include_total=True, search="",
+                start_date=None, end_date=None, error=None, store_id=None,
+                current_user=app_module.get_current_user(credentials),
+                conditional=app_module.ConditionalRequest()
+            )
+        stream.truncate(0)
+        stream.seek(0)
+
+        started = time.perf_counter()
+        for i in range(requests):
+            token = request_id_var.set(f"bench-{i}")
+            try:
+                user = app_module.get_current_user(credentials)
+                app_module.get_vehicles(
+                    page=1, per_page=20, after=None, include_total=True, search="",
+                    start_date=None, end_date=None, error=None, store_id=None, current_user=user,
+                    conditional=app_module.ConditionalRequest()
+                )
+            finally:
+                request_id_var.reset(token)
+        elapsed = time.perf_counter() - started
+
+    with open(log_path) as stream:
+        lines = stream.read().splitlines()
+    return {
+        "rps": requests / elapsed,
+        "us_per_request": elapsed / requests * 1e6,
+        "lines": len(lines),
+        "bytes": os.path.getsize(log_path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead on /api/vehicles")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=2000, help="Synthetic records to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per logging mode")
+    args = parser.parse_args()
+
+    db_manager = bench_common.init_database(args.db_url)
+    print(f"Seeding {args.records} records...")
+    bench_common.seed_records(db_manager, args.records)
+    username = bench_common.ensure_super_admin(db_manager)
+
+    import app as app_module
+    app_module.response_cache.ttl_seconds = 0  # Measure the uncached endpoint
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    token = bench_common.get_auth_headers(app_module, username)["Authorization"].split(" ", 1)[1]
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    log_path = os.path.join(tempfile.mkdtemp(prefix="dashboard-bench-"), "bench.log")
+
+    results = {}
+    for label, level, sample_rate in MODES:
+        results[label] = run_mode(app_module, credentials, level, sample_rate, args.requests, log_path)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print()
+    print(f"GET /api/vehicles (page 1, 20 rows), {args.requests} requests per mode, {args.records} records")
+    print(f"{'mode':<22} {'req/s':>8} {'us/req':>8} {'log lines':>10} {'log bytes':>12}")
+    for label, result in results.items():
+        print(f"{label:<22} {result['rps']:>8.0f} {result['us_per_request']:>8.0f} "
+              f"{result['lines']:>10,} {result['bytes']:>12,}")
+    baseline, production = results["debug, unsampled"], results["info (production)"]
+    print(f"production vs unsampled debug: {production['rps'] / baseline['rps']:.2f}x throughput")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures, in fresh interpreters, how long `import app` takes and how long the lifespan startup
+(connectivity check with retry, super admin check) takes before the worker serves requests.
+For comparison it also times the database work the import used to do: create_all, the user
+migration checks, the super admin count and the full vehicle record count.
+
+A second scenario points the app at an unreachable database to show that the import still
+succeeds and the lifespan retries with backoff before failing.
+
+Usage:
+    python benchmarks/bench_startup.py --records 50000 --runs 5
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+import bench_common
+
+# Runs in a child interpreter so module import costs are measured from a cold start
+CHILD_SCRIPT = r'''
+import io, sys, json, time, contextlib
+started = time.perf_counter()
+sys.path.insert(0, {repo_root!r})
+import database
+db_manager = database.get_database_manager({db_url!r})
+import app
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+result = {{"import_ms": (imported - started) * 1000}}
+lifespan_started = time.perf_counter()
+try:
+    with TestClient(app.app):
+        result["lifespan_ms"] = (time.perf_counter() - lifespan_started) * 1000
+except Exception as e:
+    result["lifespan_ms"] = (time.perf_counter() - lifespan_started) * 1000
+    result["lifespan_error"] = type(e).__name__
+
+if {legacy!r}:
+    from database import User, UserRole, VehicleProcessingRecord
+    legacy_started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_manager.create_tables()
+    with db_manager.get_session() as session:
+        session.query(User).filter(User.role == UserRole.SUPER_ADMIN).count()
+        session.query(VehicleProcessingRecord).count()
+    result["legacy_ms"] = (time.perf_counter() - legacy_started) * 1000
+
+print("RESULT " + json.dumps(result))
+'''
+
+
+def run_child(db_url: str, legacy: bool, env: dict) -> dict:
+    script = CHILD_SCRIPT.format(repo_root=bench_common.REPO_ROOT, db_url=db_url, legacy=legacy)
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=bench_common.REPO_ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"Startup child produced no result:\n{completed.stderr}")
+
+
+def summarize(samples: list, key: str) -> str:
+    values = [sample[key] for sample in samples if key in sample]
+    return f"{statistics.median(values):8.1f}ms" if values else "       -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application startup benchmark")
+    parser.add_argument("--db-url", help="Database URL (defaults to a temporary SQLite database)")
+    parser.add_argument("--records", type=int, default=50000, help="Synthetic records to seed")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per scenario")
+    args = parser.parse_args()
+
+    db_url = bench_common.get_benchmark_db_url(args.db_url)
+    db_manager = bench_common.init_database(db_url)
+    print(f"Seeding {args.records} records...")
+    bench_common.seed_records(db_manager, args.records)
+    db_manager.engine.dispose()
+
+    env = dict(os.environ, LOG_LEVEL="WARNING", DB_STARTUP_ATTEMPTS="3", DB_STARTUP_BACKOFF_SECONDS="0.1")
+    reachable = [run_child(db_url, True, env) for _ in range(args.runs)]
+    unreachable_url = "sqlite:///" + os.path.join(bench_common.REPO_ROOT, "missing-directory", "dashboard.db")
+    unreachable = [run_child(unreachable_url, False, env) for _ in range(args.runs)]
+
+    print()
+    print(f"Cold start, median of {args.runs} runs, {args.records} records")
+    print(f"{'scenario':<24} {'import':>10} {'lifespan':>10} {'old import-time DB work':>24}")
+    print(f"{'database available':<24} {summarize(reachable, 'import_ms'):>10} "
+          f"{summarize(reachable, 'lifespan_ms'):>10} {summarize(reachable, 'legacy_ms'):>24}")
+    print(f"{'database unreachable':<24} {summarize(unreachable, 'import_ms'):>10} "
+          f"{summarize(unreachable, 'lifespan_ms'):>10} {'-':>24}")
+    errors = sorted({sample.get('lifespan_error', 'none') for sample in unreachable})
+    print(f"unreachable lifespan outcome: {', '.join(errors)} after "
+          f"{env['DB_STARTUP_ATTEMPTS']} attempts with {env['DB_STARTUP_BACKOFF_SECONDS']}s initial backoff")
+
+
+if __name__ == "__main__":
+    main()
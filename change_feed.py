@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Change Feed Module
+Compact change events of vehicle processing records, delivered to every worker process.
+
+VehicleDatabaseManager turns each committed write into events such as
+
+    {"action": "upsert", "id": 42, "environment_id": "store-001", "fields": ["vin"], "version": 17, "origin": "..."}
+
+`action` is upsert (created or updated) or delete. `fields` lists the fields an update set, or is
+null when the whole record was written. `version` is the store's write version after the write
+(store_write_versions). `origin` identifies the process that wrote it. Subscribers in the writing
+process get the events right after the commit; other processes get them from the feed:
+
+    PostgresChangeFeed  pg_notify on CHANGE_CHANNEL, sent inside the write transaction so it is only
+                        delivered when the write commits; one LISTEN connection and thread per process
+    InMemoryChangeBus   SQLite and other databases: delivery within the writing process only
+
+If the LISTEN connection drops, events sent until it reconnects are lost; subscribers then get a
+single {"action": "resync"} event.
+"""
+
+import json
+import uuid
+import select
+import logging
+import threading
+from typing import Callable, Dict, Any, List
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = 'vehicle_record_changes'
+
+# pg_notify payloads must stay under 8000 bytes; larger batches are split
+MAX_PAYLOAD_BYTES = 7500
+
+RESYNC_CHANGE = {'action': 'resync'}
+
+
+def encode_payloads(events: List[Dict[str, Any]], max_bytes: int = MAX_PAYLOAD_BYTES) -> List[str]:
+    """JSON arrays of the events, each at most max_bytes long"""
+    payloads, batch, size = [], [], 2
+    for event in events:
+        encoded = json.dumps(event, separators=(',', ':'), default=str)
+        if batch and size + len(encoded) + 1 > max_bytes:
+            payloads.append('[' + ','.join(batch) + ']')
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        payloads.append('[' + ','.join(batch) + ']')
+    return payloads
+
+
+class InMemoryChangeBus:
+    """Delivers change events to the subscribers of the writing process only"""
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.subscribers: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.delivered = 0
+
+    def subscribe(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        self.subscribers.append(callback)
+
+    def publish(self, session, events: List[Dict[str, Any]]):
+        """Send events to other processes, inside the write transaction (nothing to do in memory)"""
+
+    def dispatch(self, events: List[Dict[str, Any]]):
+        """Deliver events to this process's subscribers"""
+        self.delivered += len(events)
+        for callback in self.subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                logger.warning("Change feed subscriber failed: %s", e)
+
+    def start(self):
+        """Start receiving other processes' events (application startup)"""
+
+    def stop(self):
+        """Stop receiving (application shutdown)"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': type(self).__name__, 'delivered': self.delivered}
+
+
+class PostgresChangeFeed(InMemoryChangeBus):
+    """Change events through PostgreSQL NOTIFY, received by one LISTEN thread per process"""
+
+    POLL_SECONDS = 1.0
+    MAX_RECONNECT_SECONDS = 30.0
+
+    def __init__(self, engine, channel: str = CHANGE_CHANNEL):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.received = 0
+        self.reconnects = 0
+        self.connected = False
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def publish(self, session, events: List[Dict[str, Any]]):
+        for payload in encode_payloads(events):
+            session.execute(text("SELECT pg_notify(:channel, :payload)"), {'channel': self.channel, 'payload': payload})
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name='change-feed-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join(timeout=self.POLL_SECONDS * 2)
+
+    def _connect(self):
+        """Dedicated DBAPI connection, outside the engine pool, listening on the channel"""
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        connection = self.engine.dialect.loaded_dbapi.connect(*cargs, **cparams)
+        connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute(f'LISTEN "{self.channel}"')
+        cursor.close()
+        return connection
+
+    def _receive(self, connection) -> List[str]:
+        """Payloads of the notifications received within POLL_SECONDS"""
+        if self.engine.dialect.driver == 'psycopg':
+            # psycopg 3 yields notifications until the timeout
+            return [notify.payload for notify in connection.notifies(timeout=self.POLL_SECONDS)]
+        # psycopg2: wait for the socket, then collect what poll() queued
+        if select.select([connection], [], [], self.POLL_SECONDS) == ([], [], []):
+            return []
+        connection.poll()
+        payloads = [notify.payload for notify in connection.notifies]
+        connection.notifies.clear()
+        return payloads
+
+    def _listen(self):
+        delay = 1.0
+        first_connection = True
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self.connected = True
+                delay = 1.0
+                if not first_connection:
+                    # Events sent while disconnected are gone
+                    self.reconnects += 1
+                    self.dispatch([RESYNC_CHANGE])
+                first_connection = False
+                while not self._stopping.is_set():
+                    events = [
+                        event for payload in self._receive(connection)
+                        for event in json.loads(payload) if event.get('origin') != self.origin
+                    ]
+                    if events:
+                        self.received += len(events)
+                        self.dispatch(events)
+            except Exception as e:
+                if not self._stopping.is_set():
+                    logger.warning("Change feed listener disconnected: %s. Reconnecting in %.0fs", e, delay)
+            finally:
+                self.connected = False
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self._stopping.wait(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({'connected': self.connected, 'received': self.received, 'reconnects': self.reconnects})
+        return stats
+
+
+def build_change_feed(engine) -> InMemoryChangeBus:
+    """PostgresChangeFeed on PostgreSQL, InMemoryChangeBus elsewhere"""
+    if engine.dialect.name == 'postgresql':
+        return PostgresChangeFeed(engine)
+    return InMemoryChangeBus()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Columnar Export Module
+Parquet and Arrow exports of vehicle processing records for analytics pipelines, with typed
+columns instead of the display strings and JSON payloads of the records table:
+
+    odometer, days_in_inventory      integers parsed from text such as "147,507"
+    processing_duration              seconds as a float
+    book_value_<source>_before/after one float column per book value source (KBB, rBook, ...)
+    errors_encountered               list of strings
+    environment_id                   dictionary-encoded
+
+Rows are read from a streaming cursor (yield_per) and converted one record batch at a time, so
+an export never holds more than one batch in memory. Each batch is one Parquet row group or one
+Arrow IPC record batch.
+
+pyarrow is optional; it is only needed for these exports.
+"""
+
+import re
+import json
+import itertools
+from typing import Optional, Any, Dict, Iterable, Iterator, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for Parquet / Arrow exports
+    pa = None
+
+from database import VehicleProcessingRecord, BOOK_VALUE_FALLBACK_SOURCES, parse_currency_value
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Book value sources with their own columns; values of other sources are not exported
+BOOK_VALUE_SOURCES = ['KBB'] + BOOK_VALUE_FALLBACK_SOURCES
+
+COLUMNAR_MEDIA_TYPES = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# Record columns an export reads, in query order
+SOURCE_COLUMNS = (
+    'id', 'environment_id', 'stock_number', 'vin', 'vehicle_name', 'processing_date',
+    'processing_session_id', 'odometer', 'days_in_inventory', 'processing_duration',
+    'processing_status', 'processing_successful', 'description_updated', 'description_length',
+    'marked_features_count', 'no_fear_certificate', 'no_build_data_found', 'book_values_processed',
+    'media_tab_processed', 'errors_encountered', 'book_values_before_processing',
+    'book_values_after_processing'
+)
+
+# Source columns exported with their stored value
+PASSTHROUGH_COLUMNS = tuple(
+    name for name in SOURCE_COLUMNS
+    if name not in ('odometer', 'days_in_inventory', 'processing_duration', 'errors_encountered',
+                    'book_values_before_processing', 'book_values_after_processing')
+)
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def require_pyarrow():
+    """Raise when pyarrow is not installed"""
+    if pa is None:
+        raise RuntimeError("Parquet and Arrow exports require the 'pyarrow' package")
+
+
+def source_columns() -> list:
+    """Model attributes of SOURCE_COLUMNS, for session.query(*source_columns())"""
+    return [getattr(VehicleProcessingRecord, name) for name in SOURCE_COLUMNS]
+
+
+def book_value_column(source: str, stage: str) -> str:
+    """Column name of a source's book value before or after processing, e.g. book_value_j_d_power_after"""
+    slug = re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_')
+    return f"book_value_{slug}_{stage}"
+
+
+# (source, before column, after column) of each book value source
+BOOK_VALUE_COLUMNS = [
+    (source, book_value_column(source, 'before'), book_value_column(source, 'after')) for source in BOOK_VALUE_SOURCES
+]
+
+
+def build_schema() -> 'pa.Schema':
+    """Arrow schema of the export"""
+    require_pyarrow()
+    fields = [
+        pa.field('id', pa.int64(), nullable=False),
+        pa.field('environment_id', pa.dictionary(pa.int32(), pa.string())),
+        pa.field('stock_number', pa.string(), nullable=False),
+        pa.field('vin', pa.string()),
+        pa.field('vehicle_name', pa.string()),
+        pa.field('processing_date', pa.timestamp('us'), nullable=False),
+        pa.field('processing_session_id', pa.string()),
+        pa.field('odometer', pa.int64()),
+        pa.field('days_in_inventory', pa.int32()),
+        pa.field('processing_duration', pa.float64()),
+        pa.field('processing_status', pa.string()),
+        pa.field('processing_successful', pa.bool_()),
+        pa.field('description_updated', pa.bool_()),
+        pa.field('description_length', pa.int32()),
+        pa.field('marked_features_count', pa.int32()),
+        pa.field('no_fear_certificate', pa.bool_()),
+        pa.field('no_build_data_found', pa.bool_()),
+        pa.field('book_values_processed', pa.bool_()),
+        pa.field('media_tab_processed', pa.bool_()),
+        pa.field('errors_encountered', pa.list_(pa.string())),
+    ]
+    for source, before_column, after_column in BOOK_VALUE_COLUMNS:
+        fields.append(pa.field(before_column, pa.float64()))
+        fields.append(pa.field(after_column, pa.float64()))
+    return pa.schema(fields)
+
+
+def parse_number(value: Any, integer: bool = False) -> Optional[float]:
+    """First number in a display string such as '147,507', '45.2' or '12 days'; None when there is none"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        match = NUMBER_PATTERN.search(str(value).replace(',', ''))
+        if not match:
+            return None
+        number = float(match.group())
+    return int(number) if integer else number
+
+
+def _load_payload(value) -> Any:
+    """JSON payload column value; legacy rows may still hold JSON text"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _book_value(payload: Any, source: str) -> Optional[float]:
+    """A source's value in a book values payload; None when the source is missing"""
+    if not isinstance(payload, dict) or payload.get(source) in (None, ''):
+        return None
+    return parse_currency_value(payload[source])
+
+
+def _error_list(value) -> Optional[List[str]]:
+    errors = _load_payload(value)
+    if errors is None:
+        return None
+    if not isinstance(errors, list):
+        errors = [errors]
+    return [error if isinstance(error, str) else json.dumps(error, default=str) for error in errors]
+
+
+class _StoreDictionary:
+    """
+    Dictionary of environment ids shared by every batch of an export. It only grows, so each
+    batch's dictionary extends the previous one and the Arrow writers emit it as a delta.
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def encode(self, environment_ids: List[Optional[str]]) -> 'pa.DictionaryArray':
+        indices = []
+        for environment_id in environment_ids:
+            if environment_id is None:
+                indices.append(None)
+                continue
+            index = self._indices.get(environment_id)
+            if index is None:
+                index = self._indices[environment_id] = len(self.values)
+                self.values.append(environment_id)
+            indices.append(index)
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(self.values, pa.string()))
+
+
+def _record_batch(rows: list, schema: 'pa.Schema', stores: _StoreDictionary) -> 'pa.RecordBatch':
+    """Typed record batch of rows selected with source_columns()"""
+    columns: Dict[str, list] = {name: [] for name in schema.names}
+    for row in rows:
+        record = dict(zip(SOURCE_COLUMNS, row))
+        for name in PASSTHROUGH_COLUMNS:
+            columns[name].append(record[name])
+        columns['odometer'].append(parse_number(record['odometer'], integer=True))
+        columns['days_in_inventory'].append(parse_number(record['days_in_inventory'], integer=True))
+        columns['processing_duration'].append(parse_number(record['processing_duration']))
+        columns['errors_encountered'].append(_error_list(record['errors_encountered']))
+
+        before = _load_payload(record['book_values_before_processing'])
+        after = _load_payload(record['book_values_after_processing'])
+        for source, before_column, after_column in BOOK_VALUE_COLUMNS:
+            columns[before_column].append(_book_value(before, source))
+            columns[after_column].append(_book_value(after, source))
+
+    arrays = [
+        stores.encode(columns[field.name]) if field.name == 'environment_id' else pa.array(columns[field.name], type=field.type)
+        for field in schema
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_record_batches(rows: Iterable, batch_size: int = DEFAULT_BATCH_SIZE, schema: 'pa.Schema' = None) -> Iterator['pa.RecordBatch']:
+    """Record batches of at most batch_size rows from an iterable of source_columns() rows"""
+    require_pyarrow()
+    schema = schema or build_schema()
+    stores = _StoreDictionary()
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            break
+        yield _record_batch(chunk, schema, stores)
+
+
+def _open_writer(sink, export_format: str, schema: 'pa.Schema', stream: bool):
+    """Parquet writer, or Arrow IPC writer (streaming format when stream is True, file format otherwise)"""
+    if export_format == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression='zstd')
+    if export_format == 'arrow':
+        options = pa_ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        return pa_ipc.new_stream(sink, schema, options=options) if stream else pa_ipc.new_file(sink, schema, options=options)
+    raise ValueError(f"Unknown columnar export format: {export_format}")
+
+
+class _ChunkSink:
+    """Write-only file object collecting what a pyarrow writer writes until it is drained"""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_columnar_export(rows: Iterable, export_format: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Encoded Parquet file or Arrow IPC stream of source_columns() rows, as one chunk of bytes per
+    record batch; for HTTP responses. Parquet is written row group by row group with its footer last.
+    """
+    schema = build_schema()
+    sink = _ChunkSink()
+    writer = _open_writer(sink, export_format, schema, stream=True)
+    for batch in iter_record_batches(rows, batch_size, schema):
+        writer.write_batch(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    writer.close()
+    yield sink.drain()
+
+
+def export_records(
+    db_manager,
+    path: str,
+    export_format: str = 'parquet',
+    environment_ids: Optional[List[str]] = None,
+    start_date=None,
+    end_date=None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Write the records of the given stores (all when None) processed in [start_date, end_date) to a
+    Parquet file or Arrow IPC file, oldest first. Returns the number of records written.
+    """
+    schema = build_schema()
+    written = 0
+    with db_manager.get_session() as session:
+        query = session.query(*source_columns())
+        if environment_ids:
+            query = query.filter(VehicleProcessingRecord.environment_id.in_(environment_ids))
+        if start_date:
+            query = query.filter(VehicleProcessingRecord.processing_date >= start_date)
+        if end_date:
+            query = query.filter(VehicleProcessingRecord.processing_date < end_date)
+        query = query.order_by(VehicleProcessingRecord.processing_date, VehicleProcessingRecord.id)
+
+        with open(path, 'wb') as sink:
+            writer = _open_writer(sink, export_format, schema, stream=False)
+            try:
+                for batch in iter_record_batches(query.yield_per(batch_size), batch_size, schema):
+                    writer.write_batch(batch)
+                    written += batch.num_rows
+            finally:
+                writer.close()
+    return written
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Conditional Request Module
+ETag / Last-Modified validators for API responses and the If-None-Match check that answers
+`304 Not Modified` before a handler queries or builds anything. If-Modified-Since is not honored:
+Last-Modified has whole seconds and cannot tell apart writes within one second, while the ETag
+covers every store write version, so only the ETag decides.
+Validators are computed by the handlers (see store_write_versions in database.py); this module
+only formats and compares them.
+"""
+
+import json
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional, Any, Dict
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag identifying a representation built from the given parts"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return f'W/"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header value against an ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith('W/') else candidate) == opaque:
+            return True
+    return False
+
+
+class ConditionalRequest:
+    """
+    The conditional headers of one request and the validator headers of its response.
+    Handlers get it with Depends(get_conditional_request); constructed without arguments
+    (e.g. when a handler is called directly) it never matches and sets no headers.
+    """
+
+    def __init__(self, if_none_match: str = None, response: Response = None):
+        self.if_none_match = if_none_match
+        self.response = response
+        self.headers: Dict[str, str] = {}
+
+    def validate(self, etag: str, last_modified: Optional[datetime] = None) -> bool:
+        """
+        Attach the validators to the response; True when If-None-Match matches the ETag.
+        last_modified only sets the informational Last-Modified header.
+        """
+        self.headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if last_modified is not None:
+            # HTTP dates have whole seconds; stored times are naive UTC
+            last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+            self.headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+        if self.response is not None:
+            self.response.headers.update(self.headers)
+
+        return bool(self.if_none_match) and etag_matches(self.if_none_match, etag)
+
+    def not_modified(self) -> Response:
+        """Empty 304 response carrying the validators"""
+        return Response(status_code=304, headers=self.headers)
+
+
+def get_conditional_request(request: Request, response: Response) -> ConditionalRequest:
+    """FastAPI dependency reading the conditional headers of the current request"""
+    return ConditionalRequest(
+        if_none_match=request.headers.get('if-none-match'),
+        response=response
+    )
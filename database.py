@@ -6,20 +6,30 @@ SQLAlchemy models and database operations for tracking vehicle processing change
 
 import os
 import json
+import logging
 import hashlib
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine, Column, String, DateTime, Text, Boolean, Integer, Enum
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Dict, Any, Callable
+from sqlalchemy import create_engine, event, DDL, insert, update, exists, select, text, tuple_, bindparam, type_coerce, Column, String, DateTime, Date, Text, Boolean, Integer, LargeBinary, Enum, Numeric, ForeignKeyConstraint, UniqueConstraint, Index, JSON, func, case
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, deferred, undefer_group, load_only, relationship, foreign, joinedload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects import postgresql, sqlite
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 import enum
 
+from db_pool import build_pool_config_from_env, build_engine_options, PoolMetrics
+from record_content import content_hash, compress_text, decompress_text
+from record_partitions import is_partition_name
+from change_feed import build_change_feed
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -162,9 +172,89 @@ def build_postgres_url_from_env() -> str:
 
     return f"postgresql://{postgres_user}:{postgres_password}@{postgres_host}:{postgres_port}/{postgres_db}"
 
+# Deferred column group holding a record's JSON payload and other Text columns. List queries skip
+# them; code that needs them loads the group up front with undefer_group(RECORD_CONTENT_GROUP).
+RECORD_CONTENT_GROUP = 'content'
+
+
+class JSONPayload(TypeDecorator):
+    """
+    JSON document column: JSONB on PostgreSQL, so it can be GIN-indexed and filtered with @>,
+    and JSON (text storage) elsewhere. Python None is stored as SQL NULL. Values load already
+    decoded, once per row; on VehicleProcessingRecord the payloads sit in the deferred content
+    group, so they are neither fetched nor decoded until one of them is first read.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(none_as_null=True)
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.JSONB(none_as_null=True))
+        return dialect.type_descriptor(JSON(none_as_null=True))
+
+    def process_bind_param(self, value, dialect):
+        # Callers written for the old Text columns pass json.dumps() output; store the document
+        # it encodes rather than a JSON string. Text that is not JSON is kept as a JSON string.
+        if isinstance(value, str):
+            if not value.strip():
+                return None
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value
+
+
+# Large text fields of a record kept compressed in record_contents and read only by detail views.
+# The record holds a <field>_content_id reference per field; ai_analysis_result is stored as JSON text.
+RECORD_CONTENT_FIELDS = ('original_description', 'ai_generated_description', 'final_description', 'ai_analysis_result')
+DESCRIPTION_PREVIEW_LENGTH = 200  # Characters of the final description kept on the record for list views
+# PostgreSQL advisory lock: shared by writers reusing record_contents rows, exclusive while pruning them
+RECORD_CONTENTS_LOCK_KEY = 0x7265636f6e74
+
+
+class RecordContent(Base):
+    """Compressed large text of processing records, stored once per distinct text (see record_content.py)"""
+    __tablename__ = 'record_contents'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    content_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 of the uncompressed text
+    codec = Column(String(10), nullable=False)  # zstd or zlib
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)  # Uncompressed size in bytes
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def value(self) -> str:
+        """The uncompressed text"""
+        return decompress_text(self.codec, self.data)
+
+    def __repr__(self):
+        return f"<RecordContent(id={self.id}, codec='{self.codec}', raw_size={self.raw_size})>"
+
+
+def _record_content_relationship(field: str):
+    """
+    Read-only link from a record's <field>_content_id to its RecordContent. There is no foreign
+    key: contents are shared between records and referenced from every monthly partition.
+    """
+    return relationship(
+        RecordContent,
+        primaryjoin=lambda: foreign(getattr(VehicleProcessingRecord, f'{field}_content_id')) == RecordContent.id,
+        viewonly=True
+    )
+
+
 class VehicleProcessingRecord(Base):
     """Model to track vehicle processing changes and modifications"""
     __tablename__ = 'vehicle_processing_records'
+    __table_args__ = (
+        # Keyset pagination order for /api/vehicles: processing_date DESC, id DESC
+        Index('ix_vehicle_processing_records_processing_date_id', 'processing_date', 'id'),
+    )
     
     # Primary identifiers
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -173,7 +263,7 @@ class VehicleProcessingRecord(Base):
     vehicle_name = Column(String(200), nullable=True, index=True)  # Vehicle year, make, model
     
     # Environment/Session identifiers for filtering
-    environment_id = Column(String(100), nullable=True, index=True)  # Environment ID from .env file
+    environment_id = Column(String(100), nullable=True)  # Environment ID from .env file (indexed below)
     
     # Processing metadata
     processing_date = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -183,38 +273,73 @@ class VehicleProcessingRecord(Base):
     odometer = Column(String(20), nullable=True)
     days_in_inventory = Column(String(10), nullable=True)
     
-    # Description changes
-    original_description = Column(Text, nullable=True)
-    ai_generated_description = Column(Text, nullable=True)
-    final_description = Column(Text, nullable=True)
+    # Description changes (texts in record_contents; preview and length for list views)
+    original_description_content_id = Column(Integer, nullable=True)
+    ai_generated_description_content_id = Column(Integer, nullable=True)
+    final_description_content_id = Column(Integer, nullable=True)
+    description_preview = Column(String(DESCRIPTION_PREVIEW_LENGTH), nullable=True)
+    description_length = Column(Integer, nullable=True)
     description_updated = Column(Boolean, default=False)
     
     # Features and modifications
-    starred_features = Column(Text, nullable=True)  # JSON string of starred features
+    starred_features = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON starred features
     marked_features_count = Column(Integer, default=0)
-    feature_decisions = Column(Text, nullable=True)  # JSON string of LLM feature decisions
+    feature_decisions = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON LLM feature decisions
     
     # Certifications and special attributes
     no_fear_certificate = Column(Boolean, default=False)
-    no_fear_certificate_text = Column(Text, nullable=True)
+    no_fear_certificate_text = deferred(Column(Text, nullable=True), group=RECORD_CONTENT_GROUP)
     
     # AI Analysis results
-    ai_analysis_result = Column(Text, nullable=True)  # JSON string of full analysis
+    ai_analysis_result_content_id = Column(Integer, nullable=True)  # Full analysis JSON in record_contents
     screenshot_path = Column(String(500), nullable=True)
     
     # Processing status and results
     processing_status = Column(String(20), default='pending')  # pending, processing, completed, failed
     processing_successful = Column(Boolean, default=False)
-    errors_encountered = Column(Text, nullable=True)  # JSON string of errors
+    errors_encountered = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON errors
     processing_duration = Column(String(20), nullable=True)  # Duration in seconds
     no_build_data_found = Column(Boolean, default=False)  # Flag for missing build data
     
     # Book Values and Media info
     book_values_processed = Column(Boolean, default=False)
-    book_values_before_processing = Column(Text, nullable=True)  # JSON string of book values before processing
-    book_values_after_processing = Column(Text, nullable=True)  # JSON string of book values after processing
+    book_values_before_processing = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON book values before processing
+    book_values_after_processing = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON book values after processing
     media_tab_processed = Column(Boolean, default=False)
-    media_totals_found = Column(Text, nullable=True)  # JSON string of totals found
+    media_totals_found = deferred(Column(JSONPayload, nullable=True), group=RECORD_CONTENT_GROUP)  # JSON totals found
+    
+    # Change tracking for /api/vehicles/changes: the store's write version (store_write_versions)
+    # after the last write to the record, and the time of that write
+    row_version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+    
+    # Compressed large texts; load them with record_detail_options()
+    original_description_content = _record_content_relationship('original_description')
+    ai_generated_description_content = _record_content_relationship('ai_generated_description')
+    final_description_content = _record_content_relationship('final_description')
+    ai_analysis_result_content = _record_content_relationship('ai_analysis_result')
+    
+    @property
+    def original_description(self) -> Optional[str]:
+        return self.original_description_content.value if self.original_description_content else None
+    
+    @property
+    def ai_generated_description(self) -> Optional[str]:
+        return self.ai_generated_description_content.value if self.ai_generated_description_content else None
+    
+    @property
+    def final_description(self) -> Optional[str]:
+        return self.final_description_content.value if self.final_description_content else None
+    
+    @property
+    def ai_analysis_result(self) -> Any:
+        if not self.ai_analysis_result_content:
+            return None
+        value = self.ai_analysis_result_content.value
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
     
     def __repr__(self):
         return f"<VehicleProcessingRecord(stock_number='{self.stock_number}', processing_date='{self.processing_date}')>"
@@ -235,26 +360,641 @@ class VehicleProcessingRecord(Base):
             'ai_generated_description': self.ai_generated_description,
             'final_description': self.final_description,
             'description_updated': self.description_updated,
-            'starred_features': json.loads(self.starred_features) if self.starred_features else None,
+            'starred_features': self.starred_features,
             'marked_features_count': self.marked_features_count,
-            'feature_decisions': json.loads(self.feature_decisions) if self.feature_decisions else None,
+            'feature_decisions': self.feature_decisions,
             'no_fear_certificate': self.no_fear_certificate,
             'no_fear_certificate_text': self.no_fear_certificate_text,
-            'ai_analysis_result': json.loads(self.ai_analysis_result) if self.ai_analysis_result else None,
+            'ai_analysis_result': self.ai_analysis_result,
             'screenshot_path': self.screenshot_path,
             'processing_status': self.processing_status,
             'processing_successful': self.processing_successful,
-            'errors_encountered': json.loads(self.errors_encountered) if self.errors_encountered else None,
+            'errors_encountered': self.errors_encountered,
             'processing_duration': self.processing_duration,
             'no_build_data_found': self.no_build_data_found,
             'book_values_processed': self.book_values_processed,
-            'book_values_before_processing': json.loads(self.book_values_before_processing) if self.book_values_before_processing else None,
-            'book_values_after_processing': json.loads(self.book_values_after_processing) if self.book_values_after_processing else None,
+            'book_values_before_processing': self.book_values_before_processing,
+            'book_values_after_processing': self.book_values_after_processing,
             'media_tab_processed': self.media_tab_processed,
-            'media_totals_found': json.loads(self.media_totals_found) if self.media_totals_found else None,
+            'media_totals_found': self.media_totals_found,
         }
 
 
+# Dashboard query shape: environment_id IN (...) plus a processing_date range, newest first.
+# Also serves plain environment_id lookups, so there is no single-column environment_id index.
+Index(
+    'ix_vehicle_processing_records_env_date_id',
+    VehicleProcessingRecord.environment_id,
+    VehicleProcessingRecord.processing_date.desc(),
+    VehicleProcessingRecord.id.desc()
+)
+
+# Changes of one store after a sync cursor (/api/vehicles/changes)
+Index(
+    'ix_vehicle_processing_records_env_row_version',
+    VehicleProcessingRecord.environment_id,
+    VehicleProcessingRecord.row_version
+)
+
+# Key of the record VehicleDatabaseManager.upsert_processing_summary (and log_processing_summaries
+# with upsert=True) updates: one vehicle in one store and processing session. It is not unique:
+# log_processing_summary and create_vehicle_record always insert, and records logged before the
+# upserts existed may share a key (upserts update the newest). NULL store or session ids never
+# match. Upserting writers serialize on their stores' write versions and look the key up here.
+UPSERT_KEY_COLUMNS = ('environment_id', 'stock_number', 'processing_session_id')
+Index(
+    'ix_vehicle_processing_records_env_stock_session',
+    *[getattr(VehicleProcessingRecord, column) for column in UPSERT_KEY_COLUMNS]
+)
+
+# Only records with processed book values feed the book value rollups and debug views
+Index(
+    'ix_vehicle_processing_records_book_values_env_date',
+    VehicleProcessingRecord.environment_id,
+    VehicleProcessingRecord.processing_date,
+    postgresql_where=VehicleProcessingRecord.book_values_processed == True,
+    sqlite_where=VehicleProcessingRecord.book_values_processed == True
+)
+Index(
+    'ix_vehicle_processing_records_book_values_date',
+    VehicleProcessingRecord.processing_date,
+    postgresql_where=VehicleProcessingRecord.book_values_processed == True,
+    sqlite_where=VehicleProcessingRecord.book_values_processed == True
+)
+
+# Trigram GIN indexes for stock number / VIN / vehicle name search (see vehicle_search.py).
+# PostgreSQL only; pg_trgm must exist before they are created.
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+for _search_column in ('stock_number', 'vin', 'vehicle_name'):
+    Index(
+        f'ix_vehicle_processing_records_{_search_column}_trgm',
+        getattr(VehicleProcessingRecord, _search_column),
+        postgresql_using='gin',
+        postgresql_ops={_search_column: 'gin_trgm_ops'}
+    ).ddl_if(dialect='postgresql')
+
+# GIN indexes so JSONB containment (@>) filters run off an index, e.g. vehicles whose errors include
+# a given message (see json_array_contains). PostgreSQL only; jsonb_path_ops serves @> and is compact.
+JSON_GIN_INDEX_COLUMNS = ('errors_encountered', 'starred_features')
+for _json_column in JSON_GIN_INDEX_COLUMNS:
+    Index(
+        f'ix_vehicle_processing_records_{_json_column}_gin',
+        getattr(VehicleProcessingRecord, _json_column),
+        postgresql_using='gin',
+        postgresql_ops={_json_column: 'jsonb_path_ops'}
+    ).ddl_if(dialect='postgresql')
+
+
+def json_array_contains(column, element, dialect_name: str = None):
+    """
+    Filter for rows whose JSON array `column` has `element` as one of its items.
+    PostgreSQL uses JSONB containment, served by the GIN indexes above; SQLite walks the
+    array with json_each. Objects match by containment on PostgreSQL only.
+    """
+    if dialect_name == 'postgresql':
+        return type_coerce(column, postgresql.JSONB).contains([element])
+    items = func.json_each(column).table_valued('value')
+    return exists(select(1).select_from(items).where(items.c.value == element))
+
+
+# SQLite has no trigram index; a narrow covering index keeps the search scan off the wide record rows
+Index(
+    'ix_vehicle_processing_records_search_columns',
+    VehicleProcessingRecord.environment_id,
+    VehicleProcessingRecord.stock_number,
+    VehicleProcessingRecord.vin,
+    VehicleProcessingRecord.vehicle_name,
+    VehicleProcessingRecord.processing_date
+).ddl_if(dialect='sqlite')
+
+
+# Book value sources in the order used to pick a vehicle's primary value when KBB is missing
+BOOK_VALUE_FALLBACK_SOURCES = ['rBook', 'J.D. Power', 'MMR', 'Black Book']
+
+
+def parse_currency_value(value_str: str) -> float:
+    """Parse currency string like '$25,000' to float"""
+    if isinstance(value_str, (int, float)):
+        return float(value_str)
+    if not value_str or value_str.strip() == "":
+        return 0.0
+    try:
+        # Remove $ signs, commas, and convert to float
+        cleaned = value_str.replace('$', '').replace(',', '').strip()
+        return float(cleaned) if cleaned else 0.0
+    except (ValueError, TypeError, AttributeError):
+        return 0.0
+
+
+class VehicleBookValue(Base):
+    """Parsed numeric book values per source for a processed vehicle"""
+    __tablename__ = 'vehicle_book_values'
+    __table_args__ = (
+        UniqueConstraint('record_id', 'source', name='uq_vehicle_book_values_record_source'),
+        # A foreign key cannot reference the partitioned records table on PostgreSQL, where
+        # delete_vehicle and archive_partitions remove a record's rows instead
+        ForeignKeyConstraint(['record_id'], ['vehicle_processing_records.id'], ondelete='CASCADE').ddl_if(dialect='sqlite'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    record_id = Column(Integer, nullable=False, index=True)
+    source = Column(String(100), nullable=False, index=True)  # KBB, rBook, J.D. Power, MMR, Black Book, ...
+    before_value = Column(Numeric(12, 2), nullable=False, default=0)
+    after_value = Column(Numeric(12, 2), nullable=False, default=0)
+    difference = Column(Numeric(12, 2), nullable=False, default=0)
+    is_primary = Column(Boolean, nullable=False, default=False)  # Source counted in the vehicle's total difference
+
+    def __repr__(self):
+        return f"<VehicleBookValue(record_id={self.record_id}, source='{self.source}', difference={self.difference})>"
+
+
+def _load_book_value_dict(value) -> Dict[str, Any]:
+    """Decode a book values payload (JSON string or dict) into a dict"""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def build_book_value_rows(record_id: int, before_values, after_values) -> List[VehicleBookValue]:
+    """
+    Build normalized book value rows from the before/after payloads of a record.
+    The primary source is KBB, falling back to the first other major source with a value.
+    """
+    before_data = _load_book_value_dict(before_values)
+    after_data = _load_book_value_dict(after_values)
+
+    parsed = {}
+    for source in list(before_data.keys()) + [k for k in after_data.keys() if k not in before_data]:
+        if not source:  # Skip empty categories
+            continue
+        before_val = parse_currency_value(before_data.get(source, '0'))
+        after_val = parse_currency_value(after_data.get(source, '0'))
+        parsed[source] = (before_val, after_val)
+
+    primary_source = None
+    kbb_before, kbb_after = parsed.get('KBB', (0.0, 0.0))
+    if kbb_before != 0 or kbb_after != 0:
+        primary_source = 'KBB'
+    else:
+        for source in BOOK_VALUE_FALLBACK_SOURCES:
+            before_val, after_val = parsed.get(source, (0.0, 0.0))
+            if before_val > 0 or after_val > 0:
+                primary_source = source
+                break
+
+    return [
+        VehicleBookValue(
+            record_id=record_id,
+            source=source,
+            before_value=before_val,
+            after_value=after_val,
+            difference=after_val - before_val,
+            is_primary=(source == primary_source)
+        )
+        for source, (before_val, after_val) in parsed.items()
+    ]
+
+
+# Concurrent database threads to allow when the engine pool has no fixed size
+DEFAULT_MAX_DB_THREADS = 15
+
+# Rollup key used for records without an environment ID (rollup keys cannot be NULL)
+NO_ENVIRONMENT_ROLLUP_KEY = ''
+
+
+class DailyStoreRollup(Base):
+    """Per-store, per-day KPI counts maintained incrementally from vehicle processing records"""
+    __tablename__ = 'daily_store_rollups'
+    __table_args__ = (
+        UniqueConstraint('environment_id', 'rollup_date', name='uq_daily_store_rollups_store_date'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    environment_id = Column(String(100), nullable=False, default=NO_ENVIRONMENT_ROLLUP_KEY, index=True)
+    rollup_date = Column(Date, nullable=False, index=True)
+    processed_count = Column(Integer, nullable=False, default=0)
+    successful_count = Column(Integer, nullable=False, default=0)
+    descriptions_updated_count = Column(Integer, nullable=False, default=0)
+    no_fear_count = Column(Integer, nullable=False, default=0)
+    features_marked_sum = Column(Integer, nullable=False, default=0)
+    first_processing_date = Column(DateTime, nullable=True)
+    last_processing_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DailyStoreRollup(environment_id='{self.environment_id}', rollup_date='{self.rollup_date}', processed={self.processed_count})>"
+
+
+class DailyStoreBookValueRollup(Base):
+    """Per-store, per-day book value deltas for each source"""
+    __tablename__ = 'daily_store_book_value_rollups'
+    __table_args__ = (
+        UniqueConstraint('environment_id', 'rollup_date', 'source', name='uq_daily_store_book_value_rollups_store_date_source'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    environment_id = Column(String(100), nullable=False, default=NO_ENVIRONMENT_ROLLUP_KEY, index=True)
+    rollup_date = Column(Date, nullable=False, index=True)
+    source = Column(String(100), nullable=False)
+    record_count = Column(Integer, nullable=False, default=0)
+    difference_sum = Column(Numeric(14, 2), nullable=False, default=0)
+    primary_difference_sum = Column(Numeric(14, 2), nullable=False, default=0)  # Counted towards book value totals
+
+    def __repr__(self):
+        return f"<DailyStoreBookValueRollup(environment_id='{self.environment_id}', rollup_date='{self.rollup_date}', source='{self.source}')>"
+
+
+class StoreWriteVersion(Base):
+    """
+    Per-store counter bumped in the same transaction as every write to the store's records.
+    The API derives its ETag validators from it with one primary key lookup.
+    """
+    __tablename__ = 'store_write_versions'
+
+    environment_id = Column(String(100), primary_key=True)  # NO_ENVIRONMENT_ROLLUP_KEY for records without a store
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Newest version whose tombstones were pruned; change cursors from before it must reload
+    pruned_tombstone_version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<StoreWriteVersion(environment_id='{self.environment_id}', version={self.version})>"
+
+
+class VehicleRecordTombstone(Base):
+    """
+    A record deleted from a store, or moved to another one, for /api/vehicles/changes. Written in
+    the same transaction as the delete, at the store's new write version.
+    """
+    __tablename__ = 'vehicle_record_tombstones'
+    __table_args__ = (
+        Index('ix_vehicle_record_tombstones_env_row_version', 'environment_id', 'row_version'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    record_id = Column(Integer, nullable=False)
+    environment_id = Column(String(100), nullable=False, default=NO_ENVIRONMENT_ROLLUP_KEY)
+    row_version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<VehicleRecordTombstone(record_id={self.record_id}, environment_id='{self.environment_id}', row_version={self.row_version})>"
+
+
+def record_detail_options() -> tuple:
+    """Loader options for full records: the deferred content columns and the compressed large texts"""
+    return (
+        undefer_group(RECORD_CONTENT_GROUP),
+        *(joinedload(getattr(VehicleProcessingRecord, f'{field}_content')) for field in RECORD_CONTENT_FIELDS)
+    )
+
+
+def get_rollup_key(environment_id: Optional[str], processing_date: Optional[datetime]) -> Optional[tuple]:
+    """Get the (environment_id, date) rollup bucket a record belongs to"""
+    if processing_date is None:
+        return None
+    return (environment_id or NO_ENVIRONMENT_ROLLUP_KEY, processing_date.date())
+
+
+# Record columns holding JSON documents (JSONPayload)
+RECORD_JSON_FIELDS = (
+    'starred_features', 'feature_decisions', 'errors_encountered',
+    'media_totals_found', 'book_values_before_processing', 'book_values_after_processing'
+)
+
+
+# session.info key of the write versions bumped in the session's current transaction
+BUMPED_STORE_VERSIONS_KEY = 'bumped_store_write_versions'
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_bumped_store_write_versions(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(BUMPED_STORE_VERSIONS_KEY, None)
+
+
+def bump_store_write_versions(session: Session, environment_ids: set) -> Dict[str, int]:
+    """
+    Increment the write versions of the given stores (None for records without a store), once per
+    transaction: stores already bumped in it keep their version. The bump row-locks each store's
+    version until commit, so writers of a store that bump first run one after another.
+    Returns {environment_id or NO_ENVIRONMENT_ROLLUP_KEY: new version}.
+    """
+    requested = {environment_id or NO_ENVIRONMENT_ROLLUP_KEY for environment_id in environment_ids}
+    bumped = session.info.setdefault(BUMPED_STORE_VERSIONS_KEY, {})
+    keys = sorted(requested - bumped.keys())
+    if keys:
+        bumped.update(_increment_store_write_versions(session, keys))
+    return {key: bumped[key] for key in requested}
+
+
+def _increment_store_write_versions(session: Session, keys: List[str]) -> Dict[str, int]:
+    table = StoreWriteVersion.__table__
+    now = datetime.utcnow()
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ('postgresql', 'sqlite'):
+        # Sorted keys, so two transactions bumping the same stores cannot deadlock
+        dialect_insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+        statement = dialect_insert(table).values([{'environment_id': key, 'version': 1, 'updated_at': now} for key in keys])
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.environment_id],
+            set_={'version': table.c.version + 1, 'updated_at': statement.excluded.updated_at}
+        ).returning(table.c.environment_id, table.c.version)
+        return {key: version for key, version in session.execute(statement)}
+    versions = {}
+    for key in keys:
+        updated = session.execute(
+            update(table).where(table.c.environment_id == key).values(version=table.c.version + 1, updated_at=now)
+        ).rowcount
+        if not updated:
+            session.execute(insert(table).values(environment_id=key, version=1, updated_at=now))
+        versions[key] = session.execute(select(table.c.version).where(table.c.environment_id == key)).scalar_one()
+    return versions
+
+
+def get_store_change_versions(session: Session, environment_ids: Optional[tuple]) -> Dict[str, tuple]:
+    """
+    {environment_id or NO_ENVIRONMENT_ROLLUP_KEY: (write version, pruned tombstone version)} of the
+    given stores, or of every store when environment_ids is None. Stores never written to are left out.
+    """
+    query = session.query(
+        StoreWriteVersion.environment_id, StoreWriteVersion.version, StoreWriteVersion.pruned_tombstone_version
+    )
+    if environment_ids is not None:
+        query = query.filter(StoreWriteVersion.environment_id.in_(environment_ids))
+    return {environment_id: (version, pruned) for environment_id, version, pruned in query.all()}
+
+
+def get_store_write_validator(session: Session, environment_ids: Optional[tuple]) -> tuple:
+    """
+    (sum of write versions, number of stores, last write time) over the given stores, or over every
+    store when environment_ids is None. Any committed write to one of the stores changes the sum.
+    """
+    query = session.query(
+        func.coalesce(func.sum(StoreWriteVersion.version), 0),
+        func.count(StoreWriteVersion.environment_id),
+        func.max(StoreWriteVersion.updated_at)
+    )
+    if environment_ids is not None:
+        query = query.filter(StoreWriteVersion.environment_id.in_(environment_ids))
+    version_sum, store_count, last_write = query.one()
+    return int(version_sum), store_count, last_write
+
+
+def build_processing_summary_values(
+    stock_number: str,
+    vin: str = None,
+    odometer: str = None,
+    days_in_inventory: str = None,
+    starred_features: List[Dict] = None,
+    description_data: Dict = None,
+    no_fear_certificate: bool = False,
+    no_fear_text: str = None,
+    ai_analysis: Dict = None,
+    screenshot_path: str = None,
+    processing_successful: bool = True,
+    errors: List[str] = None,
+    processing_duration: str = None,
+    session_id: str = None,
+    environment_id: str = None
+) -> Dict[str, Any]:
+    """
+    Column values of a complete processing summary record; the JSON fields are serialized by JSONPayload
+    and the RECORD_CONTENT_FIELDS are moved to record_contents by store_record_contents when written.
+    Every summary yields the same keys, so many of them can be inserted with one executemany.
+    """
+    values = {
+        'stock_number': stock_number,
+        'vin': vin,
+        'environment_id': environment_id if environment_id is not None else os.getenv('ENVIRONMENT_ID'),
+        'processing_session_id': session_id,
+        'odometer': odometer,
+        'days_in_inventory': days_in_inventory,
+        'processing_date': datetime.utcnow(),
+        'processing_successful': processing_successful,
+        'processing_duration': processing_duration,
+        'screenshot_path': screenshot_path,
+        'no_fear_certificate': no_fear_certificate,
+        'no_fear_certificate_text': no_fear_text,
+        'starred_features': None,
+        'marked_features_count': 0,
+        'original_description': None,
+        'ai_generated_description': None,
+        'final_description': None,
+        'description_updated': False,
+        'ai_analysis_result': None,
+        'errors_encountered': None,
+    }
+    
+    if starred_features:
+        values['starred_features'] = starred_features
+        values['marked_features_count'] = len(starred_features)
+    
+    if description_data:
+        values.update({
+            'original_description': description_data.get('original'),
+            'ai_generated_description': description_data.get('ai_generated'),
+            'final_description': description_data.get('final'),
+            'description_updated': description_data.get('updated', False)
+        })
+    
+    if ai_analysis:
+        values['ai_analysis_result'] = ai_analysis
+    
+    if errors:
+        values['errors_encountered'] = errors
+    
+    return values
+
+
+def _record_content_text(field: str, value: Any) -> Optional[str]:
+    """Text stored in record_contents for a content field value; the AI analysis is kept as JSON"""
+    if value is None or value == '':
+        return None
+    if field == 'ai_analysis_result':
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return value
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def store_record_contents(session: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Move the RECORD_CONTENT_FIELDS of record column values into record_contents. Returns copies of
+    the rows with each field replaced by its <field>_content_id, plus the description preview and
+    length when final_description is given. Identical texts (AI descriptions are often the same
+    across re-runs) share one compressed row, found by content hash.
+    """
+    texts = {}
+    for row in rows:
+        for field in RECORD_CONTENT_FIELDS:
+            value = _record_content_text(field, row.get(field))
+            if value is not None:
+                texts.setdefault(content_hash(value), value)
+
+    content_ids = {}
+    if texts:
+        if session.get_bind().dialect.name == 'postgresql':
+            # Until commit, prune_record_contents cannot delete the rows found or inserted here
+            # before this transaction's records reference them
+            session.execute(text("SELECT pg_advisory_xact_lock_shared(:key)"), {'key': RECORD_CONTENTS_LOCK_KEY})
+        table = RecordContent.__table__
+        hashes = sorted(texts)
+        content_ids = dict(session.execute(
+            select(table.c.content_hash, table.c.id).where(table.c.content_hash.in_(hashes))
+        ).all())
+        missing = [digest for digest in hashes if digest not in content_ids]
+        if missing:
+            dialect_name = session.get_bind().dialect.name
+            if dialect_name == 'postgresql':
+                statement = postgresql.insert(table).on_conflict_do_nothing(index_elements=[table.c.content_hash])
+            elif dialect_name == 'sqlite':
+                statement = sqlite.insert(table).on_conflict_do_nothing(index_elements=[table.c.content_hash])
+            else:
+                statement = insert(table)
+            now = datetime.utcnow()
+            new_contents = []
+            for digest in missing:
+                codec, data = compress_text(texts[digest])
+                new_contents.append({
+                    'content_hash': digest, 'codec': codec, 'data': data,
+                    'raw_size': len(texts[digest].encode('utf-8')), 'created_at': now
+                })
+            session.execute(statement, new_contents)
+            # Rows a concurrent writer inserted first are picked up here too
+            content_ids.update(session.execute(
+                select(table.c.content_hash, table.c.id).where(table.c.content_hash.in_(missing))
+            ).all())
+
+    stored_rows = []
+    for row in rows:
+        stored = {key: value for key, value in row.items() if key not in RECORD_CONTENT_FIELDS}
+        for field in RECORD_CONTENT_FIELDS:
+            if field in row:
+                value = _record_content_text(field, row[field])
+                stored[f'{field}_content_id'] = content_ids[content_hash(value)] if value is not None else None
+        if 'final_description' in row:
+            final_description = row['final_description'] or None
+            stored['description_preview'] = final_description[:DESCRIPTION_PREVIEW_LENGTH] if final_description else None
+            stored['description_length'] = len(final_description) if final_description else None
+        stored_rows.append(stored)
+    return stored_rows
+
+
+def prune_record_contents(db_manager: 'VehicleDatabaseManager') -> int:
+    """
+    Delete record_contents rows no record references any more, left behind by updated or deleted
+    records; returns the number deleted. On PostgreSQL, partitions moved to any archive schema
+    still count as references, and the record contents lock is taken exclusively: the prune waits
+    for writers that may reuse a content row to commit, and new writers wait for the prune.
+    """
+    with db_manager.get_session() as session:
+        sources = [VehicleProcessingRecord.__table__.name]
+        if session.get_bind().dialect.name == 'postgresql':
+            session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': RECORD_CONTENTS_LOCK_KEY})
+            # Detached partitions, wherever `manage_partitions.py archive --schema` moved them
+            sources += [
+                f'"{schema}"."{name}"' for schema, name in session.execute(text(
+                    "SELECT n.nspname, c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE c.relkind = 'r' AND NOT c.relispartition "
+                    "AND n.nspname NOT IN ('pg_catalog', 'information_schema')"
+                )).all()
+                if is_partition_name(name)
+            ]
+        referenced = ' UNION '.join(
+            f"SELECT {field}_content_id FROM {source} WHERE {field}_content_id IS NOT NULL"
+            for source in sources for field in RECORD_CONTENT_FIELDS
+        )
+        deleted = session.execute(
+            text(f"DELETE FROM {RecordContent.__tablename__} WHERE id NOT IN ({referenced})")
+        ).rowcount
+        session.commit()
+    logger.info("Pruned %d unreferenced record contents", deleted)
+    return deleted
+
+
+# Days tombstones are kept for /api/vehicles/changes; clients that last synced earlier reload
+DEFAULT_TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', '30'))
+
+
+def prune_record_tombstones(db_manager: 'VehicleDatabaseManager', older_than_days: int = DEFAULT_TOMBSTONE_RETENTION_DAYS) -> int:
+    """
+    Delete tombstones older than `older_than_days`; returns the number deleted. Each store keeps the
+    newest version pruned, so change cursors from before it are told to reload instead of missing deletes.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    tombstones = VehicleRecordTombstone.__table__
+    versions = StoreWriteVersion.__table__
+    with db_manager.get_session() as session:
+        pruned = session.execute(
+            select(tombstones.c.environment_id, func.max(tombstones.c.row_version))
+            .where(tombstones.c.deleted_at < cutoff)
+            .group_by(tombstones.c.environment_id)
+        ).all()
+        for environment_id, row_version in pruned:
+            session.execute(
+                update(versions)
+                .where(versions.c.environment_id == environment_id, versions.c.pruned_tombstone_version < row_version)
+                .values(pruned_tombstone_version=row_version)
+            )
+        deleted = session.execute(tombstones.delete().where(tombstones.c.deleted_at < cutoff)).rowcount
+        session.commit()
+    logger.info("Pruned %d record tombstones older than %d days", deleted, older_than_days)
+    return deleted
+
+
+# Summaries written per transaction by VehicleDatabaseManager.log_processing_summaries
+DEFAULT_INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', '500'))
+
+# Columns an upsert merges into the existing record. A NULL incoming value keeps the stored one,
+# so a later run that did not produce descriptions, errors or features does not erase them. The
+# upsert key identifies the record and processing_date is kept from the first write, so the
+# record's rollup bucket and list position do not move.
+SUMMARY_UPDATE_COLUMNS = (
+    'vin', 'odometer', 'days_in_inventory', 'processing_successful', 'processing_duration',
+    'screenshot_path', 'no_fear_certificate', 'no_fear_certificate_text', 'starred_features',
+    'marked_features_count', 'original_description_content_id', 'ai_generated_description_content_id',
+    'final_description_content_id', 'description_preview', 'description_length', 'description_updated',
+    'ai_analysis_result_content_id', 'errors_encountered'
+)
+
+# Derived columns that are merged along with the column they describe, rather than on their own
+# (they are never NULL: a summary without starred features still counts 0 of them)
+SUMMARY_MERGED_WITH = {
+    'marked_features_count': 'starred_features',
+    'description_updated': 'final_description_content_id',
+}
+
+
+def build_summary_merge_values() -> Dict[str, Any]:
+    """
+    SET clause of the executemany UPDATE that merges summary rows into existing records; each row
+    binds its values as new_<column>
+    """
+    table = VehicleProcessingRecord.__table__
+    values = {}
+    for name in SUMMARY_UPDATE_COLUMNS:
+        column = table.c[name]
+        merged_with = SUMMARY_MERGED_WITH.get(name, name)
+        values[name] = case(
+            (bindparam(f'new_{merged_with}', type_=table.c[merged_with].type).is_(None), column),
+            else_=bindparam(f'new_{name}', type_=column.type)
+        )
+    return values
+
+
 class VehicleDatabaseManager:
     """Database manager for vehicle processing operations"""
     
@@ -264,24 +1004,31 @@ class VehicleDatabaseManager:
             db_url = self._get_database_url()
         
         self.db_url = db_url
-        self.engine = create_engine(db_url, echo=False)
+        self.pool_config = build_pool_config_from_env()
+        self.engine = create_engine(db_url, echo=False, **build_engine_options(db_url, self.pool_config))
+        self.pool_metrics = PoolMetrics()
+        self.pool_metrics.attach(self.engine)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        
-        # Create tables if they don't exist
-        self.create_tables()
+        self.write_listeners: List[Callable[[set], None]] = []
+        self.change_listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        # Change events of this process's writes and, on PostgreSQL, of every other worker's
+        self.change_feed = build_change_feed(self.engine)
+        self.change_feed.subscribe(self._dispatch_changes)
+        # No connection is opened here. The schema is managed by Alembic (`alembic upgrade head`);
+        # create_tables() remains for throwaway development and benchmark databases.
     
     def _get_database_url(self) -> str:
         """Get PostgreSQL database URL from environment variables"""
         return build_postgres_url_from_env()
     
     def create_tables(self):
-        """Create database tables"""
+        """Create missing tables and run the user role migration (outside Alembic-managed deployments)"""
         try:
             Base.metadata.create_all(bind=self.engine)
             # Run user migration after creating tables
             self._migrate_users_if_needed()
         except Exception as e:
-            print(f"Error creating database tables: {e}")
+            logger.error("Error creating database tables: %s", e)
     
     def _migrate_users_if_needed(self):
         """Check if users need migration and perform it if necessary"""
@@ -291,22 +1038,124 @@ class VehicleDatabaseManager:
                 users_without_roles = session.query(User).filter(User.role.is_(None)).count()
                 
                 if users_without_roles > 0:
-                    print(f"Found {users_without_roles} users that need migration...")
+                    logger.info("Found %d users that need migration...", users_without_roles)
                     migrate_users_to_role_system(self)
                     
                 # Check if we need to create the first super admin
                 super_admins = session.query(User).filter(User.role == UserRole.SUPER_ADMIN).count()
                 if super_admins == 0:
-                    print("No super admin found. Creating default super admin...")
+                    logger.warning("No super admin found. Creating default super admin...")
                     create_super_admin(self)
                     
         except Exception as e:
-            print(f"Warning: Could not check user migration status: {e}")
+            logger.warning("Could not check user migration status: %s", e)
             # This might happen on first run when tables don't exist yet
     
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
+
+    def check_connection(self):
+        """Open a connection and run a trivial query; raises if the database is unreachable"""
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+
+    def get_max_connections(self) -> int:
+        """Maximum number of connections the engine pool hands out at once (pool size plus overflow)"""
+        pool = self.engine.pool
+        if callable(getattr(pool, 'size', None)):
+            return max(self.pool_config['pool_size'] + max(self.pool_config['max_overflow'], 0), 1)
+        # Pools without a fixed size (e.g. in-memory SQLite)
+        return DEFAULT_MAX_DB_THREADS
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Connection pool occupancy, counters and configuration for instrumentation"""
+        status = self.pool_metrics.snapshot(self.engine.pool)
+        status['config'] = dict(self.pool_config)
+        return status
+    
+    def add_write_listener(self, listener: Callable[[set], None]):
+        """
+        Call `listener` with the set of environment_ids whose records a committed write changed,
+        for writes of this process and, on PostgreSQL, of other processes (see change_feed.py).
+        It is called with None when other processes' writes may have been missed (the change feed
+        reconnected): any store may have changed.
+        """
+        self.write_listeners.append(listener)
+    
+    def add_change_listener(self, listener: Callable[[List[Dict[str, Any]]], None]):
+        """
+        Call `listener` with the change events of each committed write (see change_feed.py): dicts
+        with the record `id`, its `environment_id`, `action` ('upsert': created or updated, or
+        'delete'), the `fields` an update set and the store's write `version`. A listener may also
+        get {'action': 'resync'} when events from other processes were lost.
+        """
+        self.change_listeners.append(listener)
+    
+    def _publish_changes(self, session: Session, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bump the write versions of the changed records' stores and send the change events to the
+        other processes, in the write transaction. Returns the events for _notify_write.
+        """
+        versions = bump_store_write_versions(session, {change['environment_id'] for change in changes})
+        events = [
+            {
+                'action': change['action'],
+                'id': change['id'],
+                'environment_id': change['environment_id'],
+                'fields': change.get('fields'),
+                'version': versions.get(change['environment_id'] or NO_ENVIRONMENT_ROLLUP_KEY),
+                'origin': self.change_feed.origin
+            }
+            for change in changes
+        ]
+        self._track_changes(session, events)
+        self.change_feed.publish(session, events)
+        return events
+    
+    def _track_changes(self, session: Session, events: List[Dict[str, Any]]):
+        """Stamp written records with their store's new version and tombstone removed ones (/api/vehicles/changes)"""
+        now = datetime.utcnow()
+        written: Dict[int, List[int]] = {}
+        for event in events:
+            if event['action'] == 'upsert':
+                written.setdefault(event['version'], []).append(event['id'])
+        records = VehicleProcessingRecord.__table__
+        for version, record_ids in written.items():
+            session.execute(
+                update(records).where(records.c.id.in_(record_ids)).values(row_version=version, updated_at=now)
+            )
+        tombstones = [
+            {
+                'record_id': event['id'],
+                'environment_id': event['environment_id'] or NO_ENVIRONMENT_ROLLUP_KEY,
+                'row_version': event['version'],
+                'deleted_at': now
+            }
+            for event in events if event['action'] == 'delete'
+        ]
+        if tombstones:
+            session.execute(insert(VehicleRecordTombstone.__table__), tombstones)
+    
+    def _notify_write(self, events: List[Dict[str, Any]]):
+        """Deliver the events of a committed write to this process's listeners"""
+        if events:
+            self.change_feed.dispatch(events)
+    
+    def _dispatch_changes(self, events: List[Dict[str, Any]]):
+        environment_ids = {event['environment_id'] for event in events if event['action'] != 'resync'}
+        if any(event['action'] == 'resync' for event in events):
+            environment_ids = None
+        for listener in self.write_listeners if environment_ids != set() else ():
+            try:
+                listener(environment_ids)
+            except Exception as e:
+                logger.warning("Write listener failed: %s", e)
+        for listener in self.change_listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                logger.warning("Change listener failed: %s", e)
     
     def create_vehicle_record(
         self,
@@ -336,12 +1185,16 @@ class VehicleDatabaseManager:
                     processing_date=datetime.utcnow()
                 )
                 session.add(record)
+                session.flush()
+                self._refresh_daily_rollups(session, {get_rollup_key(record.environment_id, record.processing_date)})
+                events = self._publish_changes(session, [{'action': 'upsert', 'id': record.id, 'environment_id': environment_id}])
                 session.commit()
+                self._notify_write(events)
                 session.refresh(record)
-                print(f"Created vehicle processing record for stock #{stock_number}")
+                logger.debug("Created vehicle processing record for stock #%s", stock_number)
                 return record
         except Exception as e:
-            print(f"Error creating vehicle record: {e}")
+            logger.error("Error creating vehicle record: %s", e)
             return None
     
     def update_vehicle_record(self, record_id: int, **kwargs) -> bool:
@@ -350,35 +1203,188 @@ class VehicleDatabaseManager:
             with self.get_session() as session:
                 record = session.query(VehicleProcessingRecord).filter_by(id=record_id).first()
                 if not record:
-                    print(f"Vehicle record {record_id} not found")
+                    logger.info("Vehicle record %s not found", record_id)
                     return False
                 
+                # Store and rollup bucket before the update, in case the store or date changes
+                environment_ids = {record.environment_id}
+                rollup_keys = {get_rollup_key(record.environment_id, record.processing_date)}
+                fields = sorted(key for key in kwargs if hasattr(record, key))
+                
+                # Large text fields go to record_contents; the record keeps their ids
+                content_values = {key: kwargs.pop(key) for key in RECORD_CONTENT_FIELDS if key in kwargs}
+                if content_values:
+                    kwargs.update(store_record_contents(session, [content_values])[0])
+                
                 # Update provided fields
                 for key, value in kwargs.items():
                     if hasattr(record, key):
-                        # Handle JSON fields
-                        if key in ['starred_features', 'feature_decisions', 'ai_analysis_result', 'errors_encountered', 'media_totals_found', 'book_values_before_processing', 'book_values_after_processing']:
-                            if value is not None and not isinstance(value, str):
-                                value = json.dumps(value)
+                        # JSON fields accept Python values or JSON text (see JSONPayload)
                         setattr(record, key, value)
-                
+
+                # Keep the parsed book value rows in step with the JSON payloads
+                if 'book_values_before_processing' in kwargs or 'book_values_after_processing' in kwargs:
+                    self._sync_book_values(session, record)
+
+                session.flush()
+                rollup_keys.add(get_rollup_key(record.environment_id, record.processing_date))
+                self._refresh_daily_rollups(session, rollup_keys)
+                changes = [{'action': 'upsert', 'id': record_id, 'environment_id': record.environment_id, 'fields': fields}]
+                # Moved to another store: gone from the old store's views
+                changes += [
+                    {'action': 'delete', 'id': record_id, 'environment_id': environment_id}
+                    for environment_id in environment_ids if environment_id != record.environment_id
+                ]
+                events = self._publish_changes(session, changes)
+
                 session.commit()
-                print(f"Updated vehicle record {record_id} for stock #{record.stock_number}")
+                self._notify_write(events)
+                logger.debug("Updated vehicle record %s for stock #%s", record_id, record.stock_number)
                 return True
         except Exception as e:
-            print(f"Error updating vehicle record: {e}")
+            logger.error("Error updating vehicle record: %s", e)
             return False
     
+    def _sync_book_values(self, session: Session, record: VehicleProcessingRecord):
+        """Replace the parsed book value rows of a record from its JSON payloads"""
+        session.query(VehicleBookValue).filter(
+            VehicleBookValue.record_id == record.id
+        ).delete(synchronize_session=False)
+        session.add_all(build_book_value_rows(
+            record.id,
+            record.book_values_before_processing,
+            record.book_values_after_processing
+        ))
+
+    def delete_vehicle(self, record_id: int, environment_id: str = None) -> Optional[Dict[str, Any]]:
+        """Delete a vehicle processing record, optionally restricted to one environment"""
+        try:
+            with self.get_session() as session:
+                query = session.query(VehicleProcessingRecord).filter(VehicleProcessingRecord.id == record_id)
+                if environment_id is not None:
+                    query = query.filter(VehicleProcessingRecord.environment_id == environment_id)
+                record = query.first()
+                if not record:
+                    logger.info("Vehicle record %s not found", record_id)
+                    return None
+                
+                deleted = {
+                    'id': record.id,
+                    'stock_number': record.stock_number,
+                    'vehicle_name': record.vehicle_name,
+                    'environment_id': record.environment_id
+                }
+                rollup_key = get_rollup_key(record.environment_id, record.processing_date)
+                
+                session.query(VehicleBookValue).filter(
+                    VehicleBookValue.record_id == record.id
+                ).delete(synchronize_session=False)
+                session.delete(record)
+                session.flush()
+                self._refresh_daily_rollups(session, {rollup_key})
+                events = self._publish_changes(session, [{'action': 'delete', 'id': deleted['id'], 'environment_id': deleted['environment_id']}])
+                
+                session.commit()
+                self._notify_write(events)
+                logger.info("Deleted vehicle record %s for stock #%s", record_id, deleted['stock_number'])
+                return deleted
+        except Exception as e:
+            logger.error("Error deleting vehicle record: %s", e)
+            raise
+
+    def _refresh_daily_rollups(self, session: Session, rollup_keys: set):
+        """
+        Recompute the daily store rollups for the given (environment_id, date) buckets. The stores'
+        write versions are bumped first: their row locks make concurrent writers of a store
+        recompute one after another, each seeing the records the previous one committed, instead of
+        overwriting each other's counts or colliding on a new bucket's unique key.
+        """
+        bump_store_write_versions(session, {environment_id for environment_id, _ in filter(None, rollup_keys)})
+        for rollup_key in rollup_keys:
+            if rollup_key is None:
+                continue
+            environment_id, rollup_date = rollup_key
+            day_start = datetime.combine(rollup_date, datetime.min.time())
+            
+            record_filters = [
+                VehicleProcessingRecord.processing_date >= day_start,
+                VehicleProcessingRecord.processing_date < day_start + timedelta(days=1)
+            ]
+            if environment_id == NO_ENVIRONMENT_ROLLUP_KEY:
+                record_filters.append(VehicleProcessingRecord.environment_id.is_(None))
+            else:
+                record_filters.append(VehicleProcessingRecord.environment_id == environment_id)
+            
+            record_count = func.count(VehicleProcessingRecord.id)
+            totals = session.query(
+                record_count.label('processed'),
+                record_count.filter(VehicleProcessingRecord.processing_successful == True).label('successful'),
+                record_count.filter(VehicleProcessingRecord.description_updated == True).label('descriptions_updated'),
+                record_count.filter(VehicleProcessingRecord.no_fear_certificate == True).label('no_fear'),
+                func.coalesce(func.sum(VehicleProcessingRecord.marked_features_count), 0).label('features_marked'),
+                func.min(VehicleProcessingRecord.processing_date).label('first_processing_date'),
+                func.max(VehicleProcessingRecord.processing_date).label('last_processing_date')
+            ).filter(*record_filters).one()
+            
+            rollup = session.query(DailyStoreRollup).filter_by(
+                environment_id=environment_id, rollup_date=rollup_date
+            ).first()
+            if totals.processed:
+                if rollup is None:
+                    rollup = DailyStoreRollup(environment_id=environment_id, rollup_date=rollup_date)
+                    session.add(rollup)
+                rollup.processed_count = totals.processed
+                rollup.successful_count = totals.successful or 0
+                rollup.descriptions_updated_count = totals.descriptions_updated or 0
+                rollup.no_fear_count = totals.no_fear or 0
+                rollup.features_marked_sum = int(totals.features_marked or 0)
+                rollup.first_processing_date = totals.first_processing_date
+                rollup.last_processing_date = totals.last_processing_date
+            elif rollup is not None:
+                session.delete(rollup)
+            
+            # Book value deltas only count vehicles whose book values were fully processed
+            session.query(DailyStoreBookValueRollup).filter_by(
+                environment_id=environment_id, rollup_date=rollup_date
+            ).delete(synchronize_session=False)
+            source_totals = session.query(
+                VehicleBookValue.source,
+                func.count(VehicleBookValue.id),
+                func.sum(VehicleBookValue.difference),
+                func.sum(case((VehicleBookValue.is_primary == True, VehicleBookValue.difference), else_=0))
+            ).join(
+                VehicleProcessingRecord, VehicleBookValue.record_id == VehicleProcessingRecord.id
+            ).filter(
+                *record_filters,
+                VehicleProcessingRecord.book_values_processed == True,
+                VehicleProcessingRecord.book_values_before_processing.isnot(None),
+                VehicleProcessingRecord.book_values_after_processing.isnot(None)
+            ).group_by(VehicleBookValue.source).all()
+            session.add_all([
+                DailyStoreBookValueRollup(
+                    environment_id=environment_id,
+                    rollup_date=rollup_date,
+                    source=source,
+                    record_count=count,
+                    difference_sum=difference or 0,
+                    primary_difference_sum=primary_difference or 0
+                )
+                for source, count, difference, primary_difference in source_totals
+            ])
+
     def get_vehicle_record_by_stock(self, stock_number: str) -> Optional[VehicleProcessingRecord]:
         """Get the most recent processing record for a stock number"""
         try:
             with self.get_session() as session:
-                record = session.query(VehicleProcessingRecord).filter_by(
+                # Returned detached, so load the deferred columns and compressed contents now
+                record = session.query(VehicleProcessingRecord).options(
+                    *record_detail_options()
+                ).filter_by(
                     stock_number=stock_number
                 ).order_by(VehicleProcessingRecord.processing_date.desc()).first()
                 return record
         except Exception as e:
-            print(f"Error getting vehicle record: {e}")
+            logger.error("Error getting vehicle record: %s", e)
             return None
     
     def stock_number_exists(self, stock_number: str) -> bool:
@@ -390,14 +1396,15 @@ class VehicleDatabaseManager:
                 ).first()
                 return record is not None
         except Exception as e:
-            print(f"Error checking stock number existence: {e}")
+            logger.error("Error checking stock number existence: %s", e)
             return False
     
     def get_all_vehicle_records(self, limit: int = 100, environment_id: str = None) -> List[VehicleProcessingRecord]:
         """Get all vehicle processing records (most recent first)"""
         try:
             with self.get_session() as session:
-                query = session.query(VehicleProcessingRecord)
+                # Returned detached, so load the deferred columns and compressed contents now
+                query = session.query(VehicleProcessingRecord).options(*record_detail_options())
                 
                 # Filter by environment_id if provided
                 if environment_id:
@@ -408,7 +1415,7 @@ class VehicleDatabaseManager:
                 ).limit(limit).all()
                 return records
         except Exception as e:
-            print(f"Error getting vehicle records: {e}")
+            logger.error("Error getting vehicle records: %s", e)
             return []
     
     def get_records_by_environment(self, environment_id: str, limit: int = 100) -> List[VehicleProcessingRecord]:
@@ -422,7 +1429,7 @@ class VehicleDatabaseManager:
                 result = session.query(VehicleProcessingRecord.environment_id).distinct().all()
                 return [env_id[0] for env_id in result if env_id[0] is not None]
         except Exception as e:
-            print(f"Error getting environment IDs: {e}")
+            logger.error("Error getting environment IDs: %s", e)
             return []
     
     def log_processing_summary(
@@ -440,64 +1447,251 @@ class VehicleDatabaseManager:
         processing_successful: bool = True,
         errors: List[str] = None,
         processing_duration: str = None,
-        session_id: str = None
+        session_id: str = None,
+        environment_id: str = None
     ) -> Optional[int]:
-        """Log a complete processing summary to database"""
+        """
+        Log a complete processing summary to database. The full record is written with a single
+        INSERT ... RETURNING id, in one transaction with its daily rollup refresh. Every call adds
+        a new record; use upsert_processing_summary to update the vehicle's record in its store and
+        processing session instead.
+        """
         try:
-            # Create the record
-            record = self.create_vehicle_record(
+            values = build_processing_summary_values(
                 stock_number=stock_number,
                 vin=vin,
-                processing_session_id=session_id,
                 odometer=odometer,
-                days_in_inventory=days_in_inventory
+                days_in_inventory=days_in_inventory,
+                starred_features=starred_features,
+                description_data=description_data,
+                no_fear_certificate=no_fear_certificate,
+                no_fear_text=no_fear_text,
+                ai_analysis=ai_analysis,
+                screenshot_path=screenshot_path,
+                processing_successful=processing_successful,
+                errors=errors,
+                processing_duration=processing_duration,
+                session_id=session_id,
+                environment_id=environment_id
             )
             
-            if not record:
-                return None
-            
-            # Update with detailed information
-            update_data = {
-                'processing_successful': processing_successful,
-                'processing_duration': processing_duration,
-                'screenshot_path': screenshot_path,
-                'no_fear_certificate': no_fear_certificate,
-                'no_fear_certificate_text': no_fear_text,
-            }
-            
-            # Handle starred features
-            if starred_features:
-                update_data['starred_features'] = starred_features
-                update_data['marked_features_count'] = len(starred_features)
-            
-            # Handle description data
-            if description_data:
-                update_data.update({
-                    'original_description': description_data.get('original'),
-                    'ai_generated_description': description_data.get('ai_generated'),
-                    'final_description': description_data.get('final'),
-                    'description_updated': description_data.get('updated', False)
-                })
-            
-            # Handle AI analysis
-            if ai_analysis:
-                update_data['ai_analysis_result'] = ai_analysis
+            record_id, _ = self._write_summary_rows([values])[0]
+            logger.debug("Processing summary logged for stock #%s", stock_number)
+            return record_id
+                
+        except Exception as e:
+            logger.error("Error logging processing summary: %s", e)
+            return None
+    
+    def upsert_processing_summary(
+        self,
+        stock_number: str,
+        vin: str = None,
+        odometer: str = None,
+        days_in_inventory: str = None,
+        starred_features: List[Dict] = None,
+        description_data: Dict = None,
+        no_fear_certificate: bool = False,
+        no_fear_text: str = None,
+        ai_analysis: Dict = None,
+        screenshot_path: str = None,
+        processing_successful: bool = True,
+        errors: List[str] = None,
+        processing_duration: str = None,
+        session_id: str = None,
+        environment_id: str = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Insert the processing summary of a vehicle, or merge it into the vehicle's record within
+        the same store and processing session, keyed on (environment_id, stock_number,
+        processing_session_id). Replaces the stock_number_exists / get_vehicle_record_by_stock
+        check-then-write pattern and stays correct when two workers process the same store. An
+        update only overwrites the columns this summary has values for (see SUMMARY_UPDATE_COLUMNS)
+        and keeps the record's original processing_date, so its rollup bucket and list position do
+        not move.
+        
+        Returns {'id': record id, 'inserted': True if created, False if updated}, or None on error.
+        """
+        try:
+            values = build_processing_summary_values(
+                stock_number=stock_number,
+                vin=vin,
+                odometer=odometer,
+                days_in_inventory=days_in_inventory,
+                starred_features=starred_features,
+                description_data=description_data,
+                no_fear_certificate=no_fear_certificate,
+                no_fear_text=no_fear_text,
+                ai_analysis=ai_analysis,
+                screenshot_path=screenshot_path,
+                processing_successful=processing_successful,
+                errors=errors,
+                processing_duration=processing_duration,
+                session_id=session_id,
+                environment_id=environment_id
+            )
             
-            # Handle errors
-            if errors:
-                update_data['errors_encountered'] = errors
+            record_id, inserted = self._write_summary_rows([values], upsert=True)[0]
             
-            # Update the record
-            if self.update_vehicle_record(record.id, **update_data):
-                print(f"Processing summary logged for stock #{stock_number}")
-                return record.id
-            else:
-                return None
-                
+            logger.debug("Processing summary %s for stock #%s", "inserted" if inserted else "updated", stock_number)
+            return {'id': record_id, 'inserted': inserted}
+        
         except Exception as e:
-            print(f"Error logging processing summary: {e}")
+            logger.error("Error upserting processing summary: %s", e)
             return None
     
+    def log_processing_summaries(self, summaries: List[Dict[str, Any]], chunk_size: int = None, upsert: bool = False) -> Dict[str, Any]:
+        """
+        Log many processing summaries, each given as the keyword arguments of log_processing_summary.
+        Every chunk is written with executemany statements and one commit. Like log_processing_summary,
+        every summary adds a record; with upsert=True, summaries are merged into the record of their
+        (environment_id, stock_number, processing_session_id) key instead, as upsert_processing_summary
+        does, so resubmitting a batch does not duplicate it. A chunk the database rejects is retried
+        row by row so only the failing summaries are reported.
+        
+        Returns {'ids': [record id per summary], 'created': [True if a new record, False if merged
+        into an existing one, per summary], 'inserted': count created, 'updated': count merged,
+        'errors': [{'index', 'error'}]}. The id and created flag are None for summaries listed in
+        'errors'.
+        """
+        chunk_size = max(1, chunk_size or DEFAULT_INGEST_CHUNK_SIZE)
+        written: List[Optional[tuple]] = [None] * len(summaries)
+        errors = []
+        
+        rows = []
+        for index, summary in enumerate(summaries):
+            try:
+                rows.append((index, build_processing_summary_values(**summary)))
+            except Exception as e:
+                errors.append({'index': index, 'error': str(e)})
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                results = self._write_summary_rows([values for _, values in chunk], upsert=upsert)
+                for (index, _), result in zip(chunk, results):
+                    written[index] = result
+                continue
+            except Exception as e:
+                if len(chunk) == 1:
+                    errors.append({'index': chunk[0][0], 'error': str(getattr(e, 'orig', e))})
+                    continue
+                logger.warning("Ingest chunk of %d summaries failed, retrying row by row: %s", len(chunk), e)
+            
+            for index, values in chunk:
+                try:
+                    written[index] = self._write_summary_rows([values], upsert=upsert)[0]
+                except Exception as e:
+                    errors.append({'index': index, 'error': str(getattr(e, 'orig', e))})
+        
+        errors.sort(key=lambda error: error['index'])
+        created = [result[1] if result else None for result in written]
+        inserted = sum(1 for flag in created if flag is True)
+        updated = sum(1 for flag in created if flag is False)
+        logger.info("Batch ingest: %d of %d summaries inserted, %d updated, %d failed",
+                    inserted, len(summaries), updated, len(errors))
+        return {
+            'ids': [result[0] if result else None for result in written],
+            'created': created,
+            'inserted': inserted,
+            'updated': updated,
+            'errors': errors
+        }
+    
+    def _write_summary_rows(self, rows: List[Dict[str, Any]], upsert: bool = False) -> List[tuple]:
+        """
+        Insert summary rows (or upsert them on their key) and refresh their rollups, in one
+        transaction. Returns (record id, inserted) per row, in order.
+        """
+        table = VehicleProcessingRecord.__table__
+        with self.get_session() as session:
+            rows = store_record_contents(session, rows)
+            if upsert:
+                written = self._write_keyed_summary_rows(session, rows)
+            else:
+                statement = insert(table).returning(
+                    table.c.id, table.c.environment_id, table.c.processing_date, sort_by_parameter_order=True
+                )
+                written = [
+                    (record_id, True, environment_id, processing_date)
+                    for record_id, environment_id, processing_date in session.execute(statement, rows)
+                ]
+            self._refresh_daily_rollups(session, {
+                get_rollup_key(environment_id, processing_date) for _, _, environment_id, processing_date in written
+            })
+            events = self._publish_changes(session, [
+                {'action': 'upsert', 'id': record_id, 'environment_id': environment_id}
+                for record_id, _, environment_id, _ in written
+            ])
+            session.commit()
+            self._notify_write(events)
+            return [(record_id, inserted) for record_id, inserted, _, _ in written]
+    
+    def _write_keyed_summary_rows(self, session: Session, rows: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Upsert summary rows on their key. No unique index backs it (see UPSERT_KEY_COLUMNS), so the
+        keys' stores are locked for the rest of the transaction by bumping their write versions,
+        then the existing records are looked up, merged into and the rest inserted. Where records
+        already share a key, the newest one is updated. A key repeated within `rows` updates the
+        record its first row inserted.
+        Returns (record id, inserted, environment_id, processing_date) per row, in order.
+        """
+        table = VehicleProcessingRecord.__table__
+        key_columns = [table.c[name] for name in UPSERT_KEY_COLUMNS]
+        keys = [tuple(row[name] for name in UPSERT_KEY_COLUMNS) for row in rows]
+        lookup_keys = sorted({key for key in keys if None not in key})
+        
+        existing = {}
+        if lookup_keys:
+            # Upserts into the same stores queue here (a row lock on PostgreSQL, the write lock on
+            # SQLite), so the lookup below sees every record a concurrent upsert committed
+            bump_store_write_versions(session, {key[0] for key in lookup_keys})
+            for row in session.execute(
+                select(table.c.id, table.c.processing_date, *key_columns)
+                .where(tuple_(*key_columns).in_(lookup_keys))
+                .order_by(table.c.id)
+            ):
+                existing[tuple(row[2:])] = (row.id, row.processing_date)
+        
+        insert_indexes, update_indexes, first_insert = [], [], {}
+        for index, key in enumerate(keys):
+            if key in existing or key in first_insert:
+                update_indexes.append(index)
+            else:
+                insert_indexes.append(index)
+                if None not in key:
+                    first_insert[key] = index
+        
+        results: List[Optional[tuple]] = [None] * len(rows)
+        if insert_indexes:
+            statement = insert(table).returning(
+                table.c.id, table.c.environment_id, table.c.processing_date, sort_by_parameter_order=True
+            )
+            inserted = session.execute(statement, [rows[index] for index in insert_indexes]).all()
+            for index, row in zip(insert_indexes, inserted):
+                results[index] = (row.id, True, row.environment_id, row.processing_date)
+                if keys[index] in first_insert:
+                    existing.setdefault(keys[index], (row.id, row.processing_date))
+        
+        if update_indexes:
+            # processing_date in the WHERE clause limits each update to the record's partition
+            updates = []
+            for index in update_indexes:
+                record_id, processing_date = existing[keys[index]]
+                updates.append(dict(
+                    {f'new_{name}': rows[index][name] for name in SUMMARY_UPDATE_COLUMNS},
+                    record_id=record_id, record_processing_date=processing_date
+                ))
+                results[index] = (record_id, False, rows[index]['environment_id'], processing_date)
+            session.execute(
+                update(table).where(
+                    table.c.id == bindparam('record_id'),
+                    table.c.processing_date == bindparam('record_processing_date')
+                ).values(build_summary_merge_values()),
+                updates
+            )
+        return results
+    
     def generate_processing_report(self, days: int = 7, environment_id: str = None) -> Dict[str, Any]:
         """Generate a processing report for the last N days"""
         try:
@@ -534,7 +1728,7 @@ class VehicleDatabaseManager:
                     'recent_records': [r.to_dict() for r in records[:10]]
                 }
         except Exception as e:
-            print(f"Error generating processing report: {e}")
+            logger.error("Error generating processing report: %s", e)
             return {}
     
     def print_recent_activity(self, limit: int = 10):
@@ -650,6 +1844,101 @@ def migrate_users_to_role_system(db_manager):
         raise
 
 
+def backfill_vehicle_book_values(db_manager, batch_size: int = 500) -> int:
+    """
+    Populate vehicle_book_values from the JSON book value columns of existing records.
+    Safe to re-run: each record's parsed rows are replaced. Returns the number of records processed.
+    """
+    print("Starting book values backfill...")
+    processed = 0
+    last_id = 0
+
+    try:
+        while True:
+            with db_manager.get_session() as session:
+                records = session.query(VehicleProcessingRecord).options(
+                    load_only(
+                        VehicleProcessingRecord.id,
+                        VehicleProcessingRecord.book_values_before_processing,
+                        VehicleProcessingRecord.book_values_after_processing
+                    )
+                ).filter(
+                    VehicleProcessingRecord.id > last_id,
+                    (VehicleProcessingRecord.book_values_before_processing.isnot(None)) |
+                    (VehicleProcessingRecord.book_values_after_processing.isnot(None))
+                ).order_by(VehicleProcessingRecord.id).limit(batch_size).all()
+
+                if not records:
+                    break
+
+                record_ids = [record.id for record in records]
+                session.query(VehicleBookValue).filter(
+                    VehicleBookValue.record_id.in_(record_ids)
+                ).delete(synchronize_session=False)
+
+                for record in records:
+                    session.add_all(build_book_value_rows(
+                        record.id,
+                        record.book_values_before_processing,
+                        record.book_values_after_processing
+                    ))
+
+                session.commit()
+                processed += len(records)
+                last_id = record_ids[-1]
+                print(f"Backfilled book values for {processed} records...")
+
+        print(f"Book values backfill complete: {processed} records processed.")
+        return processed
+
+    except Exception as e:
+        print(f"Error during book values backfill: {e}")
+        raise
+
+
+def rebuild_daily_store_rollups(db_manager, start_date: date = None) -> int:
+    """
+    Rebuild daily store rollups from the raw vehicle processing records.
+    Run after backfill_vehicle_book_values on existing data. Returns the number of buckets rebuilt.
+    """
+    print("Starting daily store rollup rebuild...")
+    
+    try:
+        with db_manager.get_session() as session:
+            query = session.query(
+                VehicleProcessingRecord.environment_id,
+                VehicleProcessingRecord.processing_date
+            )
+            if start_date:
+                query = query.filter(VehicleProcessingRecord.processing_date >= datetime.combine(start_date, datetime.min.time()))
+            rollup_keys = {get_rollup_key(environment_id, processing_date) for environment_id, processing_date in query}
+            
+            # Drop buckets that no longer have any records
+            stale_query = session.query(DailyStoreRollup.environment_id, DailyStoreRollup.rollup_date)
+            if start_date:
+                stale_query = stale_query.filter(DailyStoreRollup.rollup_date >= start_date)
+            rollup_keys.update(tuple(key) for key in stale_query)
+            rollup_keys.discard(None)
+        
+        rebuilt = 0
+        for rollup_key in sorted(rollup_keys):
+            with db_manager.get_session() as session:
+                db_manager._refresh_daily_rollups(session, {rollup_key})
+                session.commit()
+            rebuilt += 1
+            if rebuilt % 100 == 0:
+                print(f"Rebuilt {rebuilt} of {len(rollup_keys)} daily rollups...")
+        
+        # Each refresh bumped its store's write version, invalidating the HTTP validators of the
+        # rebuilt statistics
+        print(f"Daily store rollup rebuild complete: {rebuilt} buckets rebuilt.")
+        return rebuilt
+    
+    except Exception as e:
+        print(f"Error during daily store rollup rebuild: {e}")
+        raise
+
+
 def create_super_admin(db_manager, username: str = "superadmin", password: str = "admin123"):
     """
     Create the first super admin user. This should be called during initial setup.
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Database Connection Pool Module
+Environment-driven pool configuration and instrumentation for the SQLAlchemy engine.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (milliseconds) of the checkout wait time histogram buckets
+WAIT_TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def build_pool_config_from_env() -> Dict[str, Any]:
+    """
+    Build connection pool settings from environment variables:
+    - DB_POOL_SIZE (default 5): connections kept open in the pool
+    - DB_MAX_OVERFLOW (default 10): extra connections opened under load
+    - DB_POOL_TIMEOUT (default 30): seconds to wait for a free connection
+    - DB_POOL_RECYCLE (default 1800): seconds before a connection is replaced, -1 to disable
+    - DB_POOL_PRE_PING (default true): test connections on checkout to drop stale ones
+    """
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', True),
+    }
+
+
+def build_engine_options(db_url: str, pool_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate pool settings into create_engine() keyword arguments for the given URL"""
+    options = {
+        'pool_pre_ping': pool_config['pool_pre_ping'],
+        'pool_recycle': pool_config['pool_recycle'],
+    }
+
+    # In-memory SQLite uses a per-thread singleton pool that cannot be sized
+    if db_url.startswith('sqlite') and (':memory:' in db_url or db_url.rstrip('/') in ('sqlite:', 'sqlite+pysqlite:')):
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': pool_config['pool_size'],
+        'max_overflow': pool_config['max_overflow'],
+        'pool_timeout': pool_config['pool_timeout'],
+    })
+    return options
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each connect() took, and its timeouts, to its PoolMetrics"""
+
+    # Set by PoolMetrics.attach; carried over when engine.dispose() recreates the pool
+    metrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class PoolMetrics:
+    """
+    Connection pool counters fed by SQLAlchemy pool events, plus the checkout wait time histogram
+    and timeouts reported by InstrumentedQueuePool. The wait is the time connect() took to hand out
+    a connection, including opening a new one and the pre-ping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_TIME_BUCKETS_MS) + 1)
+
+    def attach(self, engine):
+        """Register pool event listeners on an engine"""
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.metrics = self
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, wait_ms: float):
+        """Count one checkout that waited wait_ms for its connection"""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for index, upper_bound in enumerate(WAIT_TIME_BUCKETS_MS):
+                if wait_ms <= upper_bound:
+                    self.wait_buckets[index] += 1
+                    return
+            self.wait_buckets[-1] += 1
+
+    def record_timeout(self):
+        """Count one checkout that gave up after the pool timeout"""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        """Current pool occupancy plus cumulative counters"""
+        status = {'pool_class': type(pool).__name__}
+        for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+            method = getattr(pool, name, None)
+            if callable(method):
+                status[name] = method()
+
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in WAIT_TIME_BUCKETS_MS] + [f"gt_{WAIT_TIME_BUCKETS_MS[-1]}ms"]
+            status.update({
+                'connections_opened': self.connections_opened,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'wait_time_ms': {
+                    'count': self.wait_count,
+                    'mean': round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0.0,
+                    'max': round(self.wait_max_ms, 3),
+                    'histogram': dict(zip(labels, self.wait_buckets)),
+                },
+            })
+        return status
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Columnar Records Export Script
+Writes vehicle processing records to a Parquet or Arrow file with typed columns (see
+columnar_export.py). Requires the pyarrow package.
+
+Usage:
+    python export_records.py vehicles.parquet
+    python export_records.py vehicles-2025-10.arrow --store store-001 --start-date 2025-10-01 --end-date 2025-10-31
+"""
+
+import sys
+import argparse
+from datetime import datetime, timedelta
+from database import get_database_manager
+from columnar_export import DEFAULT_BATCH_SIZE, export_records
+
+def parse_date(value: str) -> datetime:
+    """argparse type for YYYY-MM-DD dates"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', use YYYY-MM-DD")
+
+def main():
+    """Main export function"""
+    parser = argparse.ArgumentParser(description="Export vehicle processing records to Parquet or Arrow")
+    parser.add_argument("output", help="File to write (.parquet or .arrow)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], help="Output format (default: from the file extension)")
+    parser.add_argument("--store", action="append", dest="stores", help="Only this store's records (repeatable)")
+    parser.add_argument("--start-date", type=parse_date, help="First processing day (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=parse_date, help="Last processing day, included (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records per row group / record batch")
+    args = parser.parse_args()
+
+    export_format = args.format or ("arrow" if args.output.endswith((".arrow", ".feather")) else "parquet")
+
+    print("=== Records Export ===")
+
+    try:
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        print(f"📦 Writing {export_format} to {args.output}...")
+        written = export_records(
+            db_manager, args.output, export_format=export_format, environment_ids=args.stores,
+            start_date=args.start_date,
+            end_date=args.end_date + timedelta(days=1) if args.end_date else None,
+            batch_size=args.batch_size
+        )
+        print(f"\n✅ Exported {written} records to {args.output}")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Export cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during export: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Record Partition Maintenance Script
+Lists, creates and archives the monthly partitions of vehicle_processing_records (PostgreSQL).
+
+Usage:
+    python manage_partitions.py list
+    python manage_partitions.py ensure --months-ahead 6
+    python manage_partitions.py archive --older-than-months 24 --dry-run
+"""
+
+import sys
+import argparse
+from datetime import datetime
+from database import get_database_manager
+from record_partitions import (
+    DEFAULT_MONTHS_AHEAD, DEFAULT_ARCHIVE_SCHEMA, is_partitioned, list_partitions, ensure_partitions,
+    archive_partitions, month_start, add_months
+)
+
+def main():
+    """Main partition maintenance function"""
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of vehicle processing records")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List partitions with their estimated row counts")
+    ensure_parser = subparsers.add_parser("ensure", help="Create partitions for the coming months")
+    ensure_parser.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD, help="Months after the current one")
+    archive_parser = subparsers.add_parser("archive", help="Detach partitions of old months")
+    archive_parser.add_argument("--older-than-months", type=int, required=True, help="Archive months before this many months ago")
+    archive_parser.add_argument("--schema", default=DEFAULT_ARCHIVE_SCHEMA, help="Schema the detached partitions are moved to")
+    archive_parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them")
+    archive_parser.add_argument("--dry-run", action="store_true", help="Only list the partitions that would be archived")
+    args = parser.parse_args()
+
+    print("=== Record Partition Maintenance ===")
+
+    try:
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        with db_manager.engine.connect() as connection:
+            if not is_partitioned(connection):
+                print("ℹ️  vehicle_processing_records is not partitioned (PostgreSQL only, run 'alembic upgrade head')")
+                return
+
+        if args.command == "list":
+            with db_manager.engine.connect() as connection:
+                for partition in list_partitions(connection):
+                    print(f"  {partition['name']:<45} ~{partition['estimated_rows']:,} rows")
+
+        elif args.command == "ensure":
+            created = ensure_partitions(db_manager, months_ahead=args.months_ahead)
+            print(f"\n✅ Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+
+        elif args.command == "archive":
+            before_month = add_months(month_start(datetime.utcnow()), -args.older_than_months)
+            archived = archive_partitions(
+                db_manager, before_month, archive_schema=args.schema, drop=args.drop, dry_run=args.dry_run
+            )
+            action = "Would archive" if args.dry_run else ("Dropped" if args.drop else f"Archived to schema '{args.schema}'")
+            print(f"\n✅ {action} {len(archived)} partitions before {before_month.isoformat()}")
+            for name in archived:
+                print(f"  {name}")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Partition maintenance cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during partition maintenance: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
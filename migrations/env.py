@@ -0,0 +1,78 @@
+"""Alembic environment for the dashboard database schema."""
+
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine
+from sqlalchemy import pool
+
+from alembic import context
+
+from database import Base, build_postgres_url_from_env
+from record_partitions import is_partition_name
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Model metadata for 'autogenerate' support
+target_metadata = Base.metadata
+
+
+def get_database_url() -> str:
+    """Database URL from `-x db_url=...`, falling back to the POSTGRES_* environment variables"""
+    url = context.get_x_argument(as_dictionary=True).get('db_url')
+    return url or build_postgres_url_from_env()
+
+
+def build_include_object(dialect_name: str):
+    """
+    Skip schema items restricted to other dialects with .ddl_if() during autogenerate, and the
+    monthly partitions of vehicle_processing_records, which are managed by record_partitions.py
+    """
+    def include_object(obj, name, type_, reflected, compare_to):
+        if type_ == 'table' and reflected and compare_to is None and is_partition_name(name):
+            return False
+        ddl_if = getattr(obj, '_ddl_if', None)
+        if ddl_if is not None and ddl_if.dialect:
+            dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+            return dialect_name in dialects
+        return True
+    return include_object
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode, emitting SQL to the script output."""
+    context.configure(
+        url=get_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode against a live connection."""
+    url = get_database_url()
+    connectable = create_engine(url, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=build_include_object(connection.dialect.name),
+            # SQLite cannot ALTER most constraints in place
+            render_as_batch=url.startswith('sqlite'),
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,162 @@
+"""baseline schema
+
+Schema as created by Base.metadata.create_all() before migrations were introduced.
+Every statement is IF NOT EXISTS, so existing databases can run `alembic upgrade head`
+without being stamped first.
+
+Revision ID: 5c0e8a3f1b2d
+Revises:
+Create Date: 2025-09-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e8a3f1b2d'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_ROLE_VALUES = ('SUPER_ADMIN', 'ADMIN', 'USER')
+
+
+def _user_role_type():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Created explicitly below so an existing type is not re-created
+        return postgresql.ENUM(*USER_ROLE_VALUES, name='userrole', create_type=False)
+    return sa.Enum(*USER_ROLE_VALUES, name='userrole')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        postgresql.ENUM(*USER_ROLE_VALUES, name='userrole').create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password_hash', sa.String(length=128), nullable=False),
+        sa.Column('role', _user_role_type(), nullable=False),
+        sa.Column('store_ids', sa.Text(), nullable=True),
+        sa.Column('store_id', sa.String(length=100), nullable=True),
+        sa.Column('created_by_id', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_users_username', 'users', ['username'], unique=True, if_not_exists=True)
+    op.create_index('ix_users_role', 'users', ['role'], if_not_exists=True)
+    op.create_index('ix_users_store_id', 'users', ['store_id'], if_not_exists=True)
+    op.create_index('ix_users_created_by_id', 'users', ['created_by_id'], if_not_exists=True)
+
+    op.create_table(
+        'vehicle_processing_records',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('stock_number', sa.String(length=50), nullable=False),
+        sa.Column('vin', sa.String(length=17), nullable=True),
+        sa.Column('vehicle_name', sa.String(length=200), nullable=True),
+        sa.Column('environment_id', sa.String(length=100), nullable=True),
+        sa.Column('processing_date', sa.DateTime(), nullable=False),
+        sa.Column('processing_session_id', sa.String(length=100), nullable=True),
+        sa.Column('odometer', sa.String(length=20), nullable=True),
+        sa.Column('days_in_inventory', sa.String(length=10), nullable=True),
+        sa.Column('original_description', sa.Text(), nullable=True),
+        sa.Column('ai_generated_description', sa.Text(), nullable=True),
+        sa.Column('final_description', sa.Text(), nullable=True),
+        sa.Column('description_updated', sa.Boolean(), nullable=True),
+        sa.Column('starred_features', sa.Text(), nullable=True),
+        sa.Column('marked_features_count', sa.Integer(), nullable=True),
+        sa.Column('feature_decisions', sa.Text(), nullable=True),
+        sa.Column('no_fear_certificate', sa.Boolean(), nullable=True),
+        sa.Column('no_fear_certificate_text', sa.Text(), nullable=True),
+        sa.Column('ai_analysis_result', sa.Text(), nullable=True),
+        sa.Column('screenshot_path', sa.String(length=500), nullable=True),
+        sa.Column('processing_status', sa.String(length=20), nullable=True),
+        sa.Column('processing_successful', sa.Boolean(), nullable=True),
+        sa.Column('errors_encountered', sa.Text(), nullable=True),
+        sa.Column('processing_duration', sa.String(length=20), nullable=True),
+        sa.Column('no_build_data_found', sa.Boolean(), nullable=True),
+        sa.Column('book_values_processed', sa.Boolean(), nullable=True),
+        sa.Column('book_values_before_processing', sa.Text(), nullable=True),
+        sa.Column('book_values_after_processing', sa.Text(), nullable=True),
+        sa.Column('media_tab_processed', sa.Boolean(), nullable=True),
+        sa.Column('media_totals_found', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_vehicle_processing_records_stock_number', 'vehicle_processing_records', ['stock_number'], if_not_exists=True)
+    op.create_index('ix_vehicle_processing_records_vin', 'vehicle_processing_records', ['vin'], if_not_exists=True)
+    op.create_index('ix_vehicle_processing_records_vehicle_name', 'vehicle_processing_records', ['vehicle_name'], if_not_exists=True)
+    op.create_index('ix_vehicle_processing_records_environment_id', 'vehicle_processing_records', ['environment_id'], if_not_exists=True)
+
+    op.create_table(
+        'vehicle_book_values',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('before_value', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('after_value', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('difference', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('is_primary', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['record_id'], ['vehicle_processing_records.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('record_id', 'source', name='uq_vehicle_book_values_record_source'),
+        if_not_exists=True
+    )
+    op.create_index('ix_vehicle_book_values_record_id', 'vehicle_book_values', ['record_id'], if_not_exists=True)
+    op.create_index('ix_vehicle_book_values_source', 'vehicle_book_values', ['source'], if_not_exists=True)
+
+    op.create_table(
+        'daily_store_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('environment_id', sa.String(length=100), nullable=False),
+        sa.Column('rollup_date', sa.Date(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('successful_count', sa.Integer(), nullable=False),
+        sa.Column('descriptions_updated_count', sa.Integer(), nullable=False),
+        sa.Column('no_fear_count', sa.Integer(), nullable=False),
+        sa.Column('features_marked_sum', sa.Integer(), nullable=False),
+        sa.Column('first_processing_date', sa.DateTime(), nullable=True),
+        sa.Column('last_processing_date', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('environment_id', 'rollup_date', name='uq_daily_store_rollups_store_date'),
+        if_not_exists=True
+    )
+    op.create_index('ix_daily_store_rollups_environment_id', 'daily_store_rollups', ['environment_id'], if_not_exists=True)
+    op.create_index('ix_daily_store_rollups_rollup_date', 'daily_store_rollups', ['rollup_date'], if_not_exists=True)
+
+    op.create_table(
+        'daily_store_book_value_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('environment_id', sa.String(length=100), nullable=False),
+        sa.Column('rollup_date', sa.Date(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('record_count', sa.Integer(), nullable=False),
+        sa.Column('difference_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('primary_difference_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('environment_id', 'rollup_date', 'source', name='uq_daily_store_book_value_rollups_store_date_source'),
+        if_not_exists=True
+    )
+    op.create_index('ix_daily_store_book_value_rollups_environment_id', 'daily_store_book_value_rollups', ['environment_id'], if_not_exists=True)
+    op.create_index('ix_daily_store_book_value_rollups_rollup_date', 'daily_store_book_value_rollups', ['rollup_date'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_store_book_value_rollups')
+    op.drop_table('daily_store_rollups')
+    op.drop_table('vehicle_book_values')
+    op.drop_table('vehicle_processing_records')
+    op.drop_table('users')
+    if op.get_bind().dialect.name == 'postgresql':
+        postgresql.ENUM(name='userrole').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,80 @@
+"""dashboard query indexes
+
+Composite and partial indexes matching the dashboard's query shapes:
+environment_id IN (...) plus a processing_date range, ordered by processing_date DESC, id DESC.
+On PostgreSQL the indexes are built CONCURRENTLY so writers are not blocked.
+
+Revision ID: 9b47d2e61c80
+Revises: 5c0e8a3f1b2d
+Create Date: 2025-09-15 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b47d2e61c80'
+down_revision: Union[str, Sequence[str], None] = '5c0e8a3f1b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+BOOK_VALUES_PROCESSED = sa.text('book_values_processed = true')
+
+
+def _index_options() -> dict:
+    if op.get_bind().dialect.name == 'postgresql':
+        return {'postgresql_concurrently': True}
+    return {}
+
+
+def _partial_index_options() -> dict:
+    options = _index_options()
+    options['postgresql_where'] = BOOK_VALUES_PROCESSED
+    options['sqlite_where'] = BOOK_VALUES_PROCESSED
+    return options
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vehicle_processing_records_env_date_id', TABLE,
+            ['environment_id', sa.text('processing_date DESC'), sa.text('id DESC')],
+            if_not_exists=True, **_index_options()
+        )
+        op.create_index(
+            'ix_vehicle_processing_records_processing_date_id', TABLE,
+            ['processing_date', 'id'],
+            if_not_exists=True, **_index_options()
+        )
+        op.create_index(
+            'ix_vehicle_processing_records_book_values_env_date', TABLE,
+            ['environment_id', 'processing_date'],
+            if_not_exists=True, **_partial_index_options()
+        )
+        op.create_index(
+            'ix_vehicle_processing_records_book_values_date', TABLE,
+            ['processing_date'],
+            if_not_exists=True, **_partial_index_options()
+        )
+        # Superseded by the leading column of the composite index
+        op.drop_index('ix_vehicle_processing_records_environment_id', table_name=TABLE, if_exists=True, **_index_options())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vehicle_processing_records_environment_id', TABLE,
+            ['environment_id'],
+            if_not_exists=True, **_index_options()
+        )
+        op.drop_index('ix_vehicle_processing_records_book_values_date', table_name=TABLE, if_exists=True, **_index_options())
+        op.drop_index('ix_vehicle_processing_records_book_values_env_date', table_name=TABLE, if_exists=True, **_index_options())
+        op.drop_index('ix_vehicle_processing_records_processing_date_id', table_name=TABLE, if_exists=True, **_index_options())
+        op.drop_index('ix_vehicle_processing_records_env_date_id', table_name=TABLE, if_exists=True, **_index_options())
@@ -0,0 +1,138 @@
+"""partition records by month
+
+PostgreSQL only: rebuilds vehicle_processing_records as a table range-partitioned by
+processing_date, with one partition per month from the oldest record through three months
+ahead plus a default partition. The primary key becomes (id, processing_date), and the
+vehicle_book_values foreign key is dropped, since a unique index on a partitioned table must
+include the partition key. A unique upsert key index left by an earlier version of e7a2c4b9f031
+becomes the plain lookup index.
+
+Rows are copied into the new table and every index is rebuilt, under an exclusive lock: schedule
+it for a maintenance window. SQLite databases are left as they are.
+
+Revision ID: a5c91e3d7f48
+Revises: f3b8d1e6a027
+Create Date: 2025-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c91e3d7f48'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d1e6a027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+UPSERT_LOOKUP_INDEX = 'ix_vehicle_processing_records_env_stock_session'
+MONTHS_AHEAD = 3
+
+# Runs server side so it also works with `alembic upgrade --sql`
+UPGRADE_SQL = f"""
+DO $$
+DECLARE
+    index_definitions text[];
+    index_definition text;
+    id_sequence text := pg_get_serial_sequence('{TABLE}', 'id');
+    book_value_fk text;
+    partition_month date;
+    last_month date := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '{TABLE}'::regclass) THEN
+        RETURN;
+    END IF;
+
+    -- Secondary indexes are recreated on the partitioned table; unique ones cannot be
+    index_definitions := ARRAY(
+        SELECT pg_get_indexdef(indexrelid) FROM pg_index
+        WHERE indrelid = '{TABLE}'::regclass AND NOT indisunique
+    );
+
+    FOR book_value_fk IN
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = 'vehicle_book_values'::regclass AND confrelid = '{TABLE}'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE vehicle_book_values DROP CONSTRAINT %I', book_value_fk);
+    END LOOP;
+
+    -- Keep the id sequence when the old table is dropped
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', id_sequence);
+    ALTER TABLE {TABLE} RENAME TO {TABLE}_unpartitioned;
+    CREATE TABLE {TABLE} (LIKE {TABLE}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (processing_date);
+
+    SELECT date_trunc('month', COALESCE(MIN(processing_date), now()))::date INTO partition_month
+    FROM {TABLE}_unpartitioned;
+    WHILE partition_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF {TABLE} FOR VALUES FROM (%L) TO (%L)',
+            '{TABLE}_' || to_char(partition_month, '"y"YYYY"m"MM'),
+            partition_month, (partition_month + interval '1 month')::date
+        );
+        partition_month := (partition_month + interval '1 month')::date;
+    END LOOP;
+    CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT;
+
+    INSERT INTO {TABLE} SELECT * FROM {TABLE}_unpartitioned;
+    DROP TABLE {TABLE}_unpartitioned;
+
+    ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, processing_date);
+    FOREACH index_definition IN ARRAY index_definitions LOOP
+        EXECUTE index_definition;
+    END LOOP;
+    CREATE INDEX IF NOT EXISTS {UPSERT_LOOKUP_INDEX} ON {TABLE} (environment_id, stock_number, processing_session_id);
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY {TABLE}.id', id_sequence);
+END $$;
+"""
+
+DOWNGRADE_SQL = f"""
+DO $$
+DECLARE
+    index_definitions text[];
+    index_definition text;
+    id_sequence text := pg_get_serial_sequence('{TABLE}', 'id');
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '{TABLE}'::regclass) THEN
+        RETURN;
+    END IF;
+
+    index_definitions := ARRAY(
+        SELECT replace(pg_get_indexdef(indexrelid), ' ON ONLY ', ' ON ') FROM pg_index
+        WHERE indrelid = '{TABLE}'::regclass AND NOT indisprimary
+    );
+
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', id_sequence);
+    ALTER TABLE {TABLE} RENAME TO {TABLE}_partitioned;
+    CREATE TABLE {TABLE} (LIKE {TABLE}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+    INSERT INTO {TABLE} SELECT * FROM {TABLE}_partitioned;
+    DROP TABLE {TABLE}_partitioned;
+
+    ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id);
+    FOREACH index_definition IN ARRAY index_definitions LOOP
+        EXECUTE index_definition;
+    END LOOP;
+
+    -- Book values of archived partitions no longer have a record to reference
+    DELETE FROM vehicle_book_values WHERE record_id NOT IN (SELECT id FROM {TABLE});
+    ALTER TABLE vehicle_book_values ADD CONSTRAINT vehicle_book_values_record_id_fkey
+        FOREIGN KEY (record_id) REFERENCES {TABLE} (id) ON DELETE CASCADE;
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY {TABLE}.id', id_sequence);
+END $$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(DOWNGRADE_SQL)
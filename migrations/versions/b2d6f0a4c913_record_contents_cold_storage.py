@@ -0,0 +1,209 @@
+"""record contents cold storage
+
+Moves original_description, ai_generated_description, final_description and ai_analysis_result
+out of vehicle_processing_records into record_contents, compressed (zstd, or zlib without the
+zstandard package) and stored once per distinct text by content hash. Records keep a
+<field>_content_id per field plus the first 200 characters and the length of the final
+description for list views.
+
+The texts are compressed in Python, so this revision cannot be rendered with `--sql`.
+
+Revision ID: b2d6f0a4c913
+Revises: a5c91e3d7f48
+Create Date: 2025-10-27 09:00:00.000000
+
+"""
+import json
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op, context
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from record_content import content_hash, compress_text, decompress_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d6f0a4c913'
+down_revision: Union[str, Sequence[str], None] = 'a5c91e3d7f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+CONTENTS_TABLE = 'record_contents'
+TEXT_FIELDS = ('original_description', 'ai_generated_description', 'final_description')
+JSON_FIELD = 'ai_analysis_result'
+CONTENT_FIELDS = TEXT_FIELDS + (JSON_FIELD,)
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+JSON_VALUE_TYPE = sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), 'postgresql')
+PREVIEW_LENGTH = 200
+BATCH_SIZE = 1000
+
+
+def _content_text(field, value):
+    """Stored text of a field value; the AI analysis is normalized to sorted-key JSON"""
+    if value is None or value == '':
+        return None
+    if field == JSON_FIELD:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return value
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def _record_key(connection, records):
+    """WHERE clause of per-record updates; on PostgreSQL processing_date limits each to its partition"""
+    key = [records.c.id == sa.bindparam('record_id')]
+    if connection.dialect.name == 'postgresql':
+        key.append(records.c.processing_date == sa.bindparam('record_processing_date'))
+    return key
+
+
+def _store_contents(connection, contents, texts):
+    """Insert the texts not yet in record_contents; returns {content hash: id} for all of them"""
+    hashes = sorted(texts)
+    lookup = sa.select(contents.c.content_hash, contents.c.id).where(contents.c.content_hash.in_(hashes))
+    content_ids = dict(connection.execute(lookup).all())
+    new_contents = []
+    for digest in hashes:
+        if digest not in content_ids:
+            codec, data = compress_text(texts[digest])
+            new_contents.append({
+                'content_hash': digest, 'codec': codec, 'data': data,
+                'raw_size': len(texts[digest].encode('utf-8')), 'created_at': datetime.utcnow()
+            })
+    if new_contents:
+        connection.execute(contents.insert(), new_contents)
+        content_ids = dict(connection.execute(lookup).all())
+    return content_ids
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if context.is_offline_mode():
+        raise RuntimeError("record_contents migration compresses data in Python; run it against the database")
+
+    op.create_table(
+        CONTENTS_TABLE,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('raw_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash'),
+        if_not_exists=True
+    )
+    with op.batch_alter_table(TABLE) as batch_op:
+        for field in CONTENT_FIELDS:
+            batch_op.add_column(sa.Column(f'{field}_content_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('description_preview', sa.String(length=PREVIEW_LENGTH), nullable=True))
+        batch_op.add_column(sa.Column('description_length', sa.Integer(), nullable=True))
+
+    op.execute(
+        f"UPDATE {TABLE} SET description_preview = substr(final_description, 1, {PREVIEW_LENGTH}), "
+        f"description_length = length(final_description) "
+        f"WHERE final_description IS NOT NULL AND final_description <> ''"
+    )
+
+    connection = op.get_bind()
+    metadata = sa.MetaData()
+    contents = sa.Table(CONTENTS_TABLE, metadata, autoload_with=connection)
+    records = sa.Table(TABLE, metadata, autoload_with=connection)
+    has_content = sa.or_(*[records.c[field].isnot(None) for field in CONTENT_FIELDS])
+    set_content_ids = records.update().where(*_record_key(connection, records)).values(
+        {f'{field}_content_id': sa.bindparam(f'{field}_id') for field in CONTENT_FIELDS}
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(records.c.id, records.c.processing_date, *[records.c[field] for field in CONTENT_FIELDS])
+            .where(records.c.id > last_id, has_content)
+            .order_by(records.c.id)
+            .limit(BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        row_texts = [{field: _content_text(field, row[field]) for field in CONTENT_FIELDS} for row in rows]
+        texts = {content_hash(value): value for values in row_texts for value in values.values() if value is not None}
+        content_ids = _store_contents(connection, contents, texts)
+        connection.execute(set_content_ids, [
+            dict(
+                {
+                    f'{field}_id': content_ids[content_hash(values[field])] if values[field] is not None else None
+                    for field in CONTENT_FIELDS
+                },
+                record_id=row['id'], record_processing_date=row['processing_date']
+            )
+            for row, values in zip(rows, row_texts)
+        ])
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for field in CONTENT_FIELDS:
+            batch_op.drop_column(field)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if context.is_offline_mode():
+        raise RuntimeError("record_contents migration decompresses data in Python; run it against the database")
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for field in TEXT_FIELDS:
+            batch_op.add_column(sa.Column(field, sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column(JSON_FIELD, JSON_TYPE, nullable=True))
+
+    connection = op.get_bind()
+    metadata = sa.MetaData()
+    contents = sa.Table(CONTENTS_TABLE, metadata, autoload_with=connection)
+    records = sa.Table(TABLE, metadata, autoload_with=connection)
+    content_id_columns = [records.c[f'{field}_content_id'] for field in CONTENT_FIELDS]
+    set_texts = records.update().where(*_record_key(connection, records)).values(
+        {field: sa.bindparam(f'{field}_value', type_=JSON_VALUE_TYPE if field == JSON_FIELD else sa.Text())
+         for field in CONTENT_FIELDS}
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(records.c.id, records.c.processing_date, *content_id_columns)
+            .where(records.c.id > last_id, sa.or_(*[column.isnot(None) for column in content_id_columns]))
+            .order_by(records.c.id)
+            .limit(BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        ids = {row[column.key] for row in rows for column in content_id_columns} - {None}
+        texts = {
+            content.id: decompress_text(content.codec, content.data)
+            for content in connection.execute(
+                sa.select(contents.c.id, contents.c.codec, contents.c.data).where(contents.c.id.in_(ids))
+            )
+        }
+        updates = []
+        for row in rows:
+            values = {f'{field}_value': texts.get(row[f'{field}_content_id']) for field in CONTENT_FIELDS}
+            if values[f'{JSON_FIELD}_value'] is not None:
+                try:
+                    values[f'{JSON_FIELD}_value'] = json.loads(values[f'{JSON_FIELD}_value'])
+                except ValueError:
+                    pass
+            updates.append(dict(values, record_id=row['id'], record_processing_date=row['processing_date']))
+        connection.execute(set_texts, updates)
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for field in CONTENT_FIELDS:
+            batch_op.drop_column(f'{field}_content_id')
+        batch_op.drop_column('description_preview')
+        batch_op.drop_column('description_length')
+    op.drop_table(CONTENTS_TABLE, if_exists=True)
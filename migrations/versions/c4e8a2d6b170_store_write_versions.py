@@ -0,0 +1,39 @@
+"""store write versions
+
+Adds store_write_versions, the per-store counter that VehicleDatabaseManager bumps with every
+write to a store's records. The API derives ETag / Last-Modified validators from it.
+Stores without a row yet count as version 0.
+
+Revision ID: c4e8a2d6b170
+Revises: b2d6f0a4c913
+Create Date: 2025-11-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2d6b170'
+down_revision: Union[str, Sequence[str], None] = 'b2d6f0a4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'store_write_versions',
+        sa.Column('environment_id', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('environment_id'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('store_write_versions', if_exists=True)
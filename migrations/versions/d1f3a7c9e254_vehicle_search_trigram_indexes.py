@@ -0,0 +1,62 @@
+"""vehicle search trigram indexes
+
+pg_trgm GIN indexes on stock_number, vin and vehicle_name so ILIKE '%term%' search does not
+scan the table. SQLite gets a narrow covering index over the search columns instead.
+
+Revision ID: d1f3a7c9e254
+Revises: 9b47d2e61c80
+Create Date: 2025-09-22 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f3a7c9e254'
+down_revision: Union[str, Sequence[str], None] = '9b47d2e61c80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+SEARCH_COLUMNS = ('stock_number', 'vin', 'vehicle_name')
+SQLITE_SEARCH_INDEX = f'ix_{TABLE}_search_columns'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.create_index(
+            SQLITE_SEARCH_INDEX, TABLE,
+            ['environment_id', 'stock_number', 'vin', 'vehicle_name', 'processing_date'],
+            if_not_exists=True
+        )
+        return
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(
+                f'ix_{TABLE}_{column}_trgm', TABLE, [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.drop_index(SQLITE_SEARCH_INDEX, table_name=TABLE, if_exists=True)
+        return
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.drop_index(f'ix_{TABLE}_{column}_trgm', table_name=TABLE, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,72 @@
+"""record change tracking
+
+Adds row_version and updated_at to vehicle_processing_records, stamped by VehicleDatabaseManager
+with the store's write version on every write, and vehicle_record_tombstones for deleted or
+moved records, so /api/vehicles/changes can return what changed in a store after a cursor.
+Existing records start at row_version 0, before any cursor.
+
+The records table is partitioned on PostgreSQL, where indexes cannot be built CONCURRENTLY; the
+row_version index briefly blocks writes while each partition is indexed.
+
+Revision ID: d8f2b6e4a193
+Revises: c4e8a2d6b170
+Create Date: 2025-11-10 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b6e4a193'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a2d6b170'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+TOMBSTONES_TABLE = 'vehicle_record_tombstones'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.add_column(sa.Column('row_version', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_vehicle_processing_records_env_row_version', TABLE,
+        ['environment_id', 'row_version'],
+        if_not_exists=True
+    )
+
+    with op.batch_alter_table('store_write_versions') as batch_op:
+        batch_op.add_column(sa.Column('pruned_tombstone_version', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table(
+        TOMBSTONES_TABLE,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('environment_id', sa.String(length=100), nullable=False),
+        sa.Column('row_version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_vehicle_record_tombstones_env_row_version', TOMBSTONES_TABLE,
+        ['environment_id', 'row_version'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vehicle_record_tombstones_env_row_version', table_name=TOMBSTONES_TABLE, if_exists=True)
+    op.drop_table(TOMBSTONES_TABLE, if_exists=True)
+    with op.batch_alter_table('store_write_versions') as batch_op:
+        batch_op.drop_column('pruned_tombstone_version')
+    op.drop_index('ix_vehicle_processing_records_env_row_version', table_name=TABLE, if_exists=True)
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('row_version')
@@ -0,0 +1,61 @@
+"""processing summary upsert key
+
+Index on (environment_id, stock_number, processing_session_id), through which
+VehicleDatabaseManager.upsert_processing_summary finds the record of a key. It is not unique:
+records logged before the upserts existed may share a key and are kept (upserts update the newest).
+
+Revision ID: e7a2c4b9f031
+Revises: d1f3a7c9e254
+Create Date: 2025-10-06 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op, context
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c4b9f031'
+down_revision: Union[str, Sequence[str], None] = 'd1f3a7c9e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+UPSERT_LOOKUP_INDEX = 'ix_vehicle_processing_records_env_stock_session'
+
+
+def _index_options() -> dict:
+    if op.get_bind().dialect.name == 'postgresql':
+        return {'postgresql_concurrently': True}
+    return {}
+
+
+def _drop_invalid_index():
+    """A failed CREATE INDEX CONCURRENTLY leaves an INVALID index that IF NOT EXISTS would keep"""
+    if context.is_offline_mode() or op.get_bind().dialect.name != 'postgresql':
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+    ), {'name': UPSERT_LOOKUP_INDEX}).first()
+    if invalid:
+        op.drop_index(UPSERT_LOOKUP_INDEX, table_name=TABLE, if_exists=True, **_index_options())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        _drop_invalid_index()
+        op.create_index(
+            UPSERT_LOOKUP_INDEX, TABLE,
+            ['environment_id', 'stock_number', 'processing_session_id'],
+            if_not_exists=True, **_index_options()
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(UPSERT_LOOKUP_INDEX, table_name=TABLE, if_exists=True, **_index_options())
@@ -0,0 +1,95 @@
+"""record payloads jsonb
+
+Converts the JSON payload columns of vehicle_processing_records from Text to JSONB on PostgreSQL
+(JSON on SQLite) and adds jsonb_path_ops GIN indexes on errors_encountered and starred_features
+for containment filters. Empty strings become NULL first; text that is not valid JSON is kept as
+a JSON string (json_quote on SQLite, to_jsonb through a temporary cast function on PostgreSQL,
+where a plain ::jsonb cast would abort the upgrade on the first legacy value). On PostgreSQL the type change rewrites the table under an exclusive
+lock, so run it in a maintenance window on large installs.
+
+Revision ID: f3b8d1e6a027
+Revises: e7a2c4b9f031
+Create Date: 2025-10-13 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e6a027'
+down_revision: Union[str, Sequence[str], None] = 'e7a2c4b9f031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+JSON_COLUMNS = (
+    'starred_features', 'feature_decisions', 'ai_analysis_result', 'errors_encountered',
+    'media_totals_found', 'book_values_before_processing', 'book_values_after_processing'
+)
+GIN_INDEX_COLUMNS = ('errors_encountered', 'starred_features')
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+# Casts text to jsonb, keeping text that is not valid JSON as a JSON string; dropped after the upgrade
+SAFE_JSONB_FUNCTION = 'migration_safe_jsonb'
+CREATE_SAFE_JSONB = f"""
+    CREATE OR REPLACE FUNCTION {SAFE_JSONB_FUNCTION}(value text) RETURNS jsonb
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        RETURN value::jsonb;
+    EXCEPTION WHEN data_exception THEN
+        RETURN to_jsonb(value);
+    END
+    $$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    for column in JSON_COLUMNS:
+        op.execute(f"UPDATE {TABLE} SET {column} = NULL WHERE {column} = ''")
+        if dialect_name == 'sqlite':
+            op.execute(f"UPDATE {TABLE} SET {column} = json_quote({column}) WHERE {column} IS NOT NULL AND NOT json_valid({column})")
+    if dialect_name == 'postgresql':
+        op.execute(CREATE_SAFE_JSONB)
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for column in JSON_COLUMNS:
+            batch_op.alter_column(
+                column, existing_type=sa.Text(), type_=JSON_TYPE, existing_nullable=True,
+                postgresql_using=f'{SAFE_JSONB_FUNCTION}({column})'
+            )
+
+    if dialect_name != 'postgresql':
+        return
+    op.execute(f"DROP FUNCTION {SAFE_JSONB_FUNCTION}(text)")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for column in GIN_INDEX_COLUMNS:
+            op.create_index(
+                f'ix_{TABLE}_{column}_gin', TABLE, [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'jsonb_path_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for column in GIN_INDEX_COLUMNS:
+                op.drop_index(f'ix_{TABLE}_{column}_gin', table_name=TABLE, postgresql_concurrently=True, if_exists=True)
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for column in JSON_COLUMNS:
+            batch_op.alter_column(
+                column, existing_type=JSON_TYPE, type_=sa.Text(), existing_nullable=True,
+                postgresql_using=f'{column}::text'
+            )
@@ -0,0 +1,42 @@
+"""non-unique summary key
+
+Databases upgraded with the first version of e7a2c4b9f031 carry a unique index on
+(environment_id, stock_number, processing_session_id) on SQLite, which made a repeated
+create_vehicle_record or log_processing_summary fail there while PostgreSQL stored it. It is
+replaced by the plain lookup index the other databases have. On PostgreSQL the records table is
+partitioned by now and already has the plain index, so nothing changes there.
+
+Revision ID: f6d4b2a8c517
+Revises: d8f2b6e4a193
+Create Date: 2025-11-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6d4b2a8c517'
+down_revision: Union[str, Sequence[str], None] = 'd8f2b6e4a193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'vehicle_processing_records'
+UPSERT_KEY_INDEX = 'uq_vehicle_processing_records_env_stock_session'
+UPSERT_LOOKUP_INDEX = 'ix_vehicle_processing_records_env_stock_session'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        UPSERT_LOOKUP_INDEX, TABLE,
+        ['environment_id', 'stock_number', 'processing_session_id'],
+        if_not_exists=True
+    )
+    op.drop_index(UPSERT_KEY_INDEX, table_name=TABLE, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The unique index is not restored: records may share a key now
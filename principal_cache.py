@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Principal Cache Module
+Short-lived cache of authenticated user snapshots so API requests can skip the users table.
+Entries are keyed by the token's jti (or sub for tokens without one) and dropped explicitly
+when a user is created, deleted, toggled or logs in.
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from database import User, UserRole
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Immutable snapshot of the user fields API handlers read"""
+    id: int
+    username: str
+    role: UserRole
+    store_ids: Optional[str]  # JSON array as stored on the user row
+    store_id: Optional[str]
+    is_active: bool
+    created_by_id: Optional[int]
+    created_at: Optional[datetime]
+    last_login: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> 'UserPrincipal':
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            store_ids=user.store_ids,
+            store_id=user.store_id,
+            is_active=user.is_active,
+            created_by_id=user.created_by_id,
+            created_at=user.created_at,
+            last_login=user.last_login
+        )
+
+    def to_user(self) -> User:
+        """Build a detached User for one request, so handlers never share or mutate the cached snapshot"""
+        return User(
+            id=self.id,
+            username=self.username,
+            role=self.role,
+            store_ids=self.store_ids,
+            store_id=self.store_id,
+            is_active=self.is_active,
+            created_by_id=self.created_by_id,
+            created_at=self.created_at,
+            last_login=self.last_login
+        )
+
+
+class PrincipalCache:
+    """Thread-safe TTL cache of UserPrincipal snapshots"""
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str) -> Optional[UserPrincipal]:
+        """Cached principal for a token key, or None when missing or expired"""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, principal: UserPrincipal):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = (principal, now + self.ttl_seconds)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the oldest ones if the cache is still full"""
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate_user(self, username: str = None, user_id: int = None) -> int:
+        """Drop every cached token of a user; returns the number of entries removed"""
+        with self._lock:
+            stale = [
+                key for key, (principal, _) in self._entries.items()
+                if (username is not None and principal.username == username) or
+                   (user_id is not None and principal.id == user_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
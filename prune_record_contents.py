@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Record Contents Prune Script
+Deletes the compressed description and AI analysis texts no processing record references any more.
+"""
+
+import sys
+from database import get_database_manager, prune_record_contents
+
+def main():
+    """Main prune function"""
+    print("=== Record Contents Prune ===")
+
+    try:
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        deleted = prune_record_contents(db_manager)
+        print(f"\n✅ Deleted {deleted} unreferenced record contents")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Prune cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during prune: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Record Tombstones Prune Script
+Deletes the tombstones /api/vehicles/changes keeps for deleted and moved records once they are
+older than the retention. Dashboards that last synced before a pruned delete reload their list.
+
+Usage:
+    python prune_tombstones.py
+    python prune_tombstones.py --older-than-days 7
+"""
+
+import sys
+import argparse
+from database import get_database_manager, prune_record_tombstones, DEFAULT_TOMBSTONE_RETENTION_DAYS
+
+def main():
+    """Main prune function"""
+    parser = argparse.ArgumentParser(description="Delete old record tombstones")
+    parser.add_argument("--older-than-days", type=int, default=DEFAULT_TOMBSTONE_RETENTION_DAYS,
+                        help=f"Keep tombstones younger than this (default: {DEFAULT_TOMBSTONE_RETENTION_DAYS})")
+    args = parser.parse_args()
+
+    print("=== Record Tombstones Prune ===")
+
+    try:
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        deleted = prune_record_tombstones(db_manager, older_than_days=args.older_than_days)
+        print(f"\n✅ Deleted {deleted} tombstones older than {args.older_than_days} days")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Prune cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during prune: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
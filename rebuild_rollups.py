@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Daily Rollup Rebuild Script
+Rebuilds the daily_store_rollups tables from the raw vehicle processing records.
+"""
+
+import sys
+import argparse
+from datetime import datetime
+from database import get_database_manager, rebuild_daily_store_rollups
+
+def main():
+    """Main rebuild function"""
+    parser = argparse.ArgumentParser(description="Rebuild daily store KPI rollups from vehicle processing records")
+    parser.add_argument("--since", help="Only rebuild days on or after this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    print("=== Daily Store Rollup Rebuild ===")
+
+    try:
+        start_date = datetime.strptime(args.since, "%Y-%m-%d").date() if args.since else None
+
+        print("🔧 Initializing database connection...")
+        db_manager = get_database_manager()
+        print("✅ Database connection established")
+
+        rebuilt = rebuild_daily_store_rollups(db_manager, start_date=start_date)
+        print(f"\n✅ Rebuilt {rebuilt} daily store rollups")
+
+    except ValueError:
+        print("❌ Invalid --since date. Use YYYY-MM-DD")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Rebuild cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during rebuild: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
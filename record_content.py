@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Record Content Compression
+Codec helpers for the large text fields of processing records (descriptions and AI analysis),
+which are stored compressed in the record_contents table, once per distinct text.
+zstd is used when the optional `zstandard` package is installed and zlib otherwise. Every stored
+value records its codec, so a deployment can read whatever another one wrote.
+"""
+
+import os
+import zlib
+import hashlib
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; fall back to zlib
+    zstandard = None
+
+ZSTD_LEVEL = int(os.getenv('RECORD_CONTENT_ZSTD_LEVEL', '3'))
+ZLIB_LEVEL = 6
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest identifying a text in record_contents"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_text(text: str, codec: str = None) -> tuple:
+    """Compress a text; returns (codec, compressed bytes)"""
+    codec = codec or DEFAULT_CODEC
+    data = text.encode('utf-8')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == 'zlib':
+        return codec, zlib.compress(data, ZLIB_LEVEL)
+    raise ValueError(f"Unknown record content codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Decompress a value written by compress_text"""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Reading zstd record content requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown record content codec: {codec}")
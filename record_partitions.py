@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Monthly Partitions of vehicle_processing_records
+On PostgreSQL the records table is range-partitioned by processing_date: one partition per
+calendar month (vehicle_processing_records_y2025m10, ...) plus a default partition for rows
+outside every month range. Date-filtered queries then only read the months they cover.
+
+Future partitions are created ahead of time (at startup, every RECORD_PARTITION_CHECK_SECONDS in
+each worker and by `python manage_partitions.py ensure`); old months are detached and moved to an archive schema by `manage_partitions.py archive`.
+SQLite databases are not partitioned and every function here is a no-op on them.
+"""
+
+import os
+import re
+import logging
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import text
+
+from change_feed import RESYNC_CHANGE
+
+logger = logging.getLogger(__name__)
+
+RECORDS_TABLE = 'vehicle_processing_records'
+DEFAULT_PARTITION = f'{RECORDS_TABLE}_default'
+PARTITION_NAME_PATTERN = re.compile(rf'^{RECORDS_TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+# Months of empty partitions kept ahead of the current month
+DEFAULT_MONTHS_AHEAD = int(os.getenv('RECORD_PARTITION_MONTHS_AHEAD', '3'))
+DEFAULT_ARCHIVE_SCHEMA = 'archive'
+# Seconds between the checks each worker makes for missing partitions
+DEFAULT_CHECK_SECONDS = int(os.getenv('RECORD_PARTITION_CHECK_SECONDS', '21600'))
+# Advisory lock serializing partition creation across workers
+PARTITION_MAINTENANCE_LOCK_KEY = 0x70617274
+
+
+def month_start(value) -> date:
+    """First day of the month containing a date or datetime"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before, if negative) the given month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the records of a month"""
+    return f"{RECORDS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month held by a monthly partition, or None for the default partition and other tables"""
+    match = PARTITION_NAME_PATTERN.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partition_name(name: str) -> bool:
+    """Whether a table name is one of the records table's partitions"""
+    return name == DEFAULT_PARTITION or partition_month(name) is not None
+
+
+def is_partitioned(connection) -> bool:
+    """Whether the records table of this connection's database is partitioned"""
+    if connection.dialect.name != 'postgresql':
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {'table': RECORDS_TABLE}).scalar())
+
+
+def list_partitions(connection) -> List[Dict[str, Any]]:
+    """Attached partitions, oldest month first, with the planner's row estimate of each"""
+    if not is_partitioned(connection):
+        return []
+    rows = connection.execute(text("""
+        SELECT child.relname AS name, child.reltuples AS estimated_rows
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+    """), {'table': RECORDS_TABLE}).all()
+    partitions = [
+        {'name': row.name, 'month': partition_month(row.name), 'estimated_rows': max(int(row.estimated_rows), 0)}
+        for row in rows
+    ]
+    # Monthly partitions in order, then the default partition
+    return sorted(partitions, key=lambda partition: (partition['month'] is None, partition['month'] or date.min))
+
+
+def create_partitions(connection, first_month: date, last_month: date) -> List[str]:
+    """Create the missing monthly partitions from first_month through last_month; returns their names"""
+    existing = {partition['name'] for partition in list_partitions(connection)}
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = partition_name(month)
+        if name not in existing:
+            create_partition(connection, month)
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def create_partition(connection, month: date):
+    """
+    Create the partition of a month. Rows of that month the default partition took in before the
+    partition existed are moved into it (PARTITION OF would fail on them): the table is created
+    standalone, filled from the default partition and then attached.
+    """
+    name = partition_name(month)
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    in_month = {'start': month, 'end': add_months(month, 1)}
+    month_filter = "processing_date >= :start AND processing_date < :end"
+    stray = connection.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {month_filter})"
+    ), in_month).scalar()
+    if not stray:
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {RECORDS_TABLE} FOR VALUES {bounds}"))
+        return
+
+    connection.execute(text(
+        f"CREATE TABLE {name} (LIKE {RECORDS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    moved = connection.execute(text(f"""
+        WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {month_filter} RETURNING *)
+        INSERT INTO {name} SELECT * FROM moved
+    """), in_month).rowcount
+    # The parent's indexes are created on the table as it is attached
+    connection.execute(text(f"ALTER TABLE {RECORDS_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    logger.info("Moved %s records from %s to the new partition %s", moved, DEFAULT_PARTITION, name)
+
+
+def default_partition_months(connection) -> List[date]:
+    """Months of the rows held by the default partition, oldest first"""
+    rows = connection.execute(text(
+        f"SELECT DISTINCT date_trunc('month', processing_date) AS month FROM {DEFAULT_PARTITION} "
+        "WHERE processing_date IS NOT NULL ORDER BY month"
+    )).all()
+    return [month_start(row.month) for row in rows]
+
+
+def ensure_partitions(db_manager, months_ahead: int = None) -> List[str]:
+    """
+    Make sure the current month and the next `months_ahead` months have partitions, as do months
+    after the oldest partition whose rows went to the default partition because their partition was
+    missing (a worker that was not restarted past the horizon). Runs at startup and periodically in
+    every worker; returns the names of the partitions created. Does nothing on unpartitioned databases.
+    """
+    months_ahead = DEFAULT_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current_month = month_start(datetime.utcnow())
+    with db_manager.engine.begin() as connection:
+        if not is_partitioned(connection):
+            return []
+        # One worker at a time, so the others see its partitions instead of racing to create them
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': PARTITION_MAINTENANCE_LOCK_KEY})
+        created = create_partitions(connection, current_month, add_months(current_month, months_ahead))
+        months = [partition['month'] for partition in list_partitions(connection) if partition['month']]
+        # Rows older than every partition stay in the default partition, as they always have
+        for month in default_partition_months(connection):
+            if months and month > months[0]:
+                created += create_partitions(connection, month, month)
+    if created:
+        logger.info("Created record partitions: %s", ", ".join(created))
+    return created
+
+
+def archive_partitions(
+    db_manager,
+    before_month: date,
+    archive_schema: str = DEFAULT_ARCHIVE_SCHEMA,
+    drop: bool = False,
+    dry_run: bool = False
+) -> List[str]:
+    """
+    Detach the monthly partitions of months before `before_month` and move them to `archive_schema`
+    (or drop them), in one transaction that also tombstones their records and bumps the write
+    versions of the records' stores. The daily rollups are kept, so statistics still cover archived
+    months. The parsed book value rows of archived partitions are kept too (every read joins them to
+    records, so they are ignored until the partition is attached again); those of dropped
+    partitions are deleted. Returns the names of the partitions archived.
+    """
+    if not re.match(r'^[a-z_][a-z0-9_]*$', archive_schema):
+        raise ValueError(f"Invalid archive schema name: {archive_schema!r}")
+    from database import bump_store_write_versions, NO_ENVIRONMENT_ROLLUP_KEY
+
+    with db_manager.get_session() as session:
+        connection = session.connection()
+        old_partitions = [
+            partition['name'] for partition in list_partitions(connection)
+            if partition['month'] is not None and partition['month'] < before_month
+        ]
+        if dry_run or not old_partitions:
+            return old_partitions
+
+        # Synced clients see the archived records as deleted: tombstones at each store's new version
+        stores = {
+            environment_id for name in old_partitions
+            for environment_id in connection.execute(text(f"SELECT DISTINCT environment_id FROM {name}")).scalars()
+        }
+        bump_store_write_versions(session, stores)
+        if not drop:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+        for name in old_partitions:
+            connection.execute(text(f"""
+                INSERT INTO vehicle_record_tombstones (record_id, environment_id, row_version, deleted_at)
+                SELECT records.id, store.environment_id, store.version, now() AT TIME ZONE 'UTC'
+                FROM {name} records
+                JOIN store_write_versions store
+                    ON store.environment_id = COALESCE(records.environment_id, :no_environment)
+            """), {'no_environment': NO_ENVIRONMENT_ROLLUP_KEY})
+            if drop:
+                connection.execute(text(
+                    f"DELETE FROM vehicle_book_values WHERE record_id IN (SELECT id FROM {name})"
+                ))
+            connection.execute(text(f"ALTER TABLE {RECORDS_TABLE} DETACH PARTITION {name}"))
+            if drop:
+                connection.execute(text(f"DROP TABLE {name}"))
+                logger.info("Dropped record partition %s", name)
+            else:
+                connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+                logger.info("Archived record partition %s to schema %s", name, archive_schema)
+        # Every worker drops its cached responses and counts and its stream clients reload
+        db_manager.change_feed.publish(session, [RESYNC_CHANGE])
+        session.commit()
+    db_manager.change_feed.dispatch([RESYNC_CHANGE])
+    return old_partitions
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Response Cache Module
+Short-lived cache of dashboard read responses (/api/statistics, /api/recent-activity, /api/stores
+and the first page of /api/vehicles). Entries are keyed by endpoint, the set of stores the caller
+can see and the request parameters, and a store's entries are invalidated whenever
+VehicleDatabaseManager writes one of its records.
+
+Invalidation bumps a per-store generation counter that is part of every key, so a backend never has
+to find the entries of a store: they simply stop being read and expire. Entries covering every
+store (super admins without a store selected) use the ALL_STORES generation, bumped by every write.
+A response computed while a write commits is stored under the old generation, so it is never served.
+Every key also holds the EPOCH generation, bumped by invalidate_all when writes may have been missed.
+
+Backends:
+    MemoryCacheBackend  in-process LRU with TTL (default; one cache per worker process)
+    RedisCacheBackend   any Redis-compatible client, e.g. redis.Redis or fakeredis.FakeRedis;
+                        shared between workers, so invalidations reach all of them
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+try:
+    import redis
+except ImportError:  # Optional dependency, only needed for RESPONSE_CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+ALL_STORES = '*'
+EPOCH = '#epoch'
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counters(self, names: List[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(name, 0) for name in names]
+
+    def incr_counters(self, names: Iterable[str]):
+        with self._lock:
+            for name in names:
+                self._counters[name] = self._counters.get(name, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Cache backend on a Redis-compatible client (get, set with ex, mget, incr, pipeline).
+    Values are stored as JSON, so cached responses must be JSON-serializable.
+    """
+
+    def __init__(self, client, prefix: str = 'dashboard:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = 'dashboard:cache:') -> 'RedisCacheBackend':
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(round(ttl_seconds))))
+
+    def get_counters(self, names: List[str]) -> List[int]:
+        values = self.client.mget([f'{self.prefix}generation:{name}' for name in names])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def incr_counters(self, names: Iterable[str]):
+        pipeline = self.client.pipeline()
+        for name in names:
+            pipeline.incr(f'{self.prefix}generation:{name}')
+        pipeline.execute()
+
+    def size(self) -> Optional[int]:
+        return None  # Not tracked; Redis may hold keys of other workers and prefixes
+
+
+class ResponseCache:
+    """TTL cache of endpoint responses, invalidated per store"""
+
+    def __init__(self, backend=None, ttl_seconds: float = 30):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def make_key(self, endpoint: str, stores: Optional[Tuple[str, ...]], params: Dict[str, Any]) -> str:
+        """
+        Key of a response for the given store scope (None for every store) and parameters.
+        The current generation of each store in scope is part of the key.
+        """
+        scope = sorted(stores) if stores is not None else [ALL_STORES]
+        generations = self.backend.get_counters(scope + [EPOCH])
+        raw = json.dumps([endpoint, scope, generations, params], sort_keys=True, default=str)
+        return f"{endpoint}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached response for a key, or None when missing, expired or the backend fails"""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache read failed: %s", e)
+            with self._lock:
+                self.errors += 1
+            return None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        try:
+            self.backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+            with self._lock:
+                self.errors += 1
+
+    def lookup(self, endpoint: str, stores: Optional[Tuple[str, ...]], params: Dict[str, Any]) -> tuple:
+        """(key, cached response or None); the key is None when the cache is disabled or unavailable"""
+        if not self.enabled:
+            return None, None
+        try:
+            key = self.make_key(endpoint, stores, params)
+        except Exception as e:
+            logger.warning("Response cache key lookup failed: %s", e)
+            with self._lock:
+                self.errors += 1
+            return None, None
+        return key, self.get(key)
+
+    def invalidate_stores(self, environment_ids: Optional[Iterable[Optional[str]]]):
+        """
+        Drop the cached responses covering any of the given stores (and all-stores responses);
+        None drops every response
+        """
+        if environment_ids is None:
+            names = {EPOCH}
+        else:
+            names = {environment_id for environment_id in environment_ids if environment_id}
+            names.add(ALL_STORES)
+        try:
+            self.backend.incr_counters(sorted(names))
+        except Exception as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.invalidations += 1
+
+    def invalidate_all(self):
+        """Drop every cached response"""
+        self.invalidate_stores(None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'entries': self.backend.size(),
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'errors': self.errors,
+            }
+
+
+def build_response_cache_from_env() -> ResponseCache:
+    """
+    ResponseCache configured from RESPONSE_CACHE_TTL_SECONDS (0 disables), RESPONSE_CACHE_BACKEND
+    (memory or redis), RESPONSE_CACHE_MAX_ENTRIES (memory) and RESPONSE_CACHE_REDIS_URL (redis)
+    """
+    ttl_seconds = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '30'))
+    backend_name = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').lower()
+    if backend_name == 'redis':
+        backend = RedisCacheBackend.from_url(os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+    elif backend_name == 'memory':
+        backend = MemoryCacheBackend(max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024')))
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend_name}")
+    return ResponseCache(backend, ttl_seconds=ttl_seconds)
@@ -51,13 +51,24 @@ def main():
         sys.path.append('..')
         from database import get_database_manager
         db_manager = get_database_manager()
-        print(f"   Database URL: {db_manager.db_url}")
+        print(f"   Database URL: {db_manager.engine.url.render_as_string(hide_password=True)}")
+        db_manager.check_connection()
         print("   PostgreSQL connection: OK")
     except Exception as e:
         print(f"   Error: PostgreSQL connection failed: {e}")
         print("   Please ensure PostgreSQL is running and credentials are set in .env file")
         return
     
+    # The server no longer creates tables on startup; apply the Alembic migrations here instead
+    print("🔄 Applying database migrations...")
+    try:
+        subprocess.check_call([sys.executable, '-m', 'alembic', 'upgrade', 'head'])
+        print("   Migrations: up to date")
+    except subprocess.CalledProcessError:
+        print("   Error: Database migrations failed")
+        print("   Please run: alembic upgrade head")
+        return
+    
     print("\n🚀 Starting FastAPI dashboard server...")
     print("📱 Dashboard URL: http://localhost:9000")
     print("📖 API Documentation: http://localhost:9000/api/docs")
@@ -19,8 +19,14 @@ def main():
         # Initialize database manager
         print("🔧 Initializing database connection...")
         db_manager = get_database_manager()
+        db_manager.check_connection()
         print("✅ Database connection established")
         
+        from sqlalchemy import inspect
+        if not inspect(db_manager.engine).has_table('users'):
+            print("❌ Database schema not found. Run 'alembic upgrade head' first.")
+            sys.exit(1)
+        
         # Run migration
         print("\n🔄 Running user migration...")
         migrate_users_to_role_system(db_manager)
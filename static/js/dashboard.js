@@ -15,6 +15,46 @@ function formatExecutiveNumber(value) {
     return num.toLocaleString('en-US');
 }
 
+// ETag revalidation of GET requests: the last body of each URL is kept with its ETag and sent
+// back as If-None-Match, so an unchanged result costs the server a validator lookup and an
+// empty 304, which is answered here from the kept body.
+const CONDITIONAL_CACHE_MAX_ENTRIES = 50;
+const conditionalResponseCache = new Map();
+
+function conditionalFetch(url, options = {}) {
+    const method = (options.method || 'GET').toUpperCase();
+    if (method !== 'GET') {
+        return fetch(url, options);
+    }
+
+    // Keyed by token too, so a different user never gets another user's body
+    const cacheKey = `${(options.headers || {})['Authorization'] || ''} ${url}`;
+    const cached = conditionalResponseCache.get(cacheKey);
+    const requestOptions = { ...options, cache: 'no-store' };
+    if (cached) {
+        requestOptions.headers = { ...options.headers, 'If-None-Match': cached.etag };
+    }
+
+    return fetch(url, requestOptions).then(async response => {
+        if (response.status === 304 && cached) {
+            return new Response(cached.body, { status: 200, headers: { 'Content-Type': cached.contentType } });
+        }
+        const etag = response.headers.get('ETag');
+        conditionalResponseCache.delete(cacheKey);
+        if (response.ok && etag) {
+            conditionalResponseCache.set(cacheKey, {
+                etag,
+                body: await response.clone().text(),
+                contentType: response.headers.get('Content-Type') || 'application/json'
+            });
+            if (conditionalResponseCache.size > CONDITIONAL_CACHE_MAX_ENTRIES) {
+                conditionalResponseCache.delete(conditionalResponseCache.keys().next().value);
+            }
+        }
+        return response;
+    });
+}
+
 // Helper function for authenticated API calls
 function authenticatedFetch(url, options = {}) {
     const token = localStorage.getItem('token');
@@ -32,7 +72,7 @@ function authenticatedFetch(url, options = {}) {
         }
     };
     
-    return fetch(url, authOptions).then(response => {
+    return conditionalFetch(url, authOptions).then(response => {
         if (response.status === 401) {
             // Token expired or invalid - logout
             localStorage.removeItem('token');
@@ -43,6 +83,168 @@ function authenticatedFetch(url, options = {}) {
     });
 }
 
+// Live activity feed from /api/stream/activity (Server-Sent Events). EventSource cannot send the
+// Authorization header, so the stream is read with fetch and its frames are parsed here. Handlers
+// are called by event name: vehicle, delete and resync. After a reconnect, events may have been
+// missed, so resync is dispatched before new events arrive.
+class ActivityStream {
+    constructor(handlers) {
+        this.handlers = handlers;
+        this.retryMs = 5000;
+        this.controller = null;
+        this.reconnectTimer = null;
+        this.connectedBefore = false;
+    }
+
+    start() {
+        this.stop();
+        this.controller = new AbortController();
+        this.connect(this.controller);
+    }
+
+    stop() {
+        clearTimeout(this.reconnectTimer);
+        if (this.controller) {
+            this.controller.abort();
+            this.controller = null;
+        }
+    }
+
+    async connect(controller) {
+        const token = localStorage.getItem('token');
+        if (!token) {
+            return;
+        }
+
+        let url = '/api/stream/activity';
+        if (window.selectedStoreId) {
+            url += `?store_id=${encodeURIComponent(window.selectedStoreId)}`;
+        }
+
+        try {
+            const response = await fetch(url, {
+                headers: { 'Authorization': `Bearer ${token}` },
+                cache: 'no-store',
+                signal: controller.signal
+            });
+            if (response.status === 401) {
+                localStorage.removeItem('token');
+                window.location.href = '/login';
+                return;
+            }
+            if (!response.ok || !response.body) {
+                throw new Error(`Activity stream returned ${response.status}`);
+            }
+
+            if (this.connectedBefore) {
+                this.dispatch('resync', {});
+            }
+            this.connectedBefore = true;
+
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += value;
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+                    this.handleFrame(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+            }
+        } catch (error) {
+            if (controller.signal.aborted) {
+                return;
+            }
+            console.warn('Activity stream disconnected:', error);
+        }
+
+        if (!controller.signal.aborted) {
+            this.reconnectTimer = setTimeout(() => this.connect(controller), this.retryMs);
+        }
+    }
+
+    handleFrame(frame) {
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                data += line.slice(5).trim();
+            } else if (line.startsWith('retry:')) {
+                this.retryMs = parseInt(line.slice(6), 10) || this.retryMs;
+            }
+        });
+        if (data) {
+            this.dispatch(event, JSON.parse(data));
+        }
+    }
+
+    dispatch(event, data) {
+        const handler = this.handlers[event];
+        if (handler) {
+            try {
+                handler(data);
+            } catch (error) {
+                console.error(`Error applying ${event} event:`, error);
+            }
+        }
+    }
+}
+
+// Apply a vehicle from the activity stream to a newest-first list of at most `limit` vehicles:
+// replace it if listed, insert it if it is newer than the last listed vehicle.
+function mergeStreamedVehicle(vehicles, vehicle, limit) {
+    const others = vehicles.filter(v => v.id !== vehicle.id);
+    const listed = others.length !== vehicles.length;
+    const last = vehicles[vehicles.length - 1];
+    if (!listed && vehicles.length >= limit && (vehicle.processing_date_raw || '') < (last.processing_date_raw || '')) {
+        return vehicles;
+    }
+    return [vehicle, ...others]
+        .sort((a, b) => (b.processing_date_raw || '').localeCompare(a.processing_date_raw || '') || b.id - a.id)
+        .slice(0, limit);
+}
+
+// Incremental vehicle sync from /api/vehicles/changes. The cursor records how far this copy of the
+// list has seen each store's writes; sync() returns the vehicles written and deleted since then,
+// or reset: true when the list has to be reloaded (first sync, store switched, too far behind).
+class VehicleChangeSync {
+    constructor() {
+        this.cursor = null;
+        this.storeId = null;
+    }
+
+    async sync() {
+        const storeId = window.selectedStoreId || null;
+        if (storeId !== this.storeId) {
+            this.cursor = null;
+            this.storeId = storeId;
+        }
+
+        const params = new URLSearchParams();
+        if (this.cursor) {
+            params.append('since', this.cursor);
+        }
+        if (storeId) {
+            params.append('store_id', storeId);
+        }
+
+        const response = await authenticatedFetch(`/api/vehicles/changes?${params}`);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.detail || 'Failed to load vehicle changes');
+        }
+        // On reset the cursor predates the reload that follows, so nothing written in between is missed
+        this.cursor = data.cursor;
+        return data;
+    }
+}
+
 // Global Date Filter Manager
 class GlobalDateFilter {
     constructor() {
@@ -176,6 +378,7 @@ class VehicleDashboard {
         this.statistics = {};
         this.recentActivity = [];
         this.currentVehicle = null;
+        this.changeSync = new VehicleChangeSync();
         
         // Get initial date range from global filter if available
         if (window.globalDateFilter) {
@@ -260,6 +463,73 @@ class VehicleDashboard {
     async initialize() {
         // This method should be called when the store selector is ready
         await this.loadInitialData();
+        this.startActivityStream();
+    }
+
+    startActivityStream() {
+        if (!this.activityStream) {
+            this.activityStream = new ActivityStream({
+                vehicle: (data) => this.applyStreamedVehicle(data.vehicle),
+                delete: (data) => this.removeStreamedVehicle(data.id),
+                resync: () => {
+                    this.loadStatistics().catch(error => console.error('Error loading statistics:', error));
+                    this.syncVehicles();
+                }
+            });
+        }
+        this.activityStream.start();
+    }
+
+    applyStreamedVehicle(vehicle) {
+        this.mergeVehicle(vehicle);
+        this.updateVehiclesDisplay();
+        this.scheduleStatisticsRefresh();
+    }
+
+    mergeVehicle(vehicle) {
+        // Only the unfiltered first page can take new vehicles; elsewhere listed ones are updated
+        const processingDay = (vehicle.processing_date_raw || '').slice(0, 10);
+        const inDateRange = !this.currentDateRange || !this.currentDateRange.start ||
+            (processingDay >= this.currentDateRange.start && processingDay <= this.currentDateRange.end);
+        if (this.currentPage === 1 && !this.currentSearch && inDateRange) {
+            this.vehicles = mergeStreamedVehicle(this.vehicles, vehicle, this.perPage);
+        } else {
+            this.vehicles = this.vehicles.map(v => v.id === vehicle.id ? vehicle : v);
+        }
+    }
+
+    async syncVehicles() {
+        // Patch the listed vehicles with what changed since the last sync instead of reloading the page
+        try {
+            const changes = await this.changeSync.sync();
+            if (changes.reset) {
+                return this.loadVehicles();
+            }
+            const deletedIds = new Set(changes.deleted.map(tombstone => tombstone.id));
+            this.vehicles = this.vehicles.filter(v => !deletedIds.has(v.id));
+            changes.vehicles.forEach(vehicle => this.mergeVehicle(vehicle));
+            if (deletedIds.size || changes.vehicles.length) {
+                this.updateVehiclesDisplay();
+            }
+            return true;
+        } catch (error) {
+            console.error('Error syncing vehicles:', error);
+            return this.loadVehicles();
+        }
+    }
+
+    removeStreamedVehicle(vehicleId) {
+        this.vehicles = this.vehicles.filter(v => v.id !== vehicleId);
+        this.updateVehiclesDisplay();
+        this.scheduleStatisticsRefresh();
+    }
+
+    scheduleStatisticsRefresh() {
+        // Aggregates are not patched client side; one reload covers a burst of changes
+        clearTimeout(this.statisticsRefreshTimer);
+        this.statisticsRefreshTimer = setTimeout(() => {
+            this.loadStatistics().catch(error => console.error('Error loading statistics:', error));
+        }, 2000);
     }
 
     async loadInitialData() {
@@ -274,7 +544,7 @@ class VehicleDashboard {
                 return null;
             });
             
-            const vehiclesPromise = this.loadVehicles().catch(error => {
+            const vehiclesPromise = this.syncVehicles().catch(error => {
                 console.error('Error loading vehicles:', error);
                 this.showErrorState('Failed to load vehicles');
                 return null;
@@ -1407,7 +1677,7 @@ class VehicleDashboard {
             }
         };
         
-        return fetch(url, authOptions).then(response => {
+        return conditionalFetch(url, authOptions).then(response => {
             if (response.status === 401 || response.status === 403) {
                 localStorage.removeItem('token');
                 window.location.href = '/login';
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Structured Logging Module
+Leveled JSON logging for the dashboard API and database layer, with per-module levels,
+request-id correlation and rate-limited DEBUG sampling.
+
+Configured through environment variables:
+    LOG_LEVEL                    Root level (default INFO)
+    LOG_LEVELS                   Per-logger overrides, e.g. "app=DEBUG,database=WARNING"
+    LOG_FORMAT                   json (default) or text
+    LOG_DEBUG_SAMPLE_PER_SECOND  DEBUG records emitted per logger per second (default 20, 0 = unlimited)
+
+Call sites use lazy %-style arguments, so records below the configured level are discarded by
+Logger.isEnabledFor() before any message formatting happens.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import logging
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional, Dict, TextIO
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'
+
+# Request id of the request being served; copied into worker threads with the rest of the context
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# Incoming ids are echoed into logs and headers, so only accept short, plain tokens
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+# Attributes every LogRecord carries; anything else was passed via extra= and becomes a JSON field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps each record with the id of the request that produced it"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or '-'
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Lets at most `per_second` DEBUG records through per logger in each one-second window.
+    The first record of the next window reports how many were dropped as `debug_dropped`.
+    """
+
+    def __init__(self, per_second: float):
+        super().__init__()
+        self.per_second = per_second
+        self._windows: Dict[str, list] = {}  # logger name -> [window start, emitted, dropped]
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.per_second <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(record.name)
+            if window is None or now - window[0] >= 1.0:
+                if window and window[2]:
+                    record.debug_dropped = window[2]
+                window = self._windows[record.name] = [now, 0, 0]
+            if window[1] >= self.per_second:
+                window[2] += 1
+                self.dropped += 1
+                return False
+            window[1] += 1
+            return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, request_id, extra fields and exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id and request_id != '-':
+            entry['request_id'] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def parse_logger_levels(value: str) -> Dict[str, str]:
+    """Parse "app=DEBUG,database=WARNING" into {'app': 'DEBUG', 'database': 'WARNING'}"""
+    levels = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        name, level = item.split('=', 1)
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(level: str = None, log_format: str = None, stream: TextIO = None,
+                      debug_sample_per_second: float = None) -> logging.Handler:
+    """
+    Install the dashboard log handler on the root logger. Arguments override the environment;
+    calling again replaces the previously installed handler.
+    """
+    global _handler
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    log_format = (log_format or os.getenv('LOG_FORMAT', 'json')).lower()
+    if debug_sample_per_second is None:
+        debug_sample_per_second = float(os.getenv('LOG_DEBUG_SAMPLE_PER_SECOND', '20'))
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSampler(debug_sample_per_second))
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    root.addHandler(handler)
+    root.setLevel(level)
+    for name, logger_level in parse_logger_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _handler = handler
+    return handler
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware binding a request id to every log record written while serving the request.
+    Reuses a well-formed incoming X-Request-ID header, otherwise generates one, and returns it
+    on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get('headers', []):
+            if name == b'x-request-id':
+                candidate = value.decode('latin-1')
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER.lower().encode('latin-1'), request_id.encode('latin-1'))
+
+        async def send_with_request_id(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + [header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
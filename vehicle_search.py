@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Vehicle Search Module
+Stock number / VIN / vehicle name search shared by the vehicle list and the typeahead endpoint.
+
+On PostgreSQL the substring filter is served by the pg_trgm GIN indexes declared in
+database.py and results are ranked by trigram similarity. SQLite scans a narrow covering index
+over the search columns instead, and ranks by match position only.
+"""
+
+from typing import List
+from sqlalchemy import or_, case, func
+
+from database import VehicleProcessingRecord
+
+# Columns matched by the search box, in the order used to report which field matched
+SEARCH_COLUMNS = (
+    VehicleProcessingRecord.stock_number,
+    VehicleProcessingRecord.vin,
+    VehicleProcessingRecord.vehicle_name,
+)
+
+LIKE_ESCAPE_CHAR = '\\'
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return (term.replace(LIKE_ESCAPE_CHAR, LIKE_ESCAPE_CHAR * 2)
+                .replace('%', LIKE_ESCAPE_CHAR + '%')
+                .replace('_', LIKE_ESCAPE_CHAR + '_'))
+
+
+def _match(column, pattern: str, dialect_name: str = None):
+    """Case-insensitive LIKE for the dialect"""
+    if dialect_name == 'sqlite':
+        # SQLite LIKE is already case-insensitive for ASCII; ilike() would wrap both sides in lower()
+        # and stop the covering search index from being scanned cheaply
+        return column.like(pattern, escape=LIKE_ESCAPE_CHAR)
+    return column.ilike(pattern, escape=LIKE_ESCAPE_CHAR)
+
+
+def build_search_filter(term: str, dialect_name: str = None):
+    """Case-insensitive substring match on stock number, VIN or vehicle name"""
+    pattern = f"%{escape_like(term)}%"
+    return or_(*[_match(column, pattern, dialect_name) for column in SEARCH_COLUMNS])
+
+
+def build_search_ranking(term: str, dialect_name: str) -> List:
+    """
+    ORDER BY clauses ranking exact matches first, then prefix matches, then other substring
+    matches. PostgreSQL breaks ties by trigram similarity; newest records come next.
+    """
+    escaped = escape_like(term)
+    exact = or_(*[func.lower(column) == term.lower() for column in SEARCH_COLUMNS])
+    prefix = or_(*[_match(column, f"{escaped}%", dialect_name) for column in SEARCH_COLUMNS])
+
+    ranking = [case((exact, 0), (prefix, 1), else_=2)]
+    if dialect_name == 'postgresql':
+        ranking.append(func.greatest(*[
+            func.coalesce(func.similarity(column, term), 0) for column in SEARCH_COLUMNS
+        ]).desc())
+    ranking.extend([
+        VehicleProcessingRecord.processing_date.desc(),
+        VehicleProcessingRecord.id.desc()
+    ])
+    return ranking
+
+
+def get_matched_field(row, term: str) -> str:
+    """Name of the first search column containing the term"""
+    lowered = term.lower()
+    for column in SEARCH_COLUMNS:
+        value = getattr(row, column.key, None)
+        if value and lowered in value.lower():
+            return column.key
+    return SEARCH_COLUMNS[0].key